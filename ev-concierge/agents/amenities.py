@@ -1,20 +1,45 @@
-from strands.models import BedrockModel
 from strands import Agent
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID
+from utils.agent_pool import get_agent_pool, get_model
+from utils.event_loop import run_sync
 from tools.amenities_tools import check_nearby_amenities, get_restaurant_menu, place_food_order
 import json
-import asyncio
 
 class AmenitiesAgent:
     def __init__(self):
-        self.model = BedrockModel(
-            model_id=BEDROCK_MODEL_ID,
-            region_name=AWS_REGION,
-            temperature=0.7
-        )
+        self.model = get_model()
     
-    def order_amenities(self, location: str, user_prefs: dict, charging_duration_min: int) -> dict:
+    def discover(self, location: str) -> dict:
+        """
+        Look up the restaurants near a charging location and their menus.
+        
+        Needs no model call, so the coordinator runs it while the charger is
+        still being reserved and hands the result to order_amenities.
+        
+        Returns:
+            Dict with location, amenities and menus (restaurant -> items)
+        """
+        amenities = json.loads(check_nearby_amenities(location))
+        menus = {
+            restaurant: json.loads(get_restaurant_menu(restaurant))
+            for restaurant in amenities.get('restaurants', [])
+        }
+        return {"location": location, "amenities": amenities, "menus": menus}
+    
+    def order_amenities(self, location: str, user_prefs: dict, charging_duration_min: int, options: dict = None) -> dict:
         """Synchronous wrapper for async order_amenities"""
+        return run_sync(self.order_amenities_async(location, user_prefs, charging_duration_min, options))
+    
+    async def order_amenities_async(self, location: str, user_prefs: dict, charging_duration_min: int, options: dict = None) -> dict:
+        """
+        Pre-order food and drinks for a charging stop.
+        
+        Args:
+            location: Charging location
+            user_prefs: User preferences (auto_order_coffee, favorite_drink, favorite_food)
+            charging_duration_min: Length of the stop
+            options: Result of discover() for this location, if already known;
+                the agent then only has to place the order
+        """
         if not user_prefs.get('auto_order_coffee'):
             print("\n⏭️  Amenities: Auto-order disabled by user")
             return {"order": None, "message": "Auto-order disabled", "tool_results": []}
@@ -27,9 +52,6 @@ class AmenitiesAgent:
             print("\n⏭️  Amenities: No food or drink preferences set (both are 'None')")
             return {"order": None, "message": "No food or drink preferences", "tool_results": []}
         
-        return asyncio.run(self.order_amenities_async(location, user_prefs, charging_duration_min))
-    
-    async def order_amenities_async(self, location: str, user_prefs: dict, charging_duration_min: int) -> dict:
         print(f"🍽️  Amenities Agent: Starting async order_amenities...")
         print(f"   Location: {location}")
         print(f"   Duration: {charging_duration_min} min")
@@ -65,15 +87,24 @@ User Preferences:"""
         else:
             user_prompt += "\n- Food: None (do NOT order food)"
         
-        user_prompt += f"\n\nCheck amenities and pre-order ONLY these items: {', '.join(items_to_order)}"
+        if options:
+            user_prompt += f"""
+
+Nearby amenities (already checked): {json.dumps(options['amenities'])}
+Menus (already checked): {json.dumps(options['menus'])}
+
+Do NOT call check_nearby_amenities or get_restaurant_menu again. Pre-order ONLY these items: {', '.join(items_to_order)}"""
+        else:
+            user_prompt += f"\n\nCheck amenities and pre-order ONLY these items: {', '.join(items_to_order)}"
         
         print(f"\n🍽️  Amenities Agent: Ordering {', '.join(items_to_order)}")
         
-        agent = Agent(
+        agents = get_agent_pool("amenities", lambda: Agent(
             model=self.model,
             system_prompt=system_prompt,
             tools=[check_nearby_amenities, get_restaurant_menu, place_food_order]
-        )
+        ))
+        agent = agents.acquire()
         
         response_text = ""
         tool_results = []
@@ -106,6 +137,8 @@ User Preferences:"""
             import traceback
             traceback.print_exc()
             response_text = f"Error: {str(e)}"
+        finally:
+            agents.release(agent)
         
         print(f"🍽️  Amenities Agent: Completed with {len(tool_results)} tool results\n")
         
@@ -1,21 +1,16 @@
-from strands.models import BedrockModel
 from strands import Agent
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID
-from tools.charging_tools import search_chargers, reserve_charging_slot, check_charger_status
+from utils.agent_pool import get_agent_pool, get_model
+from utils.event_loop import run_sync
+from tools.charging_tools import search_chargers_async, plan_charging_stops, reserve_charging_slot, check_charger_status
 import json
-import asyncio
 
 class ChargingNegotiationAgent:
     def __init__(self):
-        self.model = BedrockModel(
-            model_id=BEDROCK_MODEL_ID,
-            region_name=AWS_REGION,
-            temperature=0.7
-        )
+        self.model = get_model()
     
     def find_and_reserve(self, trip_data: dict, preferences: dict = None) -> dict:
         """Synchronous wrapper for async find_and_reserve"""
-        return asyncio.run(self.find_and_reserve_async(trip_data, preferences))
+        return run_sync(self.find_and_reserve_async(trip_data, preferences))
     
     async def find_and_reserve_async(self, trip_data: dict, preferences: dict = None) -> dict:
         origin = trip_data.get('origin', 'Unknown')
@@ -25,6 +20,7 @@ class ChargingNegotiationAgent:
         vehicle_data = trip_data.get('vehicle_data', {})
         battery_percent = vehicle_data.get('battery_percent', 100)
         vehicle_range = vehicle_data.get('range_miles', 300)
+        vehicle_model = vehicle_data.get('model', '')
         current_range = int((battery_percent / 100) * vehicle_range)
         
         system_prompt = """You are a charging negotiation specialist. Find the best charger 
@@ -43,6 +39,8 @@ IMPORTANT:
    - time_slot: pick from available slots
    - location: the location field from the charger
    - network: the network field from the charger (e.g., "Tesla Supercharger", "EVgo")
+5. If the trip is longer than one full battery range, call plan_charging_stops and
+   reserve a slot at EVERY planned stop, using each stop's charge_min as duration_min
 
 Example responses:
 - If insufficient range: "⚠️ Your current battery (35%, 105 miles) cannot reach any charging stations on this route. Please charge to 100% at home before departure. Once fully charged, your first stop would be: Tesla Supercharger at Lost Hills, CA (134 miles away)."
@@ -50,7 +48,7 @@ Example responses:
         
         user_prompt = f"""
 Trip: {origin} → {destination}
-Current Battery: {battery_percent}% ({current_range} miles range)
+Current Battery: {battery_percent}% ({current_range} miles range, {vehicle_range} miles when full)
 User Preferences: {preferences or 'Prioritize speed and convenience'}
 
 CRITICAL: First call search_chargers(route="{origin}", destination="{destination}", min_power_kw=150, current_range_miles={current_range})
@@ -61,13 +59,16 @@ If the response contains "error": "insufficient_range":
 - Mention the stations they could reach if fully charged
 
 If stations are found:
-- Reserve the best one with all required parameters (charger_id, time_slot, location, network)"""
+- Reserve the best one with all required parameters (charger_id, time_slot, location, network)
+
+If the trip is longer than {vehicle_range} miles, call plan_charging_stops(route="{origin}", destination="{destination}", battery_percent={battery_percent}, vehicle_range_miles={vehicle_range}, min_power_kw=150, vehicle_model="{vehicle_model}") and reserve each stop in order"""
         
-        agent = Agent(
+        agents = get_agent_pool("charging_negotiation", lambda: Agent(
             model=self.model,
             system_prompt=system_prompt,
-            tools=[search_chargers, reserve_charging_slot, check_charger_status]
-        )
+            tools=[search_chargers_async, plan_charging_stops, reserve_charging_slot, check_charger_status]
+        ))
+        agent = agents.acquire()
         
         response_text = ""
         tool_results = []
@@ -95,6 +96,8 @@ If stations are found:
                                                     pass
         except Exception as e:
             response_text = f"Error: {str(e)}"
+        finally:
+            agents.release(agent)
         
         return {
             "reservation": response_text,
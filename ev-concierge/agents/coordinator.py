@@ -1,9 +1,17 @@
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID, USE_MOCK_DATA
+import json
+from utils.config import AWS_REGION, BEDROCK_MODEL_ID, TRIP_ANALYSIS_MODE, USE_MOCK_DATA
+from utils.event_loop import run_sync
 from agents.trip_planning import TripPlanningAgent
 from agents.charging_negotiation import ChargingNegotiationAgent
 from agents.amenities import AmenitiesAgent
 from agents.payment import PaymentAgent
 from agents.monitoring import MonitoringAgent
+from tools.charging_tools import search_chargers_async
+from utils.charging_curve import get_charging_curve
+from utils.energy import RESERVE_PERCENT, percent_per_km
+from utils.location_coords import get_coordinates, haversine_km
+from utils.routing import KM_PER_MILE, ROAD_CURVATURE
+from utils.step_graph import StepGraph, format_timeline
 
 class CoordinatorAgent:
     def __init__(self):
@@ -17,8 +25,29 @@ class CoordinatorAgent:
         # Coordinator doesn't need its own agent - it orchestrates other agents
     
     def orchestrate(self, vehicle_data: dict, trip_data: dict, user_prefs: dict) -> dict:
-        results = {}
-        
+        """Synchronous wrapper for async orchestrate"""
+        return run_sync(self.orchestrate_async(vehicle_data, trip_data, user_prefs))
+    
+    async def orchestrate_async(self, vehicle_data: dict, trip_data: dict, user_prefs: dict) -> dict:
+        """
+        Plan the trip as a graph of steps (utils/step_graph.py):
+        
+            trip ─┬─ wallet ─────────────────────────────────┐
+                  ├─ stations ── amenity_options ──┐         │
+                  └─ charging ── stop ─┬────────── amenities ── payment
+                                       ├─ charging_fees ─────┘
+                                       └─ narrative
+        
+        Amenity discovery starts from the charger search while the charger
+        is being reserved, and the wallet check and charging fees do not
+        wait for the food order, so a trip takes about as long as the
+        charging → amenities → payment chain. The background narrative
+        waits for the stop so it is not written for a plan that ends in an
+        insufficient range warning, which has no use for it.
+        
+        Callers with their own event loop await this directly; orchestrate()
+        runs it on the shared loop (utils/event_loop.py).
+        """
         print("\n" + "="*70)
         print("🎯 COORDINATOR: Starting orchestration")
         print("="*70)
@@ -28,54 +57,232 @@ class CoordinatorAgent:
         print(f"🍽️  Preferences: drink={user_prefs.get('favorite_drink')}, food={user_prefs.get('favorite_food')}")
         print("="*70 + "\n")
         
-        # Step 1: Trip Planning
-        print("🗺️  STEP 1: Trip Planning Agent...")
-        trip_plan = self.trip_agent.analyze(vehicle_data, trip_data)
-        print("✅ Trip Planning complete\n")
-        results['trip_plan'] = trip_plan
+        wallet_id = user_prefs.get('wallet_id', 'default')
         
-        # Check if charging needed by parsing actual tool results
-        print("⚡ STEP 2: Checking if charging needed...")
-        needs_charging = False
-        energy_result = None
-        
-        for tool_result in trip_plan.get('tool_results', []):
-            if isinstance(tool_result, dict):
-                # Check if this is the energy calculation result
-                if 'needs_charging' in tool_result:
-                    needs_charging = tool_result.get('needs_charging', False)
-                    energy_result = tool_result
-                    break
+        async def trip(steps):
+            if TRIP_ANALYSIS_MODE == 'agent':
+                print("🗺️  STEP 1: Trip Planning Agent...")
+                trip_plan = await self.trip_agent.analyze_async(vehicle_data, trip_data)
+            else:
+                # The energy numbers need no model call; only the analysis text does
+                print("🗺️  STEP 1: Trip Planning (direct energy calculation)...")
+                trip_plan = self.trip_agent.assess(vehicle_data, trip_data)
+            print("✅ Trip Planning complete\n")
+            return trip_plan
+        
+        def needs_charging(steps):
+            energy_result = self._energy_result(steps['trip'])
+            return bool(energy_result and energy_result.get('needs_charging'))
+        
+        async def narrative(steps):
+            return await self.trip_agent.narrate_async(vehicle_data, trip_data, self._energy_result(steps['trip']))
+        
+        async def wallet(steps):
+            return self.payment_agent.validate_user_wallet(wallet_id)['tool_results'][0]
+        
+        async def stations(steps):
+            # Same search the charging agent starts with, so the two share one lookup
+            # Only a head start: on error the charging agent does its own search
+            current_range = int((vehicle_data['battery_percent']/100) * vehicle_data['range_miles'])
+            try:
+                return json.loads(await search_chargers_async(
+                    trip_data['origin'], trip_data['destination'], min_power_kw=150, current_range_miles=current_range
+                ))
+            except Exception as e:
+                print(f"⚠️  Charger prefetch failed: {e}")
+                return None
+        
+        async def amenity_options(steps):
+            # Likewise, the amenities agent discovers options itself if this fails
+            try:
+                location = self._likely_stop_location(steps['stations'])
+                return self.amenities_agent.discover(location) if location else None
+            except Exception as e:
+                print(f"⚠️  Amenity prefetch failed: {e}")
+                return None
+        
+        async def charging(steps):
+            print("⚡ STEP 2: Charging Negotiation Agent...")
+            print(f"   Origin: {trip_data['origin']}")
+            print(f"   Destination: {trip_data['destination']}")
+            print(f"   Current range: {int((vehicle_data['battery_percent']/100) * vehicle_data['range_miles'])} miles")
+            # Pass trip_data with vehicle_data embedded for range calculation
+            trip_data_with_vehicle = {**trip_data, 'vehicle_data': vehicle_data}
+            charging_result = await self.charging_agent.find_and_reserve_async(trip_data_with_vehicle, user_prefs)
+            print("✅ Charging negotiation complete")
+            print(f"   Tool results: {len(charging_result.get('tool_results', []))} results\n")
+            return charging_result
+        
+        async def stop(steps):
+            return await self._charging_stop(steps['charging'], vehicle_data, trip_data)
+        
+        async def charging_fees(steps):
+            # Charging is only paid for when it was reserved on this trip
+            transactions = [] if steps['stop']['insufficient_range'] else self._charging_transactions(steps['charging'], vehicle_data, trip_data)
+            return {
+                "transactions": transactions,
+                "fees": self.payment_agent.quote_fees(transactions, steps['wallet'], "charging")
+            }
         
-        print(f"   Charging needed: {needs_charging}")
-        if energy_result:
-            print(f"   Current battery: {energy_result.get('current_battery')}%")
-            print(f"   Required battery: {energy_result.get('required_battery')}%")
-            print(f"   Deficit: {energy_result.get('deficit_percent')}%")
+        async def amenities(steps):
+            location = steps['stop']['location']
+            duration = steps['stop']['duration']
+            print("🍽️  STEP 3: Amenities Agent...")
+            print(f"   Location: {location}")
+            print(f"   Duration: {duration} min")
+            print(f"   Preferences: drink={user_prefs.get('favorite_drink')}, food={user_prefs.get('favorite_food')}")
+            # Discovery was done for the first charger found; reuse it if that is the one reserved
+            options = steps['amenity_options']
+            if options and options['location'] != location:
+                options = None
+            amenities_result = await self.amenities_agent.order_amenities_async(location, user_prefs, duration, options)
+            print("✅ Amenities complete\n")
+            return amenities_result
+        
+        async def payment(steps):
+            print("💳 STEP 4: Payment Processing...")
+            amenity_transactions = self._amenity_transactions(steps['amenities'])
+            transactions = steps['charging_fees']['transactions'] + amenity_transactions
+            print(f"📊 Total transactions collected: {len(transactions)}")
+            print(f"   ⚡ Charging: {len(steps['charging_fees']['transactions'])}")
+            print(f"   🍽️  Amenities: {len(amenity_transactions)}")
+            if not transactions:
+                print("⚠️  No transactions to process\n")
+                return None
+            fees = steps['charging_fees']['fees'] + self.payment_agent.quote_fees(amenity_transactions, steps['wallet'], "food")
+            print(f"\n💳 Calling Payment Agent with {len(transactions)} transactions...")
+            payment_result = await self.payment_agent.process_payments_async(transactions, wallet_id, steps['wallet'], fees)
+            print("✅ Payment processing complete\n")
+            return payment_result
+        
+        def has_stop(steps):
+            return bool(steps['stop'] and steps['stop']['location'])
+        
+        graph = StepGraph()
+        graph.add('trip', trip)
+        graph.add('wallet', wallet, after=('trip',), when=needs_charging)
+        graph.add('stations', stations, after=('trip',), when=needs_charging)
+        graph.add('amenity_options', amenity_options, after=('stations',), when=lambda steps: steps['stations'] is not None)
+        graph.add('charging', charging, after=('trip',), when=needs_charging)
+        graph.add('stop', stop, after=('charging',), when=lambda steps: steps['charging'] is not None)
+        graph.add('charging_fees', charging_fees, after=('stop', 'wallet'), when=lambda steps: steps['stop'] is not None)
+        graph.add('amenities', amenities, after=('stop', 'amenity_options'), when=has_stop)
+        graph.add('payment', payment, after=('wallet', 'charging_fees', 'amenities'), when=has_stop)
+        graph.add('narrative', narrative, after=('stop',), when=lambda steps: (
+            TRIP_ANALYSIS_MODE == 'background' and steps['stop'] is not None and not steps['stop']['insufficient_range']
+        ))
+        steps = await graph.run()
+        
+        timeline = [timing._asdict() for timing in graph.timeline]
+        print("⏱️  Timeline:")
+        print(format_timeline(graph.timeline))
         print()
         
-        if not needs_charging:
-            print("⏭️  Skipping charging, amenities, and payment\n")
+        trip_plan = steps['trip']
+        energy_result = self._energy_result(trip_plan)
+        results = {'trip_plan': trip_plan}
+        
+        if not needs_charging(steps):
+            print("⏭️  Skipped charging, amenities, and payment\n")
             battery_pct = vehicle_data.get('battery_percent', 0)
             range_mi = vehicle_data.get('range_miles', 0)
             return {
                 "summary": f"✅ No charging needed! Your {battery_pct}% battery ({range_mi} mi range) is sufficient for this trip.",
                 "results": results,
-                "energy_analysis": energy_result
+                "energy_analysis": energy_result,
+                "timeline": timeline
+            }
+        
+        results['charging'] = steps['charging']
+        if steps['amenities'] is not None:
+            results['amenities'] = steps['amenities']
+        if steps['payment'] is not None:
+            results['payments'] = steps['payment']
+        charging_stop = steps['stop']
+        
+        # If insufficient range, the trip was still planned assuming they charge at home first
+        if charging_stop['insufficient_range']:
+            if charging_stop['recommended_stations']:
+                # Generate summary with insufficient range warning + planned amenities
+                summary = self._generate_summary_with_insufficient_range(
+                    results, 
+                    charging_stop['message'],
+                    charging_stop['recommended_stations']
+                )
+            else:
+                summary = "".join([
+                    "⚠️ **Insufficient Battery Range**\n",
+                    charging_stop['message'][:500],
+                    "\n\n**Recommendation:** Charge to 100% at home before starting your trip."
+                ])
+            
+            return {
+                "summary": summary,
+                "results": results,
+                "insufficient_range": True,
+                "timeline": timeline
+            }
+        
+        print("📝 STEP 5: Generating summary...")
+        await self._finish_narrative(trip_plan, steps['narrative'], vehicle_data, trip_data, energy_result)
+        summary = self._generate_summary(results)
+        print("✅ Summary generated\n")
+        
+        # If charging failed for other reasons, amenities were still ordered
+        if not charging_stop['successful']:
+            charging_failure_notice = "\n\n⚠️ **Charging Reservation Failed**\nNo chargers were found or reserved for this trip. Please manually search for charging options."
+            
+            return {
+                "summary": summary + charging_failure_notice,
+                "results": results,
+                "charging_failed": True,
+                "timeline": timeline
             }
         
-        # Step 2: Charging Negotiation
-        print("⚡ STEP 2: Charging Negotiation Agent...")
-        print(f"   Origin: {trip_data['origin']}")
-        print(f"   Destination: {trip_data['destination']}")
-        print(f"   Current range: {int((vehicle_data['battery_percent']/100) * vehicle_data['range_miles'])} miles")
-        # Pass trip_data with vehicle_data embedded for range calculation
-        trip_data_with_vehicle = {**trip_data, 'vehicle_data': vehicle_data}
-        charging_result = self.charging_agent.find_and_reserve(trip_data_with_vehicle, user_prefs)
-        print("✅ Charging negotiation complete")
-        print(f"   Tool results: {len(charging_result.get('tool_results', []))} results\n")
-        results['charging'] = charging_result
+        print("="*70)
+        print("🎯 COORDINATOR: Orchestration complete!")
+        print("="*70 + "\n")
         
+        return {
+            "summary": summary,
+            "results": results,
+            "timeline": timeline
+        }
+    
+    def _energy_result(self, trip_plan: dict) -> dict:
+        """The calculate_energy_needs result among the trip plan's tool results, if any."""
+        for tool_result in trip_plan.get('tool_results', []):
+            # Check if this is the energy calculation result
+            if isinstance(tool_result, dict) and 'needs_charging' in tool_result:
+                return tool_result
+        return None
+    
+    async def _finish_narrative(self, trip_plan: dict, narrative: str, vehicle_data: dict, trip_data: dict, energy_result: dict):
+        """Fill in trip_plan['analysis'] just before the summary uses it."""
+        if trip_plan.get('analysis'):
+            return  # written by the trip planning agent
+        if narrative is not None:
+            trip_plan['analysis'] = narrative
+        elif TRIP_ANALYSIS_MODE == 'lazy' and energy_result:
+            trip_plan['analysis'] = await self.trip_agent.narrate_async(vehicle_data, trip_data, energy_result)
+    
+    def _likely_stop_location(self, search_result) -> str:
+        """Location of the first charger in a search_chargers result, reachable now or after a full charge."""
+        if isinstance(search_result, dict):
+            search_result = search_result.get('stations_if_fully_charged', [])
+        if isinstance(search_result, list) and search_result and isinstance(search_result[0], dict):
+            return search_result[0].get('location')
+        return None
+    
+    async def _charging_stop(self, charging_result: dict, vehicle_data: dict, trip_data: dict) -> dict:
+        """
+        Work out where and for how long the first charging stop is.
+        
+        Returns:
+            Dict with successful (a charger was reserved), insufficient_range,
+            message, recommended_stations, location (None if there is no stop
+            to plan amenities for) and duration (minutes)
+        """
         # Check if charging was successful or if there's an insufficient range error
         charging_successful = False
         insufficient_range = False
@@ -92,13 +299,6 @@ class CoordinatorAgent:
         
         for r in charging_result.get('tool_results', []):
             if isinstance(r, dict):
-                # Debug: print what we got
-                if 'error' in r:
-                    print(f"   DEBUG: Found error in tool result: {r.get('error')}")
-                    print(f"   DEBUG: Has stations_if_fully_charged: {'stations_if_fully_charged' in r}")
-                    if 'stations_if_fully_charged' in r:
-                        print(f"   DEBUG: Number of recommended stations: {len(r['stations_if_fully_charged'])}")
-                
                 # Check for insufficient range error in tool results
                 if 'error' in r and r['error'] == 'insufficient_range':
                     insufficient_range = True
@@ -114,8 +314,10 @@ class CoordinatorAgent:
                     charger_location = r['location']
                 if 'duration_min' in r:
                     charging_duration = r['duration_min']
+                    charger = self._find_charger(charging_result, r.get('charger_id'))
+                    if charger:
+                        charging_duration, _ = self._charging_session(vehicle_data, trip_data, charger)
         
-        # If insufficient range, still plan the trip assuming they charge at home first
         if insufficient_range:
             print("\n⚠️  Insufficient Battery Range")
             print(f"   {insufficient_range_message[:200]}")
@@ -124,216 +326,119 @@ class CoordinatorAgent:
             # If we don't have recommended stations, query for them now
             if not recommended_stations:
                 print("   Querying for stations with full battery...")
-                from tools.charging_tools import search_chargers
-                import json
-                full_battery_result = search_chargers(
+                full_battery_data = json.loads(await search_chargers_async(
                     trip_data['origin'],
                     trip_data['destination'],
                     min_power_kw=150,
                     current_range_miles=300  # Full battery
-                )
-                full_battery_data = json.loads(full_battery_result)
+                ))
                 if isinstance(full_battery_data, list):
                     recommended_stations = full_battery_data[:3]
                 elif isinstance(full_battery_data, dict) and 'stations_if_fully_charged' in full_battery_data:
                     recommended_stations = full_battery_data['stations_if_fully_charged'][:3]
                 print(f"   Found {len(recommended_stations)} stations for full battery")
             
-            # If we have recommended stations, use the first one for amenities planning
-            if recommended_stations and len(recommended_stations) > 0:
+            # Plan amenities at the first stop they would make after charging at home
+            charger_location = None
+            if recommended_stations:
                 first_station = recommended_stations[0]
                 charger_location = first_station.get('location', 'charging location')
+                # They leave fully charged, so the first stop is shorter
+                charging_duration, _ = self._charging_session({**vehicle_data, 'battery_percent': 100}, trip_data, first_station)
                 print(f"   Planning amenities at first stop: {charger_location}\n")
-                
-                # Step 3: Amenities at the first charging stop
-                print("🍽️  STEP 3: Amenities Agent...")
-                amenities_result = self.amenities_agent.order_amenities(
-                    charger_location, user_prefs, charging_duration
-                )
-                print("✅ Amenities complete\n")
-                results['amenities'] = amenities_result
-                
-                # Step 4: Payment
-                print("💳 STEP 4: Payment Agent...")
-                transactions = []
-                for r in amenities_result.get('tool_results', []):
-                    if isinstance(r, dict) and 'total_usd' in r:
-                        transactions.append({
-                            "amount": r['total_usd'],
-                            "merchant": r.get('restaurant', 'Food vendor'),
-                            "description": f"Pre-order: {', '.join(r.get('items', []))}"
-                        })
-                
-                if transactions:
-                    payment_result = self.payment_agent.process_payments(
-                        transactions, user_prefs.get('wallet_id', 'default')
-                    )
-                    print("✅ Payment complete\n")
-                    results['payments'] = payment_result
-                
-                # Generate summary with insufficient range warning + planned amenities
-                summary = self._generate_summary_with_insufficient_range(
-                    results, 
-                    insufficient_range_message,
-                    recommended_stations
-                )
-                
-                return {
-                    "summary": summary,
-                    "results": results,
-                    "insufficient_range": True
-                }
             else:
-                # No stations available even with full charge
                 print("   No stations found even with full charge\n")
-                
-                summary_parts = [
-                    "⚠️ **Insufficient Battery Range**\n",
-                    insufficient_range_message[:500],
-                    "\n\n**Recommendation:** Charge to 100% at home before starting your trip."
-                ]
-                
-                return {
-                    "summary": "".join(summary_parts),
-                    "results": results,
-                    "insufficient_range": True
-                }
-        
-        # If charging failed for other reasons, continue with amenities
-        if not charging_successful:
+        elif not charging_successful:
             print("\n⚠️  WARNING: Charging reservation failed!")
             print("   No chargers were found or reserved.")
             print("   Continuing with amenities only...\n")
-            
-            # Still try amenities even if charging failed
-            amenities_result = self.amenities_agent.order_amenities(
-                charger_location, user_prefs, charging_duration
-            )
-            results['amenities'] = amenities_result
-            
-            # Process amenities payments only
-            transactions = []
-            for r in amenities_result.get('tool_results', []):
-                if isinstance(r, dict) and 'total_usd' in r:
-                    transactions.append({
-                        "amount": r['total_usd'],
-                        "merchant": r.get('restaurant', 'Food vendor'),
-                        "description": f"Pre-order: {', '.join(r.get('items', []))}"
-                    })
-            
-            if transactions:
-                payment_result = self.payment_agent.process_payments(
-                    transactions, user_prefs.get('wallet_id', 'default')
-                )
-                results['payments'] = payment_result
-            
-            # Generate summary with charging failure notice
-            summary = self._generate_summary(results)
-            charging_failure_notice = "\n\n⚠️ **Charging Reservation Failed**\nNo chargers were found or reserved for this trip. Please manually search for charging options."
-            
-            return {
-                "summary": summary + charging_failure_notice,
-                "results": results,
-                "charging_failed": True
-            }
-        
-        # Step 3: Amenities
-        print("🍽️  STEP 3: Amenities Agent...")
-        print(f"   Location: {charger_location}")
-        print(f"   Duration: {charging_duration} min")
-        print(f"   Preferences: drink={user_prefs.get('favorite_drink')}, food={user_prefs.get('favorite_food')}")
-        amenities_result = self.amenities_agent.order_amenities(
-            charger_location, user_prefs, charging_duration
-        )
-        print("✅ Amenities complete\n")
-        results['amenities'] = amenities_result
-        
-        # Step 4: Payment
-        print("💳 STEP 4: Payment Processing...")
-        print("="*70)
-        print("🔍 COORDINATOR: Collecting payments")
-        print("="*70)
         
+        return {
+            "successful": charging_successful,
+            "insufficient_range": insufficient_range,
+            "message": insufficient_range_message,
+            "recommended_stations": recommended_stations,
+            "location": charger_location,
+            "duration": charging_duration
+        }
+    
+    def _charging_transactions(self, charging_result: dict, vehicle_data: dict, trip_data: dict) -> list:
+        """A payment for each charger reserved, billed for the energy added."""
         transactions = []
-        
-        # Collect charging payments
         print("⚡ Collecting charging payments...")
-        charging_payments_found = 0
         for r in charging_result.get('tool_results', []):
-            if isinstance(r, dict):
-                # Check if this is a reservation with cost
-                if 'reservation_id' in r:
-                    # Get charger details from search results
-                    charger_id = r.get('charger_id')
-                    duration_min = r.get('duration_min', 30)
+            # Check if this is a reservation with cost
+            if isinstance(r, dict) and 'reservation_id' in r:
+                # Get charger details from search results
+                charger = self._find_charger(charging_result, r.get('charger_id'))
+                if charger:
+                    # Energy from the vehicle's charging curve
+                    _, kwh_charged = self._charging_session(vehicle_data, trip_data, charger)
+                    cost = kwh_charged * charger.get('price_per_kwh', 0.43)
+                    merchant = f"{charger.get('network', 'Charging Network')} Charging"
                     
-                    # Find charger info from search results
-                    for search_result in charging_result.get('tool_results', []):
-                        if isinstance(search_result, list):
-                            for charger in search_result:
-                                if isinstance(charger, dict) and charger.get('id') == charger_id:
-                                    # Calculate charging cost
-                                    # Assume ~50 kWh for 30 min at 350kW (rough estimate)
-                                    kwh_charged = (duration_min / 60) * min(charger.get('power_kw', 150), 150) * 0.3
-                                    cost = kwh_charged * charger.get('price_per_kwh', 0.43)
-                                    merchant = f"{charger.get('network', 'Charging Network')} Charging"
-                                    
-                                    transactions.append({
-                                        "amount": round(cost, 2),
-                                        "merchant": merchant,
-                                        "description": f"Charging session at {charger.get('location', 'charger')}"
-                                    })
-                                    charging_payments_found += 1
-                                    print(f"   ✓ Found charging payment: ${round(cost, 2):.2f} to {merchant}")
-                                    break
-        
-        # Collect amenities payments
-        print("🍽️  Collecting amenities payments...")
-        print(f"   DEBUG: amenities_result has {len(amenities_result.get('tool_results', []))} tool results")
-        for idx, r in enumerate(amenities_result.get('tool_results', [])):
-            print(f"   DEBUG: tool_result[{idx}] type={type(r)}, keys={r.keys() if isinstance(r, dict) else 'N/A'}")
-        
-        amenities_payments_found = 0
+                    transactions.append({
+                        "amount": round(cost, 2),
+                        "merchant": merchant,
+                        "description": f"Charging session at {charger.get('location', 'charger')} ({kwh_charged:.0f} kWh)"
+                    })
+                    print(f"   ✓ Found charging payment: ${round(cost, 2):.2f} to {merchant}")
+        return transactions
+    
+    def _amenity_transactions(self, amenities_result: dict) -> list:
+        """A payment for each food order placed."""
+        transactions = []
         for r in amenities_result.get('tool_results', []):
             if isinstance(r, dict) and 'total_usd' in r:
-                merchant = r.get('restaurant', 'Food vendor')
-                amount = r['total_usd']
                 transactions.append({
-                    "amount": amount,
-                    "merchant": merchant,
+                    "amount": r['total_usd'],
+                    "merchant": r.get('restaurant', 'Food vendor'),
                     "description": f"Pre-order: {', '.join(r.get('items', []))}"
                 })
-                amenities_payments_found += 1
-                print(f"   ✓ Found amenities payment: ${amount:.2f} to {merchant}")
-        
-        print(f"\n📊 Total transactions collected: {len(transactions)}")
-        print(f"   ⚡ Charging: {charging_payments_found}")
-        print(f"   🍽️  Amenities: {amenities_payments_found}")
-        print("="*70 + "\n")
-        
-        if transactions:
-            print(f"\n💳 Calling Payment Agent with {len(transactions)} transactions...")
-            payment_result = self.payment_agent.process_payments(
-                transactions, user_prefs.get('wallet_id', 'default')
-            )
-            print("✅ Payment processing complete\n")
-            results['payments'] = payment_result
-        else:
-            print("⚠️  No transactions to process\n")
-        
-        # Step 5: Generate Summary
-        print("📝 STEP 5: Generating summary...")
-        summary = self._generate_summary(results)
-        print("✅ Summary generated\n")
-        
-        print("="*70)
-        print("🎯 COORDINATOR: Orchestration complete!")
-        print("="*70 + "\n")
-        
-        return {
-            "summary": summary,
-            "results": results
-        }
+                print(f"   ✓ Found amenities payment: ${r['total_usd']:.2f} to {r.get('restaurant', 'Food vendor')}")
+        return transactions
+    
+    def _find_charger(self, charging_result: dict, charger_id: str) -> dict:
+        """Look up a reserved charger in the search (or plan) results."""
+        for tool_result in charging_result.get('tool_results', []):
+            if isinstance(tool_result, dict):
+                tool_result = tool_result.get('stops', [])
+            if isinstance(tool_result, list):
+                for charger in tool_result:
+                    if isinstance(charger, dict) and charger.get('id') == charger_id:
+                        return charger
+        return {}
+    
+    def _charging_session(self, vehicle_data: dict, trip_data: dict, charger: dict) -> tuple[int, float]:
+        """
+        Estimate a charging stop with the vehicle's charging curve.
+        
+        The vehicle arrives with what is left after driving from the origin
+        and charges enough to finish the trip with the usual reserve.
+        
+        Returns:
+            (minutes, kwh)
+        """
+        curve = get_charging_curve(vehicle_data.get('model'))
+        power_kw = charger.get('power_kw') or 150
+        range_miles = vehicle_data.get('range_miles', 300)
+        per_km = percent_per_km(range_miles, trip_data.get('weather_temp_f', 70))
+        
+        to_charger_km = 0.0
+        arrive_percent = charger.get('arrive_percent')
+        if arrive_percent is None:
+            origin = get_coordinates(trip_data.get('origin', ''))
+            if origin and 'latitude' in charger and 'longitude' in charger:
+                to_charger_km = haversine_km(origin, (charger['latitude'], charger['longitude'])) * ROAD_CURVATURE
+            arrive_percent = max(vehicle_data.get('battery_percent', 0) - to_charger_km * per_km, 0)
+        
+        target_percent = charger.get('depart_percent')
+        if target_percent is None:
+            remaining_km = trip_data.get('distance_miles', range_miles) * KM_PER_MILE - to_charger_km
+            target_percent = min(max(remaining_km, 0) * per_km + RESERVE_PERCENT, 100)
+        
+        minutes = curve.minutes(arrive_percent, target_percent, power_kw)
+        return max(round(minutes), 1), curve.energy_kwh(arrive_percent, target_percent)
     
     def _generate_summary_with_insufficient_range(self, results: dict, message: str, recommended_stations: list) -> str:
         """Generate summary when battery is insufficient but we plan amenities anyway"""
@@ -1,21 +1,16 @@
-from strands.models import BedrockModel
 from strands import Agent
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID
-from tools.charging_tools import check_charger_status, cancel_reservation, search_chargers, reserve_charging_slot
+from utils.agent_pool import get_agent_pool, get_model
+from utils.event_loop import run_sync
+from tools.charging_tools import check_charger_status, cancel_reservation, search_chargers_async, reserve_charging_slot
 import json
-import asyncio
 
 class MonitoringAgent:
     def __init__(self):
-        self.model = BedrockModel(
-            model_id=BEDROCK_MODEL_ID,
-            region_name=AWS_REGION,
-            temperature=0.7
-        )
+        self.model = get_model()
     
     def monitor_and_alert(self, reservation_id: str, charger_id: str, route: str) -> dict:
         """Synchronous wrapper for async monitor_and_alert"""
-        return asyncio.run(self.monitor_and_alert_async(reservation_id, charger_id, route))
+        return run_sync(self.monitor_and_alert_async(reservation_id, charger_id, route))
     
     async def monitor_and_alert_async(self, reservation_id: str, charger_id: str, route: str) -> dict:
         system_prompt = """You are a monitoring specialist. Check charger status and handle 
@@ -28,11 +23,12 @@ Route: {route}
 
 Check status and alert if issues detected."""
         
-        agent = Agent(
+        agents = get_agent_pool("monitoring", lambda: Agent(
             model=self.model,
             system_prompt=system_prompt,
-            tools=[check_charger_status, cancel_reservation, search_chargers, reserve_charging_slot]
-        )
+            tools=[check_charger_status, cancel_reservation, search_chargers_async, reserve_charging_slot]
+        ))
+        agent = agents.acquire()
         
         response_text = ""
         tool_results = []
@@ -60,6 +56,8 @@ Check status and alert if issues detected."""
                                                     pass
         except Exception as e:
             response_text = f"Error: {str(e)}"
+        finally:
+            agents.release(agent)
         
         return {
             "status": response_text,
@@ -6,15 +6,14 @@ Uses the isolated payment-agent tools for all payment operations
 import sys
 import os
 import json
-import asyncio
 
 # Add payment-agent to path for direct tool access
 payment_agent_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'payment-agent')
 sys.path.insert(0, payment_agent_path)
 
-from strands.models import BedrockModel
 from strands import Agent
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID
+from utils.agent_pool import get_agent_pool, get_model
+from utils.event_loop import run_sync
 
 # Import wrapped tools for Strands (with @Tool decorator)
 from tools.payment_tools_wrapped import (
@@ -45,31 +44,29 @@ class PaymentAgent:
     """
     
     def __init__(self):
-        self.model = BedrockModel(
-            model_id=BEDROCK_MODEL_ID,
-            region_name=AWS_REGION,
-            temperature=0.7
-        )
+        self.model = get_model()
     
-    def process_payments(self, transactions: list, wallet_id: str) -> dict:
+    def process_payments(self, transactions: list, wallet_id: str, wallet: dict = None, fees: list = None) -> dict:
         """Synchronous wrapper for async process_payments"""
-        if not transactions:
-            print("⚠️  No transactions to process\n")
-            return {"payments": None, "message": "No payments to process", "tool_results": []}
-        
-        return asyncio.run(self.process_payments_async(transactions, wallet_id))
+        return run_sync(self.process_payments_async(transactions, wallet_id, wallet, fees))
     
-    async def process_payments_async(self, transactions: list, wallet_id: str) -> dict:
+    async def process_payments_async(self, transactions: list, wallet_id: str, wallet: dict = None, fees: list = None) -> dict:
         """
         Process multiple payment transactions.
         
         Args:
             transactions: List of transaction dicts with amount, merchant, description
             wallet_id: User's wallet identifier
+            wallet: validate_wallet result, if the wallet was already checked
+            fees: quote_fees results for the transactions, if already calculated
             
         Returns:
             Dict with payment results and tool call details
         """
+        if not transactions:
+            print("⚠️  No transactions to process\n")
+            return {"payments": None, "message": "No payments to process", "tool_results": []}
+        
         print("\n" + "="*70)
         print("💳 PAYMENT AGENT CALLED")
         print("="*70)
@@ -93,6 +90,15 @@ Wallet ID: {wallet_id}
 
 Process all payments and provide confirmation with transaction IDs."""
         
+        # Steps already done by the coordinator are handed over rather than repeated
+        tool_results = []
+        if wallet:
+            user_prompt += f"\n\nWallet already validated (do NOT call validate_wallet): {json.dumps(wallet)}"
+            tool_results.append(wallet)
+        if fees:
+            user_prompt += f"\nFees already calculated (do NOT call calculate_fees): {json.dumps(fees)}"
+            tool_results.extend(fees)
+        
         # Provide all relevant tools to the agent (wrapped with @Tool decorator)
         available_tools = [
             validate_wallet_tool,
@@ -111,15 +117,15 @@ Process all payments and provide confirmation with transaction IDs."""
         print()
         
         # Create agent with tools
-        agent = Agent(
+        agents = get_agent_pool("payment", lambda: Agent(
             model=self.model,
             system_prompt=system_prompt,
             tools=available_tools
-        )
+        ))
+        agent = agents.acquire()
         
         # Stream response and collect results
         response_text = ""
-        tool_results = []
         
         print(f"💳 Payment Agent: Starting Bedrock API stream...")
         
@@ -149,6 +155,8 @@ Process all payments and provide confirmation with transaction IDs."""
             import traceback
             traceback.print_exc()
             response_text = f"Error: {str(e)}"
+        finally:
+            agents.release(agent)
         
         # Log the results
         print("\n" + "="*70)
@@ -203,6 +211,26 @@ Process all payments and provide confirmation with transaction IDs."""
             "tool_results": tool_results
         }
     
+    def quote_fees(self, transactions: list, wallet: dict, merchant_type: str = "general") -> list:
+        """
+        Calculate the fees for transactions on the wallet's default payment method.
+        
+        Args:
+            transactions: List of transaction dicts with amount
+            wallet: validate_wallet result
+            merchant_type: Type of merchant (charging, food, parking, etc.)
+            
+        Returns:
+            One calculate_fees result per transaction
+        """
+        methods = wallet.get('payment_methods') or [{}]
+        method = next((m for m in methods if m.get('default')), methods[0])
+        payment_method = method.get('type', 'credit_card')
+        return [
+            pt.calculate_fees(txn.get('amount', 0), payment_method, merchant_type)
+            for txn in transactions
+        ]
+    
     def process_single_payment(self, amount: float, merchant: str, wallet_id: str, 
                               description: str = "") -> dict:
         """
@@ -1,21 +1,72 @@
-from strands.models import BedrockModel
 from strands import Agent
-from utils.config import AWS_REGION, BEDROCK_MODEL_ID
+from utils.agent_pool import get_agent_pool, get_model
+from utils.event_loop import run_sync
 from tools.route_tools import calculate_energy_needs, get_route_info
+from utils.energy import energy_needs
 import json
-import asyncio
 
 class TripPlanningAgent:
     def __init__(self):
-        self.model = BedrockModel(
-            model_id=BEDROCK_MODEL_ID,
-            region_name=AWS_REGION,
-            temperature=0.7
+        self.model = get_model()
+    
+    def assess(self, vehicle_data: dict, trip_data: dict) -> dict:
+        """
+        Energy analysis without the LLM.
+        
+        Runs the same calculation as the calculate_energy_needs tool and
+        returns it in the shape analyze() does, with no analysis text yet
+        (see narrate).
+        """
+        energy = energy_needs(
+            vehicle_data['battery_percent'],
+            trip_data['distance_miles'],
+            vehicle_data['range_miles'],
+            trip_data.get('weather_temp_f', 70)
         )
+        print(f"   - Energy needs: {energy}")
+        return {
+            "analysis": "",
+            "tool_results": [energy]
+        }
+    
+    def narrate(self, vehicle_data: dict, trip_data: dict, energy: dict) -> str:
+        """Synchronous wrapper for async narrate"""
+        return run_sync(self.narrate_async(vehicle_data, trip_data, energy))
+    
+    async def narrate_async(self, vehicle_data: dict, trip_data: dict, energy: dict) -> str:
+        """
+        Write the driver-facing trip analysis for an energy result from assess().
+        
+        Returns:
+            The analysis text ("" if the model call fails)
+        """
+        system_prompt = """You are a trip planning specialist for EVs.
+The energy calculation has already been done; never recalculate or change its numbers.
+Explain the result to the driver in 2-3 short sentences."""
+        
+        user_prompt = f"""
+Vehicle: {vehicle_data['model']}, {vehicle_data['battery_percent']}% battery, {vehicle_data['range_miles']} miles range
+Trip: {trip_data['origin']} → {trip_data['destination']}, {trip_data['distance_miles']} miles, departing {trip_data.get('departure', 'now')}
+Energy calculation: {json.dumps(energy)}"""
+        
+        agents = get_agent_pool("trip_narrative", lambda: Agent(model=self.model, system_prompt=system_prompt, tools=[]))
+        agent = agents.acquire()
+        
+        response_text = ""
+        try:
+            async for event in agent.stream_async(user_prompt):
+                if isinstance(event, dict) and 'data' in event:
+                    response_text += str(event['data'])
+        except Exception as e:
+            print(f"   ⚠️  Trip narrative unavailable: {str(e)}")
+            response_text = ""
+        finally:
+            agents.release(agent)
+        return response_text
     
     def analyze(self, vehicle_data: dict, trip_data: dict) -> dict:
         """Synchronous wrapper for async analyze"""
-        return asyncio.run(self.analyze_async(vehicle_data, trip_data))
+        return run_sync(self.analyze_async(vehicle_data, trip_data))
     
     async def analyze_async(self, vehicle_data: dict, trip_data: dict) -> dict:
         system_prompt = """You are a trip planning specialist for EVs.
@@ -41,11 +92,12 @@ Use the calculate_energy_needs tool to analyze if charging is needed for this tr
 Call it with: battery_percent={vehicle_data['battery_percent']}, trip_distance_miles={trip_data['distance_miles']}, vehicle_range_miles={vehicle_data['range_miles']}"""
         
         # Create agent with tools
-        agent = Agent(
+        agents = get_agent_pool("trip_planning", lambda: Agent(
             model=self.model,
             system_prompt=system_prompt,
             tools=[calculate_energy_needs, get_route_info]
-        )
+        ))
+        agent = agents.acquire()
         
         # Stream response and collect results
         response_text = ""
@@ -82,6 +134,8 @@ Call it with: battery_percent={vehicle_data['battery_percent']}, trip_distance_m
         except Exception as e:
             print(f"   ⚠️  Error: {str(e)}")
             response_text = f"Error: {str(e)}"
+        finally:
+            agents.release(agent)
         
         return {
             "analysis": response_text,
@@ -2,6 +2,7 @@ import gradio as gr
 import json
 from datetime import datetime, timedelta
 from agents.coordinator import CoordinatorAgent
+from utils.distance_matrix import get_distance_matrix
 
 # Initialize coordinator
 coordinator = CoordinatorAgent()
@@ -13,6 +14,9 @@ default_vehicle = {
     "range_miles": 300
 }
 
+# Where the vehicle is parked; trip distances are measured from here
+CURRENT_LOCATION = "Los Angeles, CA"
+
 default_preferences = {
     "auto_order_coffee": True,
     "favorite_drink": "Large Latte",
@@ -27,18 +31,16 @@ def parse_user_message(message: str, vehicle_state: dict) -> dict:
     destination = "Los Angeles, CA"
     if "san francisco" in message_lower or "sf" in message_lower:
         destination = "San Francisco, CA"
-        distance = 380
     elif "san diego" in message_lower:
         destination = "San Diego, CA"
-        distance = 120
     elif "seattle" in message_lower:
         destination = "Seattle, WA"
-        distance = 1150
     elif "las vegas" in message_lower:
         destination = "Las Vegas, NV"
-        distance = 270
-    else:
-        distance = 280
+    
+    # Road distance from the vehicle's location
+    leg = get_distance_matrix().get(CURRENT_LOCATION, destination)
+    distance = round(leg.distance_miles) if leg else 280
     
     # Extract battery if mentioned
     battery = vehicle_state['battery_percent']
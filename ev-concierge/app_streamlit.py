@@ -2,6 +2,7 @@ import streamlit as st
 import json
 from datetime import datetime, timedelta
 from agents.coordinator import CoordinatorAgent
+from utils.distance_matrix import get_distance_matrix
 import time
 
 st.set_page_config(page_title="EV Concierge", page_icon="🚗", layout="wide")
@@ -52,33 +53,9 @@ with col1:
         st.session_state.trip_active = True
         st.session_state.notifications = []
         
-        # Build trip data with distance matrix
-        # Distance matrix (miles between cities)
-        distance_matrix = {
-            ("Los Angeles, CA", "San Francisco, CA"): 380,
-            ("Los Angeles, CA", "San Diego, CA"): 120,
-            ("Los Angeles, CA", "Seattle, WA"): 1150,
-            ("Los Angeles, CA", "Las Vegas, NV"): 270,
-            ("San Francisco, CA", "Los Angeles, CA"): 380,
-            ("San Francisco, CA", "San Diego, CA"): 500,
-            ("San Francisco, CA", "Seattle, WA"): 800,
-            ("San Francisco, CA", "Las Vegas, NV"): 570,
-            ("San Diego, CA", "Los Angeles, CA"): 120,
-            ("San Diego, CA", "San Francisco, CA"): 500,
-            ("San Diego, CA", "Seattle, WA"): 1250,
-            ("San Diego, CA", "Las Vegas, NV"): 330,
-            ("Seattle, WA", "Los Angeles, CA"): 1150,
-            ("Seattle, WA", "San Francisco, CA"): 800,
-            ("Seattle, WA", "San Diego, CA"): 1250,
-            ("Seattle, WA", "Las Vegas, NV"): 1120,
-            ("Las Vegas, NV", "Los Angeles, CA"): 270,
-            ("Las Vegas, NV", "San Francisco, CA"): 570,
-            ("Las Vegas, NV", "San Diego, CA"): 330,
-            ("Las Vegas, NV", "Seattle, WA"): 1120,
-        }
-        
-        # Get distance between origin and destination
-        distance = distance_matrix.get((origin, destination), 0)
+        # Road distance between origin and destination
+        leg = get_distance_matrix().get(origin, destination)
+        distance = round(leg.distance_miles) if leg else 0
         
         if origin == destination:
             st.warning("⚠️ Origin and destination are the same!")
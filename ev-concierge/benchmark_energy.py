@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: batched vs per-trip energy-needs screening
+
+Screens 1,000,000 random fleet trips with energy_needs_batch and compares
+the cost per trip with calling energy_needs (what calculate_energy_needs
+runs) in a loop over a 100,000-trip sample, checking that both agree.
+
+Usage:
+    python benchmark_energy.py
+"""
+
+import time
+import numpy as np
+from utils.energy import energy_needs, energy_needs_batch
+
+TRIPS = 1_000_000
+SAMPLE = 100_000
+
+def main():
+    rng = np.random.default_rng(0)
+    battery = rng.integers(5, 101, TRIPS)
+    distance = rng.integers(10, 800, TRIPS)
+    vehicle_range = rng.choice([220, 250, 270, 300, 330, 350], TRIPS)
+    temp = rng.integers(-10, 111, TRIPS)
+    
+    print("=" * 70)
+    print(f"Energy screening benchmark: {TRIPS:,} trips")
+    print("=" * 70)
+    
+    start = time.perf_counter()
+    result = energy_needs_batch(battery, distance, vehicle_range, temp)
+    batch_s = time.perf_counter() - start
+    print(f"\n⏱️  energy_needs_batch: {batch_s * 1000:8.1f} ms total, {batch_s * 1e9 / TRIPS:8.1f} ns/trip")
+    print(f"   {result['needs_charging'].mean():.1%} need charging, {(result['charging_strategy'] == 'pre-trip').mean():.1%} before departure")
+    
+    args = list(zip(battery[:SAMPLE].tolist(), distance[:SAMPLE].tolist(), vehicle_range[:SAMPLE].tolist(), temp[:SAMPLE].tolist()))
+    start = time.perf_counter()
+    single = [energy_needs(*trip) for trip in args]
+    loop_s = time.perf_counter() - start
+    print(f"⏱️  energy_needs loop:  {loop_s * 1e9 / SAMPLE:8.1f} ns/trip ({loop_s * TRIPS / SAMPLE:.1f} s for {TRIPS:,})")
+    print(f"   Speedup: {loop_s / SAMPLE / (batch_s / TRIPS):.0f}x")
+    
+    for name in ("required_battery", "needs_charging", "deficit_percent", "charging_strategy"):
+        assert [trip[name] for trip in single] == result[name][:SAMPLE].tolist(), name
+    print(f"\n✅ Batched and per-trip results identical on {SAMPLE:,} trips")
+
+if __name__ == "__main__":
+    main()
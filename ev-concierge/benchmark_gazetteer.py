@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: offline gazetteer lookups
+
+Runs 100,000 queries of each kind against the gazetteer at GAZETTEER_PATH
+(the bundled places file unless overridden, e.g. with a GeoNames
+cities1000.txt) and reports the cost per lookup:
+  - exact names as the app sends them ("Fresno, CA")
+  - free-form spellings that normalize to an exact key ("fresno california")
+  - typos resolved through the trigram index ("Frenso, CA")
+  - prefix autocomplete ("Fre")
+  - reverse geocoding random points in the western US, one by one and
+    as a single batch (how station locations are labelled)
+
+Usage:
+    python benchmark_gazetteer.py
+    GAZETTEER_PATH=data/cities1000.txt python benchmark_gazetteer.py
+"""
+
+import random
+import time
+from utils.config import GAZETTEER_PATH
+from utils.gazetteer import Gazetteer, STATE_ABBREVIATIONS
+
+LOOKUPS = 100_000
+
+STATE_NAMES = {abbreviation.upper(): name.title() for name, abbreviation in STATE_ABBREVIATIONS.items()}
+
+def misspell(name, r):
+    """Swap two neighbouring letters, away from the first character."""
+    if len(name) < 5:
+        return name
+    i = r.randint(1, len(name) - 3)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+def timed(label, fn, queries):
+    start = time.perf_counter()
+    found = sum(1 for query in queries if fn(query) is not None)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<34} {elapsed * 1e6 / len(queries):8.2f} µs/lookup   {found / len(queries):6.1%} found")
+
+def main():
+    r = random.Random(0)
+    
+    start = time.perf_counter()
+    gazetteer = Gazetteer.from_file(GAZETTEER_PATH)
+    load_ms = (time.perf_counter() - start) * 1000
+    
+    print("=" * 70)
+    print(f"Gazetteer benchmark: {len(gazetteer)} places ({GAZETTEER_PATH})")
+    print("=" * 70)
+    print(f"\n📂 Load + index: {load_ms:.1f} ms")
+    
+    places = r.choices(gazetteer.places, k=LOOKUPS)
+    exact = [place.label for place in places]
+    free_form = [f"{place.name.lower()} {STATE_NAMES.get(place.state, place.state)}" for place in places]
+    typos = [f"{misspell(place.name, r)}, {place.state}" for place in places]
+    prefixes = [place.name[:3] for place in places]
+    points = [(r.uniform(32.5, 49.0), r.uniform(-124.5, -104.0)) for _ in range(LOOKUPS)]
+    
+    print(f"\n⏱️  {LOOKUPS:,} lookups each")
+    timed("exact (\"Fresno, CA\")", gazetteer.lookup, exact)
+    timed("normalized (\"fresno California\")", gazetteer.lookup, free_form)
+    timed("fuzzy (\"Frenso, CA\")", gazetteer.lookup, typos)
+    timed("prefix autocomplete (\"Fre\")", lambda prefix: gazetteer.complete(prefix, limit=5) or None, prefixes)
+    timed("reverse geocode (50 km)", lambda point: gazetteer.reverse(*point), points)
+    
+    lats = [lat for lat, _ in points]
+    lons = [lon for _, lon in points]
+    start = time.perf_counter()
+    found = sum(1 for place in gazetteer.reverse_batch(lats, lons) if place is not None)
+    elapsed = time.perf_counter() - start
+    print(f"   {'reverse geocode, one batch':<34} {elapsed * 1e6 / LOOKUPS:8.2f} µs/lookup   {found / LOOKUPS:6.1%} found")
+    
+    print("\n✅ Benchmark complete")
+
+if __name__ == "__main__":
+    main()
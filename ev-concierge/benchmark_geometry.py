@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-station geometry vs the batched great-circle kernel
+
+Times the per-station functions and the batched kernels on random stations
+around the Seattle → San Diego corridor and reports how far the planar
+per-station approximation drifts from the spherical result.
+"""
+
+import random
+import time
+from utils import location_coords
+from utils.location_coords import (
+    along_track_km,
+    calculate_distance_km,
+    cross_track_km,
+    distance_from_line,
+    great_circle_geometry_batch,
+    haversine_km,
+    haversine_km_batch,
+)
+
+SEATTLE = (47.6062, -122.3321)
+SAN_DIEGO = (32.7157, -117.1611)
+ROUTE = [SEATTLE, SAN_DIEGO]
+
+def timed(label, fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"   {label:<42} {best * 1000:9.2f} ms")
+    return result
+
+def main(count=20000):
+    r = random.Random(0)
+    lats = [r.uniform(32, 48) for _ in range(count)]
+    lons = [r.uniform(-125, -114) for _ in range(count)]
+    points = list(zip(lats, lons))
+    
+    print("=" * 70)
+    print(f"Route geometry benchmark: {count} stations, Seattle → San Diego")
+    print(f"NumPy available: {location_coords.np is not None}")
+    print("=" * 70)
+    
+    print("\n⏱️  Per-station loops")
+    planar_distances = timed("planar calculate_distance_km", lambda: [calculate_distance_km(SEATTLE, p) for p in points])
+    planar_deviation = timed("planar distance_from_line", lambda: [distance_from_line(p, SEATTLE, SAN_DIEGO) for p in points])
+    timed("spherical haversine_km", lambda: [haversine_km(SEATTLE, p) for p in points])
+    timed("spherical cross_track_km + along_track_km",
+          lambda: [(cross_track_km(p, SEATTLE, SAN_DIEGO), along_track_km(p, SEATTLE, SAN_DIEGO)) for p in points])
+    
+    print("\n⏱️  Batched kernels")
+    exact_distances = timed("spherical haversine_km_batch", lambda: haversine_km_batch(SEATTLE, lats, lons))
+    exact_deviation, _ = timed("spherical great_circle_geometry_batch", lambda: great_circle_geometry_batch(lats, lons, ROUTE))
+    
+    print("\n📐 Planar error vs great-circle (stations within 200 km of the route)")
+    near = [i for i in range(count) if exact_deviation[i] <= 200]
+    deviation_errors = sorted(abs(planar_deviation[i] - exact_deviation[i]) for i in near)
+    distance_errors = sorted(abs(planar_distances[i] - exact_distances[i]) for i in near)
+    print(f"   Deviation error: median {deviation_errors[len(near) // 2]:.1f} km, max {deviation_errors[-1]:.1f} km")
+    print(f"   Origin distance error: median {distance_errors[len(near) // 2]:.1f} km, max {distance_errors[-1]:.1f} km")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: OpenChargeMap response parsing
+
+Parses a 5,000-POI payload (a page recorded with
+``python -m utils.station_sync --record DIR``, or a synthetic one in the
+same shape) and compares:
+  - decoding the whole body with json.loads vs streaming it with
+    iter_json_array (time and peak memory)
+  - operator lookup by linear substring scan vs the precompiled,
+    memoized map_operator_to_network
+
+Usage:
+    python benchmark_parser.py                      # synthetic payload
+    python benchmark_parser.py recordings/page-0001.json
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from utils.json_stream import iter_json_array
+from utils.openchargemap_client import NETWORK_MAPPING, map_operator_to_network, parse_openchargemap_response
+
+OPERATORS = [
+    "EVgo Network", "ChargePoint Network", "Electrify America", "Tesla Motors (Worldwide)",
+    "Blink Charging", "Shell Recharge Solutions", "SemaConnect", "FLO", "Volta Charging",
+    "EV Connect", "Francis Energy", "Rivian Adventure Network",
+]
+
+def synthetic_payload(count=5000, seed=0):
+    r = random.Random(seed)
+    pois = []
+    for i in range(count):
+        town = r.choice(["Fresno", "Bakersfield", "Barstow", "Kettleman City", "Redding", ""])
+        pois.append({
+            "ID": 100000 + i,
+            "UUID": f"{r.getrandbits(128):032x}",
+            "DataProviderID": 1,
+            "OperatorInfo": r.choice([None, {"ID": i % 50, "Title": r.choice(OPERATORS), "WebsiteURL": "https://example.com"}]),
+            "UsageCost": r.choice(["$0.43/kWh", "$0.30 per kWh", "Free", "", None]),
+            "AddressInfo": {
+                "ID": 200000 + i,
+                "Title": r.choice(["Tesla Supercharger", "EVgo Station", "Walmart", "ChargePoint Lot"]) + f" {town}",
+                "AddressLine1": f"{r.randint(1, 9999)} Main St",
+                "Town": town,
+                "StateOrProvince": "CA",
+                "Postcode": f"9{r.randint(1000, 9999)}",
+                "CountryID": 2,
+                "Latitude": r.uniform(32.5, 42.0),
+                "Longitude": r.uniform(-124.0, -114.0),
+            },
+            "Connections": [
+                {"ID": j, "ConnectionTypeID": r.choice([2, 32, 33]), "PowerKW": r.choice([50, 150, 250, 350, None]), "Quantity": r.randint(1, 8)}
+                for j in range(r.randint(1, 4))
+            ],
+            "NumberOfPoints": r.randint(1, 12),
+            "StatusType": {"ID": 50, "IsOperational": True, "Title": "Operational"},
+            "DateLastStatusUpdate": "2024-05-01T00:00:00Z",
+        })
+    return json.dumps(pois)
+
+def linear_map_operator(operator_name):
+    """The lookup used before: exact match, then a lowercase scan of every key."""
+    if not operator_name:
+        return "Unknown Network"
+    if operator_name in NETWORK_MAPPING:
+        return NETWORK_MAPPING[operator_name]
+    operator_lower = operator_name.lower()
+    for key, value in NETWORK_MAPPING.items():
+        if key.lower() in operator_lower:
+            return value
+    return operator_name
+
+def timed(label, fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"   {label:<42} {best * 1000:9.2f} ms")
+    return result
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def chunked(text, size=64 * 1024):
+    encoded = text.encode()
+    return (encoded[i:i + size] for i in range(0, len(encoded), size))
+
+def main(path=None):
+    if path:
+        with open(path) as f:
+            body = f.read()
+        source = path
+    else:
+        body = synthetic_payload()
+        source = "synthetic"
+    
+    pois = json.loads(body)
+    operators = [(poi.get('OperatorInfo') or {}).get('Title') for poi in pois]
+    
+    print("=" * 70)
+    print(f"Parser benchmark: {len(pois)} POIs ({source}, {len(body) / 1e6:.1f} MB)")
+    print("=" * 70)
+    
+    print("\n⏱️  Operator lookup (every POI)")
+    timed("linear substring scan", lambda: [linear_map_operator(name) for name in operators])
+    map_operator_to_network.cache_clear()
+    timed("precompiled pattern, cold cache", lambda: [map_operator_to_network.__wrapped__(name) for name in operators])
+    timed("precompiled pattern, memoized", lambda: [map_operator_to_network(name) for name in operators])
+    assert [linear_map_operator(name) for name in operators] == [map_operator_to_network(name) for name in operators]
+    
+    print("\n⏱️  Decode + parse")
+    loaded = timed("json.loads then parse", lambda: parse_openchargemap_response(json.loads(body)))
+    streamed = timed("iter_json_array over 64 KB chunks", lambda: parse_openchargemap_response(iter_json_array(chunked(body))))
+    assert loaded == streamed
+    
+    print("\n💾 Peak memory while parsing (excluding the raw body)")
+    chunks = list(chunked(body))
+    loaded_peak = peak_memory(lambda: parse_openchargemap_response(json.loads(body)))
+    streamed_peak = peak_memory(lambda: parse_openchargemap_response(iter_json_array(iter(chunks))))
+    print(f"   {'json.loads then parse':<42} {loaded_peak / 1e6:9.2f} MB")
+    print(f"   {'iter_json_array':<42} {streamed_peak / 1e6:9.2f} MB")
+    
+    print(f"\n✅ {len(streamed)} stations parsed identically both ways")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
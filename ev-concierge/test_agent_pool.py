@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the shared model clients and agent pools (no network or model calls)
+"""
+
+import asyncio
+import concurrent.futures
+import time
+from strands import Agent
+from agents.coordinator import CoordinatorAgent
+from utils.agent_pool import AgentPool, get_agent_pool, get_model, pool_stats
+from utils.event_loop import run_sync
+
+def test_agent_pool():
+    print("=" * 60)
+    print("Testing Agent Pools")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: One model client per model ID")
+    started = time.perf_counter()
+    coordinators = [CoordinatorAgent() for _ in range(3)]
+    elapsed = time.perf_counter() - started
+    models = {id(agent.model) for c in coordinators
+              for agent in (c.trip_agent, c.charging_agent, c.amenities_agent, c.payment_agent, c.monitoring_agent)}
+    assert models == {id(get_model())}
+    assert get_model("other-model") is not get_model()
+    print(f"   ✅ 3 coordinators share one BedrockModel ({elapsed * 1000:.0f} ms to build)")
+    
+    print("\n🧪 Test 2: Released agents are reused with a clean conversation")
+    model = get_model()
+    pool = AgentPool("test", lambda: Agent(model=model, system_prompt="You are a test.", tools=[]), size=2)
+    agent = pool.acquire()
+    agent.messages.append({"role": "user", "content": [{"text": "hello"}]})
+    agent.state.set("stop", "Kettleman City")
+    pool.release(agent)
+    again = pool.acquire()
+    assert again is agent
+    assert again.messages == [] and again.state.get("stop") is None
+    assert again.system_prompt == "You are a test."
+    print("   ✅ Same agent, empty messages and state, prompt kept")
+    
+    print("\n🧪 Test 3: Concurrent callers get their own agents; idle agents are bounded")
+    busy = [again] + [pool.acquire() for _ in range(3)]
+    assert len({id(agent) for agent in busy}) == 4
+    for agent in busy:
+        pool.release(agent)
+    assert pool.stats() == {"role": "test", "idle": 2, "created": 4, "reused": 1, "discarded": 2}
+    print(f"   ✅ {pool.stats()}")
+    
+    print("\n🧪 Test 4: Pools are shared per role")
+    first = get_agent_pool("test-role", lambda: Agent(model=model, tools=[]))
+    assert get_agent_pool("test-role", lambda: None) is first
+    assert any(stats["role"] == "test-role" for stats in pool_stats())
+    print("   ✅ One pool per role")
+    
+    print("\n🧪 Test 5: An agent goes back to the pool even if its call is cancelled")
+    trip_agent = coordinators[0].trip_agent
+    narrators = get_agent_pool("trip_narrative", lambda: Agent(model=model, tools=[]))
+    narrator = narrators.acquire()
+    async def cancelled_stream(prompt):
+        raise asyncio.CancelledError()
+        yield
+    narrator.stream_async = cancelled_stream
+    narrators.release(narrator)
+    energy = {"needs_charging": True, "deficit_percent": 12.0}
+    trip = {"origin": "Los Angeles, CA", "destination": "San Francisco, CA", "distance_miles": 380}
+    try:
+        run_sync(trip_agent.narrate_async({"model": "Test EV", "battery_percent": 40, "range_miles": 300}, trip, energy))
+        raise AssertionError("expected the call to be cancelled")
+    except (asyncio.CancelledError, concurrent.futures.CancelledError):
+        pass
+    assert narrators.acquire() is narrator
+    print("   ✅ Released by the finally block and reused")
+    
+    print("\n" + "=" * 60)
+    print("✅ Agent pool test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_agent_pool()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test the async OpenChargeMap client against a local server (no internet required)
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import httpx
+import utils.openchargemap_client as ocm
+from utils.http_session import close_async_client, get_json_async, session_stats
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+
+RESPONSE_DELAY_SECONDS = 0.2
+
+class SlowPOIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+    truncated_left = 0
+    queries = []
+    
+    def do_GET(self):
+        if SlowPOIHandler.failures_left > 0:
+            SlowPOIHandler.failures_left -= 1
+            status, body = 503, b"{}"
+        else:
+            # One station at the center of every search circle
+            time.sleep(RESPONSE_DELAY_SECONDS)
+            query = parse_qs(urlparse(self.path).query)
+            SlowPOIHandler.queries.append(query)
+            lat = float(query.get("latitude", ["35.0"])[0])
+            lon = float(query.get("longitude", ["-119.0"])[0])
+            poi = {
+                "ID": int(abs(lat * 1000)) * 1000 + int(abs(lon * 10)),
+                "OperatorInfo": {"Title": "EVgo Network"},
+                "AddressInfo": {"Title": "EVgo Station", "Town": "Town", "StateOrProvince": "CA", "Latitude": lat, "Longitude": lon},
+                "Connections": [{"PowerKW": 150}],
+                "StatusType": {"IsOperational": True}
+            }
+            status, body = 200, json.dumps([poi]).encode()
+            if SlowPOIHandler.truncated_left > 0:
+                SlowPOIHandler.truncated_left -= 1
+                body = body[:len(body) // 2]  # cut off mid-array
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+async def _run_checks(url: str):
+    print("\n🧪 Test 1: Async GET retries transient 503s")
+    before = session_stats()
+    SlowPOIHandler.failures_left = 1
+    data = await get_json_async(url, params={"latitude": 35, "longitude": -119}, max_retries=2)
+    assert len(data) == 1
+    assert session_stats()["retries"] - before["retries"] == 1
+    print("   ✅ Succeeded after 1 retry")
+    
+    print("\n🧪 Test 2: Retries stop at the limit")
+    SlowPOIHandler.failures_left = 5
+    try:
+        await get_json_async(url, max_retries=1)
+        raise AssertionError("expected HTTPStatusError")
+    except httpx.HTTPStatusError:
+        pass
+    SlowPOIHandler.failures_left = 0
+    print("   ✅ Gave up after 1 retry")
+    
+    print("\n🧪 Test 3: Corridor tiles are fetched concurrently")
+    la, sf = (34.0522, -118.2437), (37.7749, -122.4194)
+    tiles = ocm.route_tiles([la, sf], tile_km=ocm.TILE_KM, buffer_km=ocm.STRAIGHT_LINE_DEVIATION_KM)
+    started = time.perf_counter()
+    stations = await ocm.fetch_route_stations_async(la, sf, min_power_kw=50)
+    elapsed = time.perf_counter() - started
+    print(f"   {len(tiles)} tiles, {len(stations)} stations in {elapsed:.2f}s")
+    assert len(stations) == len(tiles)
+    assert elapsed < len(tiles) * RESPONSE_DELAY_SECONDS
+    print("   ✅ Faster than fetching tiles one by one")
+    
+    print("\n🧪 Test 4: Async and sync results agree")
+    ocm.get_response_cache().clear()
+    async_result = await ocm.get_chargers_along_route_async(la, sf, current_range_miles=300)
+    ocm.get_response_cache().clear()
+    sync_result = await asyncio.to_thread(ocm.get_chargers_along_route, la, sf, current_range_miles=300)
+    assert [s["id"] for s in async_result] == [s["id"] for s in sync_result]
+    ocm.get_response_cache().clear()
+    async_top = await ocm.get_chargers_along_route_async(la, sf, current_range_miles=300, max_results=2)
+    sync_top = await asyncio.to_thread(ocm.get_chargers_along_route, la, sf, current_range_miles=300, max_results=2)
+    assert [s["id"] for s in async_top] == [s["id"] for s in sync_top] and len(sync_top) == 2
+    print(f"   ✅ Same {len(async_result)} stations in the same order, and the same top 2")
+    
+    print("\n🧪 Test 5: The planner reuses search_chargers' corridor fetch")
+    ocm.get_response_cache().clear()
+    SlowPOIHandler.queries.clear()
+    await ocm.get_chargers_along_route_async(la, sf, min_power_kw=150, max_results=10)
+    searched = len(SlowPOIHandler.queries)
+    stations, geometry = await asyncio.to_thread(ocm.get_corridor_stations, la, sf, min_power_kw=150)
+    assert len(SlowPOIHandler.queries) == searched and len(stations) == len(geometry) > 0
+    assert {query["maxresults"][0] for query in SlowPOIHandler.queries} == {str(ocm.CORRIDOR_RESULTS_PER_TILE)}
+    print(f"   ✅ {searched} tile requests, none repeated for the corridor")
+    
+    print("\n🧪 Test 6: A truncated tile counts as one failed tile")
+    for fetch in (ocm.fetch_route_stations_async, lambda *args, **kwargs: asyncio.to_thread(ocm.fetch_route_stations, *args, **kwargs)):
+        ocm.get_response_cache().clear()
+        SlowPOIHandler.truncated_left = 1
+        stations = await fetch(la, sf, min_power_kw=50)
+        assert SlowPOIHandler.truncated_left == 0 and len(stations) == len(tiles) - 1
+    print(f"   ✅ {len(tiles) - 1} of {len(tiles)} tiles kept, sync and async")
+    
+    await close_async_client()
+
+def test_async_client():
+    print("=" * 60)
+    print("Testing Async OpenChargeMap Client")
+    print("=" * 60)
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPOIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/poi"
+    
+    saved = (ocm.OPENCHARGEMAP_POI_URL, ocm.OCM_BACKEND, ocm._response_cache, ocm._rate_limiter, os.environ.get('OPENCHARGEMAP_API_KEY'))
+    ocm.OPENCHARGEMAP_POI_URL = url
+    ocm.OCM_BACKEND = 'api'
+    ocm._response_cache = ResponseCache(None)
+    ocm._rate_limiter = RateLimiter(0)  # unlimited; timing checks measure concurrency only
+    os.environ['OPENCHARGEMAP_API_KEY'] = 'test-key'
+    
+    try:
+        asyncio.run(_run_checks(url))
+    finally:
+        server.shutdown()
+        ocm.OPENCHARGEMAP_POI_URL, ocm.OCM_BACKEND, ocm._response_cache, ocm._rate_limiter, api_key = saved
+        if api_key is None:
+            os.environ.pop('OPENCHARGEMAP_API_KEY', None)
+        else:
+            os.environ['OPENCHARGEMAP_API_KEY'] = api_key
+    
+    print("\n" + "=" * 60)
+    print("✅ Async client test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_async_client()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the multi-stop charging planner (no network required)
+"""
+
+import heapq
+import json
+import math
+import random
+import time
+import tools.charging_tools as charging_tools
+import utils.charge_planner as planner
+from tools.charging_tools import plan_charging_stops
+from utils.charge_planner import ARRIVAL_RESERVE_PERCENT, MAX_CHARGE_PERCENT, SOC_STEP_PERCENT, STOP_OVERHEAD_MIN, plan_stops
+from utils.charging_curve import get_charging_curve
+from utils.energy import percent_per_km
+from utils.location_coords import interpolate
+from utils.openchargemap_client import measure_stations
+from utils.routing import ACCESS_SPEED_KMH, ROAD_CURVATURE
+from utils.station_table import StationTable
+
+def synthetic_corridor(r, count, route_km):
+    along = [r.uniform(0, route_km) for _ in range(count)]
+    deviation = [r.uniform(0, 20) for _ in range(count)]
+    power = [r.choice([50, 150, 250, 350]) for _ in range(count)]
+    return along, deviation, power
+
+def reference_minutes(route_km, route_min, along, deviation, power, battery_percent, range_miles):
+    """Plain Dijkstra over (node, bucket) with the planner's cost model."""
+    per_km = percent_per_km(range_miles)
+    curve = get_charging_curve()
+    nodes = [(0.0, 0.0, 0.0)] + sorted(zip(along, [d * ROAD_CURVATURE for d in deviation], power)) + [(route_km, 0.0, 0.0)]
+    reserve = math.ceil(ARRIVAL_RESERVE_PERCENT / SOC_STEP_PERCENT)
+    top = int(MAX_CHARGE_PERCENT / SOC_STEP_PERCENT)
+    # (minutes, node, bucket, charged): bucket None is the exact origin level;
+    # a charged state may only drive on
+    queue = [(0.0, 0, None, True)]
+    settled = set()
+    while queue:
+        minutes, node, bucket, charged = heapq.heappop(queue)
+        if (node, bucket, charged) in settled:
+            continue
+        settled.add((node, bucket, charged))
+        if node == len(nodes) - 1:
+            return minutes
+        level = battery_percent if bucket is None else bucket * SOC_STEP_PERCENT
+        position, detour, kw = nodes[node]
+        if not charged and kw > 0:
+            for target in range(bucket + 1, top + 1):
+                cost = STOP_OVERHEAD_MIN + curve.minutes(level, target * SOC_STEP_PERCENT, kw)
+                heapq.heappush(queue, (minutes + cost, node, target, True))
+        for later in range(node + 1, len(nodes)):
+            later_position, later_detour, _ = nodes[later]
+            used = (later_position - position + detour + later_detour) * per_km
+            arrive = min(math.floor((level - used) / SOC_STEP_PERCENT + 1e-9), top)
+            if arrive >= reserve:
+                drive = (later_position - position) * route_min / route_km + (detour + later_detour) * 60 / ACCESS_SPEED_KMH
+                heapq.heappush(queue, (minutes + drive, later, arrive, False))
+    return None
+
+def replay(plan, route_km, along, deviation, battery_percent, range_miles):
+    """Check battery levels along the plan and return the lowest arrival."""
+    per_km = percent_per_km(range_miles)
+    level, at_km, at_detour, lowest = battery_percent, 0.0, 0.0, 100.0
+    for stop in plan.stops:
+        detour = deviation[stop.row] * ROAD_CURVATURE
+        level -= (stop.along_km - at_km + at_detour + detour) * per_km
+        assert abs(level - stop.arrive_percent) < 1e-6
+        assert stop.depart_percent <= MAX_CHARGE_PERCENT
+        lowest = min(lowest, level)
+        level, at_km, at_detour = stop.depart_percent, stop.along_km, detour
+    level -= (route_km - at_km + at_detour) * per_km
+    assert abs(level - plan.arrival_percent) < 1e-6
+    return min(lowest, level)
+
+def test_charge_planner():
+    print("=" * 60)
+    print("Testing Charging Planner")
+    print("=" * 60)
+    
+    r = random.Random(3)
+    
+    print("\n🧪 Test 1: No stops when the battery covers the trip")
+    plan = plan_stops(200, 120, [50, 150], [1, 1], [150, 250], 90, 300)
+    assert plan.stops == [] and abs(plan.drive_min - 120) < 1e-6
+    print(f"   ✅ Arrives with {plan.arrival_percent:.0f}%")
+    
+    print("\n🧪 Test 2: Same optimum as a plain Dijkstra search")
+    for trial in range(20):
+        route_km = r.uniform(600, 1200)
+        along, deviation, power = synthetic_corridor(r, 20, route_km)
+        battery = r.choice([20, 50, 80, 100])
+        plan = plan_stops(route_km, route_km * 0.6, along, deviation, power, battery, 250)
+        expected = reference_minutes(route_km, route_km * 0.6, along, deviation, power, battery, 250)
+        assert (plan is None) == (expected is None)
+        if plan:
+            assert replay(plan, route_km, along, deviation, battery, 250) >= ARRIVAL_RESERVE_PERCENT - 1e-6
+            # The replay charges from exact battery levels rather than rounded
+            # ones, saving at most one bucket of charging per stop
+            slack = len(plan.stops) * get_charging_curve().minutes(100 - SOC_STEP_PERCENT, 100, min(power))
+            assert expected - slack - 1e-6 <= plan.total_min <= expected + 1e-6
+    print("   ✅ 20 random corridors agree")
+    
+    print("\n🧪 Test 3: 1,000-mile corridor with 500 chargers")
+    route_km = 1000 * 1.609344
+    along, deviation, power = synthetic_corridor(r, 500, route_km)
+    started = time.perf_counter()
+    plan = plan_stops(route_km, 17 * 60, along, deviation, power, 80, 300)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"   {len(plan.stops)} stops, {plan.total_min / 60:.1f} h ({plan.charge_min:.0f} min charging) in {elapsed_ms:.0f} ms")
+    assert len(plan.stops) >= 3 and replay(plan, route_km, along, deviation, 80, 300) >= ARRIVAL_RESERVE_PERCENT - 1e-6
+    assert elapsed_ms < 1000
+    print("   ✅ Planned in well under a second")
+    
+    print("\n🧪 Test 4: No plan across a gap longer than the range")
+    assert plan_stops(1000, 600, [100, 900], [0, 0], [250, 250], 100, 300) is None
+    print("   ✅ None when the destination is unreachable")
+    
+    print("\n🧪 Test 5: plan_charging_stops tool (stations placed along the road)")
+    def fake_corridor_stations(origin_coords, dest_coords, min_power_kw=50, max_results=10, distance_km=50, route_points=None):
+        stations = StationTable()
+        for i in range(1, len(route_points) - 1):
+            lat, lon = interpolate(route_points[i], route_points[i + 1], 0.5)
+            stations.append({"id": f"OCM-{i}", "network": "EVgo", "location": f"Stop {i}", "address": "",
+                             "latitude": lat, "longitude": lon, "power_kw": 150, "price_per_kwh": 0.4, "available": True})
+        measured = measure_stations(stations, origin_coords, dest_coords, route_points)
+        geometry = [(deviation, along) for _, deviation, along, _ in measured]
+        return stations, geometry
+    original, original_mock = planner.get_corridor_stations, charging_tools.USE_MOCK_DATA
+    planner.get_corridor_stations, charging_tools.USE_MOCK_DATA = fake_corridor_stations, False
+    try:
+        result = json.loads(plan_charging_stops._tool_func("Seattle, WA", "Los Angeles, CA", 80, 300))
+    finally:
+        planner.get_corridor_stations, charging_tools.USE_MOCK_DATA = original, original_mock
+    print(f"   {len(result['stops'])} stops, {result['distance_miles']} mi, {result['total_hours']} h")
+    assert len(result["stops"]) >= 3 and result["arrival_percent"] >= ARRIVAL_RESERVE_PERCENT
+    miles = [stop["miles_from_origin"] for stop in result["stops"]]
+    assert miles == sorted(miles) and all(stop["charge_min"] > 0 for stop in result["stops"])
+    print("   ✅ Stops in driving order with charge times")
+    
+    print("\n" + "=" * 60)
+    print("✅ Charging planner test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_charge_planner()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the vehicle charging-curve model (no network required)
+"""
+
+import random
+import time
+import numpy as np
+from utils.charging_curve import DEFAULT_VEHICLE, VEHICLE_CURVES, get_charging_curve
+
+def test_charging_curve():
+    print("=" * 60)
+    print("Testing Charging Curves")
+    print("=" * 60)
+    
+    model_y = get_charging_curve("Tesla Model Y")
+    
+    print("\n🧪 Test 1: Charge times follow the curve")
+    for name in VEHICLE_CURVES:
+        curve = get_charging_curve(name)
+        print(f"   {name}: 10% → 80% in {curve.minutes(10, 80, 350):.0f} min, 80% → 100% in {curve.minutes(80, 100, 350):.0f} min")
+        # The last 20% takes longer per percent than the first 70%
+        assert curve.minutes(80, 100, 350) / 20 > curve.minutes(10, 80, 350) / 70
+    assert 18 < model_y.minutes(10, 80, 250) < 32
+    assert get_charging_curve("Chevrolet Bolt EV").minutes(10, 80, 150) > 2 * model_y.minutes(10, 80, 150)
+    print("   ✅ Realistic 10-80% times, slow near full")
+    
+    print("\n🧪 Test 2: Station power caps the curve")
+    assert model_y.minutes(10, 80, 50) > model_y.minutes(10, 80, 150) > model_y.minutes(10, 80, 250)
+    assert model_y.minutes(10, 80, 350) == model_y.minutes(10, 80, 250)  # vehicle peaks at 250 kW
+    assert model_y.minutes(80, 20, 250) == 0 and model_y.minutes(10, 80, 0) == float('inf')
+    print("   ✅ Slower stations take longer, faster ones than the car cannot help")
+    
+    print("\n🧪 Test 3: Lookups are consistent")
+    r = random.Random(5)
+    for _ in range(1000):
+        a, b, c = sorted(r.uniform(0, 100) for _ in range(3))
+        kw = r.choice([50, 150, 250])
+        assert abs(model_y.minutes(a, b, kw) + model_y.minutes(b, c, kw) - model_y.minutes(a, c, kw)) < 1e-9
+        assert abs(model_y.percent_after(a, model_y.minutes(a, c, kw), kw) - c) < 1e-6
+    assert abs(model_y.energy_kwh(10, 80) - 0.7 * 75) < 1e-9
+    print("   ✅ Additive, invertible, energy matches the pack size")
+    
+    print("\n🧪 Test 4: Vehicle model matching")
+    assert get_charging_curve("2023 tesla model 3 long range").name == "Tesla Model 3"
+    assert get_charging_curve("Ioniq 5").name == "Hyundai Ioniq 5"
+    assert get_charging_curve("Rivian R1T").name == get_charging_curve(None).name == DEFAULT_VEHICLE
+    assert get_charging_curve("Tesla Model Y") is model_y
+    print("   ✅ Extra or missing words match, unknown models use the default")
+    
+    print("\n🧪 Test 5: Cheap enough for millions of evaluations")
+    starts = np.random.default_rng(0).uniform(0, 50, 1_000_000)
+    started = time.perf_counter()
+    minutes = model_y.minutes_batch(starts, starts + 30, 150)
+    batch_ms = (time.perf_counter() - started) * 1000
+    assert abs(minutes[0] - model_y.minutes(starts[0], starts[0] + 30, 150)) < 1e-9
+    started = time.perf_counter()
+    for start in starts[:100_000].tolist():
+        model_y.minutes(start, start + 30, 150)
+    scalar_us = (time.perf_counter() - started) / 100_000 * 1e6
+    print(f"   1M batched lookups in {batch_ms:.0f} ms, {scalar_us:.2f} µs per single lookup")
+    assert batch_ms < 1000 and scalar_us < 20
+    print("   ✅ Table lookups, no integration per query")
+    
+    print("\n" + "=" * 60)
+    print("✅ Charging curve test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_charging_curve()
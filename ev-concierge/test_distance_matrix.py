@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed hub distance matrix (no network required)
+"""
+
+import os
+import tempfile
+import time
+from utils.distance_matrix import DistanceMatrix, get_distance_matrix, trip_distance_miles
+from utils.routing import plan_route
+
+HUBS = ["Los Angeles, CA", "San Francisco, CA", "Las Vegas, NV", "Seattle, WA"]
+
+def test_distance_matrix():
+    print("=" * 60)
+    print("Testing Distance Matrix")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "matrix.bin")
+    
+        print("\n🧪 Test 1: Hub pairs match the router")
+        built = DistanceMatrix.build(HUBS)
+        for origin in HUBS:
+            for destination in HUBS:
+                leg, route = built.get(origin, destination), plan_route(origin, destination)
+                assert abs(leg.distance_km - route.distance_km) < 0.01
+                assert abs(leg.duration_min - route.duration_min) < 0.01
+        assert built.stats()["hub_hits"] == len(HUBS) ** 2 and built.stats()["misses"] == 0
+        print(f"   ✅ {len(HUBS) ** 2} pairs served from the matrix")
+    
+        print("\n🧪 Test 2: Saved file is memory-mapped back")
+        built.save(path)
+        loaded = DistanceMatrix.load(path, HUBS)
+        assert loaded.stats()["mapped"]
+        assert loaded.get("Los Angeles, CA", "Las Vegas, NV") == built.get("Los Angeles, CA", "Las Vegas, NV")
+        assert loaded.get("LA", "Vegas") == built.get("Los Angeles, CA", "Las Vegas, NV")  # names resolved
+        print(f"   LA → Las Vegas: {loaded.get('LA', 'Vegas').distance_miles:.0f} mi")
+        loaded.close()
+        print("   ✅ Same legs after a round trip")
+    
+        print("\n🧪 Test 3: Stale or damaged files are rejected")
+        assert DistanceMatrix.load(path, HUBS[:3]) is None  # different hubs
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 4)
+        assert DistanceMatrix.load(path, HUBS) is None
+        assert DistanceMatrix.load(os.path.join(directory, "missing.bin"), HUBS) is None
+        print("   ✅ Load returns None so the matrix is rebuilt")
+    
+    print("\n🧪 Test 4: Non-hub pairs are routed once and evicted LRU")
+    matrix = DistanceMatrix(built.hubs, built._distance_km, built._duration_min, max_entries=2)
+    first = matrix.get("Fresno, CA", "Bakersfield, CA")
+    assert matrix.get("Fresno, CA", "Bakersfield, CA") == first
+    matrix.get("Reno, NV", "Sacramento, CA")
+    matrix.get("Eugene, OR", "Portland, OR")
+    stats = matrix.stats()
+    print(f"   {stats}")
+    assert stats["misses"] == 3 and stats["hits"] == 1 and stats["evictions"] == 1 and stats["entries"] == 2
+    assert matrix.get("Atlantis", "Los Angeles, CA") is None
+    print("   ✅ Bounded cache of routed pairs")
+    
+    print("\n🧪 Test 5: Shared matrix answers hub lookups in microseconds")
+    shared = get_distance_matrix()
+    assert trip_distance_miles("Los Angeles, CA", "Las Vegas, NV") == round(plan_route("Los Angeles, CA", "Las Vegas, NV").distance_miles)
+    started = time.perf_counter()
+    for _ in range(10_000):
+        shared.get("Los Angeles, CA", "San Francisco, CA")
+    per_lookup_us = (time.perf_counter() - started) / 10_000 * 1e6
+    print(f"   {per_lookup_us:.2f} µs per hub lookup")
+    assert per_lookup_us < 100
+    print("   ✅ No routing on the hot path")
+    
+    print("\n" + "=" * 60)
+    print("✅ Distance matrix test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_distance_matrix()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the shared energy formula and its batched form (no network required)
+"""
+
+import csv
+import json
+import os
+import random
+import tempfile
+import numpy as np
+from tools.route_tools import calculate_energy_needs
+from utils.energy import energy_needs, energy_needs_batch, screen_trips
+
+FIELDS = ("current_battery", "required_battery", "needs_charging", "deficit_percent", "charging_strategy")
+
+def test_energy():
+    print("=" * 60)
+    print("Testing Energy Needs")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Tool result unchanged")
+    result = json.loads(calculate_energy_needs._tool_func(55, 120, 300, 70))
+    print(f"   {result}")
+    assert result == {"current_battery": 55, "required_battery": 60.0, "needs_charging": True, "deficit_percent": 5.0, "charging_strategy": "en-route"}
+    assert json.loads(calculate_energy_needs._tool_func(80, 120, 300, 30))["required_battery"] == 66.0  # cold weather
+    assert json.loads(calculate_energy_needs._tool_func(50, 2, 200, 30))["required_battery"] == 21.1  # 21.149999... rounds down
+    print("   ✅ Same fields and values as before")
+    
+    print("\n🧪 Test 2: Batch matches the tool trip by trip")
+    r = random.Random(11)
+    trips = [
+        (r.choice([r.randint(0, 100), round(r.uniform(0, 100), 1)]), round(r.uniform(0, 900), r.choice([0, 1, 2])),
+         r.choice([250, 300, 310.5]), r.choice([49.9, 50, 80, 80.1, r.randint(-20, 110)]))
+        for _ in range(20000)
+    ] + [(50, 2, 200, 30), (4.25, 0, 300, 70), (30, 3, 200, 70), (62.75, 150, 300, 70)]
+    batch = energy_needs_batch(*(np.array(column) for column in zip(*trips)))
+    for i, trip in enumerate(trips):
+        single = energy_needs(*trip)
+        assert [single[name] for name in FIELDS] == [batch[name][i].item() for name in FIELDS], trip
+    print(f"   ✅ {len(trips):,} trips identical, including 50°F/80°F and rounding ties")
+    
+    print("\n🧪 Test 3: Scalars broadcast against arrays")
+    result = energy_needs_batch(np.array([20, 60, 90]), 150, 300)
+    assert result["needs_charging"].tolist() == [True, True, False]
+    assert result["charging_strategy"].tolist() == ["pre-trip", "en-route", "en-route"]
+    print("   ✅ One distance and range for a whole fleet")
+    
+    print("\n🧪 Test 4: CSV screening")
+    with tempfile.TemporaryDirectory() as directory:
+        source, screened = os.path.join(directory, "trips.csv"), os.path.join(directory, "screened.csv")
+        with open(source, "w", newline="") as f:
+            f.write("trip_id,battery_percent,trip_distance_miles,vehicle_range_miles\nT1,90,100,300\nT2,25,250,300\n")
+        assert screen_trips(source, screened) == 1
+        with open(screened, newline="") as f:
+            rows = list(csv.DictReader(f))
+    assert [row["trip_id"] for row in rows] == ["T1", "T2"]
+    assert rows[1]["needs_charging"] == "True" and rows[1]["charging_strategy"] == "pre-trip"
+    print("   ✅ Columns copied through, results appended")
+    
+    print("\n" + "=" * 60)
+    print("✅ Energy needs test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_energy()
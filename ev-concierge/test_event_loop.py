@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the shared event loop used by the agents' synchronous methods
+"""
+
+import asyncio
+import threading
+import time
+from utils.event_loop import get_loop, run_sync
+from utils.http_session import get_async_client
+
+async def running_loop():
+    return asyncio.get_running_loop()
+
+async def nap(seconds):
+    await asyncio.sleep(seconds)
+    return seconds
+
+def test_event_loop():
+    print("=" * 60)
+    print("Testing Shared Event Loop")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Every call runs on the same loop")
+    first = run_sync(running_loop())
+    assert run_sync(running_loop()) is first is get_loop()
+    assert not first.is_closed()
+    print("   ✅ One loop across calls")
+    
+    print("\n🧪 Test 2: The pooled HTTP client survives between calls")
+    async def client():
+        return get_async_client()
+    assert run_sync(client()) is run_sync(client())
+    print("   ✅ Same httpx client reused")
+    
+    print("\n🧪 Test 3: Threads share the loop concurrently")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(run_sync(nap(0.2)))) for _ in range(5)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    assert results == [0.2] * 5 and elapsed < 0.5, elapsed
+    print(f"   ✅ 5 x 0.2 s in {elapsed:.2f} s")
+    
+    print("\n🧪 Test 4: Works inside another running loop")
+    async def outer():
+        return run_sync(nap(0))
+    assert asyncio.run(outer()) == 0
+    print("   ✅ No 'asyncio.run() cannot be called from a running event loop'")
+    
+    print("\n🧪 Test 5: Refuses to wait on itself")
+    async def nested():
+        try:
+            run_sync(nap(0))
+        except RuntimeError:
+            return "refused"
+    assert run_sync(nested()) == "refused"
+    print("   ✅ RuntimeError instead of a deadlock")
+    
+    print("\n🧪 Test 6: Timeouts cancel the coroutine")
+    cancelled = threading.Event()
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    try:
+        run_sync(slow(), timeout=0.1)
+        raise AssertionError("expected a timeout")
+    except TimeoutError:
+        pass
+    assert cancelled.wait(1)
+    print("   ✅ Cancelled on timeout")
+    
+    print("\n" + "=" * 60)
+    print("✅ Shared event loop test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_event_loop()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the offline gazetteer and get_coordinates fallback (no network required)
+"""
+
+import os
+import random
+import tempfile
+from utils import gazetteer as gazetteer_module
+from utils.gazetteer import Gazetteer, Place, get_gazetteer, normalize_place_name, reverse_geocode
+from utils.location_coords import get_coordinates, haversine_km
+from utils.openchargemap_client import label_station_locations
+from utils.station_table import StationTable
+
+GEONAMES_ROWS = [
+    # geonameid, name, asciiname, alternatenames, lat, lon, class, code, country, cc2, admin1, ..., population
+    ["5350937", "Fresno", "Fresno", "", "36.74773", "-119.77237", "P", "PPLA2", "US", "", "CA", "019", "", "", "542107"],
+    ["5391959", "San José", "San Jose", "", "37.33939", "-121.89496", "P", "PPLA2", "US", "", "CA", "085", "", "", "1013240"],
+]
+
+def test_gazetteer():
+    print("=" * 60)
+    print("Testing Gazetteer")
+    print("=" * 60)
+    
+    gazetteer = get_gazetteer()
+    
+    print("\n🧪 Test 1: Normalization")
+    assert normalize_place_name("St. George, Utah, USA") == "st george ut"
+    assert normalize_place_name("  LOS   Angeles,California ") == "los angeles ca"
+    assert normalize_place_name("Coeur d'Alene") == "coeur dalene"
+    print("   ✅ Case, punctuation, state names and 'Saint' normalized")
+    
+    print("\n🧪 Test 2: Exact, alias and free-form names")
+    assert gazetteer.lookup("Fresno, CA").label == "Fresno, CA"
+    assert gazetteer.lookup("LA").label == "Los Angeles, CA"
+    assert gazetteer.lookup("sf").label == "San Francisco, CA"
+    assert gazetteer.lookup("portland oregon").label == "Portland, OR"
+    assert gazetteer.lookup("Saint George").label == "St. George, UT"
+    print(f"   ✅ {len(gazetteer)} places indexed")
+    
+    print("\n🧪 Test 3: Ambiguous names use the state, else the largest place")
+    assert gazetteer.lookup("Glendale, CA").state == "CA"
+    assert gazetteer.lookup("Glendale").label == "Glendale, AZ"
+    assert gazetteer.lookup("Redmond, OR").state == "OR"
+    print("   ✅ Disambiguated")
+    
+    print("\n🧪 Test 4: Fuzzy matching")
+    assert gazetteer.lookup("Sacramneto").label == "Sacramento, CA"
+    assert gazetteer.lookup("Frenso, CA").label == "Fresno, CA"
+    assert gazetteer.lookup("Frenso, CA", fuzzy=False) is None
+    assert gazetteer.lookup("Glendale, NV") is None  # no Glendale in Nevada
+    assert gazetteer.lookup("Xyzzy") is None
+    print("   ✅ Typos resolved within the requested state only")
+    
+    print("\n🧪 Test 5: Prefix autocomplete")
+    labels = [place.label for place in gazetteer.complete("San", limit=3)]
+    print(f"   'San' → {labels}")
+    assert labels == ["San Antonio, TX", "San Diego, CA", "San Jose, CA"]
+    assert gazetteer.complete("zzz") == []
+    print("   ✅ Most populous first")
+    
+    print("\n🧪 Test 6: Reverse geocoding")
+    assert reverse_geocode(36.75, -119.78) == "Fresno, CA"
+    assert reverse_geocode(34.90, -117.02) == "Barstow, CA"
+    assert reverse_geocode(0.0, 0.0) is None
+    # The grid search must agree with a scan of every place
+    for lat, lon in [(35.27, -116.08), (47.5, -122.2), (40.0, -112.0)]:
+        nearest = min(gazetteer.places, key=lambda place: haversine_km((lat, lon), place.coordinates))
+        within = haversine_km((lat, lon), nearest.coordinates) <= 50
+        assert gazetteer.reverse(lat, lon) == (nearest if within else None)
+    print("   ✅ Nearest place within 50 km")
+    
+    print("\n🧪 Test 7: get_coordinates falls back to the gazetteer")
+    assert get_coordinates("Los Angeles, CA") == (34.0522, -118.2437)
+    assert get_coordinates("Fresno, CA") == (36.7378, -119.7871)
+    assert get_coordinates("Vegas") == get_coordinates("Las Vegas, NV")
+    assert get_coordinates("Atlantis") is None
+    print("   ✅ Cities beyond the built-in five resolve")
+    
+    print("\n🧪 Test 8: GeoNames dumps load too")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cities.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join("\t".join(row) for row in GEONAMES_ROWS) + "\n")
+        geonames = Gazetteer.from_file(path)
+    assert len(geonames) == 2
+    assert geonames.lookup("San Jose, California") == Place("San José", "CA", 37.33939, -121.89496, 1013240)
+    assert geonames.lookup("san josé").name == "San José"
+    print("   ✅ Accented and ASCII names both match")
+    
+    print(f"\n🧪 Test 9: Batch reverse geocoding matches one-at-a-time (NumPy: {gazetteer_module.np is not None})")
+    r = random.Random(1)
+    points = [(r.uniform(32.0, 49.0), r.uniform(-125.0, -104.0)) for _ in range(2000)]
+    lats = [lat for lat, _ in points]
+    lons = [lon for _, lon in points]
+    expected = [gazetteer.reverse(lat, lon, 30) for lat, lon in points]
+    assert gazetteer.reverse_batch(lats, lons, 30) == expected
+    numpy_module = gazetteer_module.np
+    gazetteer_module.np = None
+    try:
+        assert gazetteer.reverse_batch(lats, lons, 30) == expected
+    finally:
+        gazetteer_module.np = numpy_module
+    assert gazetteer.reverse_batch([], []) == []
+    print(f"   ✅ {sum(place is not None for place in expected)}/{len(points)} points near a town")
+    
+    print("\n🧪 Test 10: Stations are labelled with the nearest town")
+    stations = StationTable.from_dicts([
+        {"id": "OCM-1", "location": "Tesla Supercharger Fresno", "latitude": 36.80, "longitude": -119.78},
+        {"id": "OCM-2", "location": "fresno, ca", "latitude": 36.74, "longitude": -119.80},
+        {"id": "OCM-3", "location": "Middle of Nowhere, NV", "latitude": 38.9, "longitude": -116.5},
+    ])
+    label_station_locations(stations)
+    assert stations.locations == ["Fresno, CA", "Fresno, CA", "Middle of Nowhere, NV"]
+    assert stations.locations[0] is stations.locations[1]  # interned
+    print("   ✅ Same town, same key; remote stations keep their OCM town")
+    
+    print("\n" + "=" * 60)
+    print("✅ Gazetteer test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_gazetteer()
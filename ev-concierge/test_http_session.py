@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the pooled HTTP session against a local server (no internet required)
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from utils.http_session import get_json, session_stats
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+    
+    def do_GET(self):
+        if FlakyHandler.failures_left > 0:
+            FlakyHandler.failures_left -= 1
+            status, body = 503, b"{}"
+        elif self.path.startswith("/missing"):
+            status, body = 404, b"{}"
+        else:
+            status, body = 200, json.dumps([{"ID": 1}]).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+def test_http_session():
+    print("=" * 60)
+    print("Testing Pooled HTTP Session")
+    print("=" * 60)
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/poi"
+    
+    try:
+        before = session_stats()
+        
+        print("\n🧪 Test 1: Transient 503s are retried")
+        FlakyHandler.failures_left = 2
+        assert get_json(url, max_retries=3) == [{"ID": 1}]
+        stats = session_stats()
+        assert stats["retries"] - before["retries"] == 2
+        print(f"   ✅ Succeeded after 2 retries")
+        
+        print("\n🧪 Test 2: Retries stop at the limit")
+        FlakyHandler.failures_left = 5
+        try:
+            get_json(url, max_retries=1)
+            raise AssertionError("expected HTTPError")
+        except requests.exceptions.HTTPError:
+            pass
+        FlakyHandler.failures_left = 0
+        print("   ✅ Gave up after 1 retry")
+        
+        print("\n🧪 Test 3: Client errors are not retried")
+        retries = session_stats()["retries"]
+        try:
+            get_json(url.replace("/poi", "/missing"))
+            raise AssertionError("expected HTTPError")
+        except requests.exceptions.HTTPError:
+            pass
+        assert session_stats()["retries"] == retries
+        print("   ✅ 404 raised immediately")
+        
+        print("\n🧪 Test 4: Connections are reused")
+        for _ in range(10):
+            get_json(url)
+        stats = session_stats()
+        print(f"   Stats: {stats}")
+        assert stats["connections_opened"] < stats["pooled_requests"]
+        print(f"   ✅ Reuse ratio {stats['reuse_ratio']}")
+    finally:
+        server.shutdown()
+    
+    print("\n" + "=" * 60)
+    print("✅ HTTP session test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_http_session()
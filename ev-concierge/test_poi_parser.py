@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the OpenChargeMap POI parser and streaming JSON decoding (no internet required)
+"""
+
+import json
+import os
+import tempfile
+from utils.json_stream import iter_json_array, iter_json_file
+from utils.openchargemap_client import (
+    infer_operator_from_title,
+    map_operator_to_network,
+    parse_openchargemap_response,
+    parse_usage_cost,
+)
+from utils.station_store import StationStore
+
+def make_poi(poi_id, operator=None, title="Station", usage_cost="", town="Fresno"):
+    return {
+        "ID": poi_id,
+        "OperatorInfo": {"Title": operator} if operator else None,
+        "UsageCost": usage_cost,
+        "AddressInfo": {
+            "Title": title,
+            "AddressLine1": "1 Main St",
+            "Town": town,
+            "StateOrProvince": "CA",
+            "Latitude": 36.7 + poi_id / 1000,
+            "Longitude": -119.8,
+        },
+        "Connections": [{"PowerKW": 150}, {"PowerKW": None}],
+        "StatusType": {"IsOperational": True},
+    }
+
+def test_poi_parser():
+    print("=" * 60)
+    print("Testing POI Parser")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Operator names map to networks")
+    cases = {
+        "EVgo Network": "EVgo",
+        "Tesla Motors (Worldwide)": "Tesla Supercharger",
+        "chargepoint inc": "ChargePoint",
+        "Blink Charging": "Blink",
+        # Both names present: the earlier NETWORK_MAPPING entry wins
+        "Blink and EVgo Partners": "EVgo",
+        "Shell Recharge": "Shell Recharge",
+        None: "Unknown Network",
+    }
+    for operator, network in cases.items():
+        assert map_operator_to_network(operator) == network, operator
+    print(f"   ✅ {len(cases)} operator names mapped")
+    
+    print("\n🧪 Test 2: Operator inferred from title in priority order")
+    assert infer_operator_from_title("Blink at Tesla Mall") == "Tesla Supercharger"
+    assert infer_operator_from_title("Charge Point Lot") == "ChargePoint"
+    assert infer_operator_from_title("City Parking") is None
+    stations = parse_openchargemap_response([make_poi(1, title="EVgo Fast Charging")])
+    assert stations[0]["network"] == "EVgo"
+    print("   ✅ Titles resolved")
+    
+    print("\n🧪 Test 3: Usage cost parsing")
+    assert parse_usage_cost("$0.43/kWh") == 0.43
+    assert parse_usage_cost("$ .5 per kWh") == 0.5
+    assert parse_usage_cost("Free") == 0.40
+    assert parse_usage_cost(None) == 0.40
+    print("   ✅ Prices extracted, default otherwise")
+    
+    print("\n🧪 Test 4: Arrays decode across arbitrary chunk boundaries")
+    pois = [make_poi(i, operator="EVgo Network", town="San José") for i in range(50)]
+    body = json.dumps(pois, ensure_ascii=False)
+    encoded = body.encode()
+    for size in (1, 7, 100, 4096):
+        chunks = [encoded[i:i + size] for i in range(0, len(encoded), size)]
+        assert list(iter_json_array(chunks)) == pois
+    assert list(iter_json_array(['[1', '2, 3', ', "a]"', ' ]'])) == [12, 3, "a]"]
+    assert list(iter_json_array([" [ ] "])) == []
+    for bad in (['{"a": 1}'], ['[1, 2'], ['[1 2]']):
+        try:
+            list(iter_json_array(bad))
+            raise AssertionError(f"expected ValueError for {bad}")
+        except ValueError:
+            pass
+    print("   ✅ Split multi-byte characters and numbers handled, bad input rejected")
+    
+    print("\n🧪 Test 5: Streaming parse matches a full decode")
+    assert parse_openchargemap_response(iter_json_array([body])) == parse_openchargemap_response(pois)
+    print(f"   ✅ {len(pois)} stations identical")
+    
+    print("\n🧪 Test 6: Store imports a dump file in batches")
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_path = os.path.join(tmp, "dump.json")
+        with open(dump_path, "w") as f:
+            f.write(body)
+        assert list(iter_json_file(dump_path, chunk_size=64)) == pois
+        store = StationStore(os.path.join(tmp, "stations.sqlite3"))
+        assert store.import_dump(dump_path) == len(pois)
+        assert len(store) == len(pois)
+        store.close()
+    print("   ✅ Dump imported")
+    
+    print("\n" + "=" * 60)
+    print("✅ POI parser test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_poi_parser()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the OpenChargeMap rate limiter and priority queue (no internet required)
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from utils.http_session import get_json
+from utils.rate_limiter import BACKGROUND, INTERACTIVE, RateLimiter
+
+class OKHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+def test_rate_limiter():
+    print("=" * 60)
+    print("Testing Rate Limiter")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Burst is immediate, then tokens arrive at the rate")
+    limiter = RateLimiter(rate_per_second=20, burst=2)
+    started = time.monotonic()
+    for _ in range(6):
+        assert limiter.acquire()
+    elapsed = time.monotonic() - started
+    print(f"   6 tokens in {elapsed:.2f}s")
+    assert 0.15 <= elapsed < 0.5
+    print("   ✅ 2 burst + 4 at 20/s")
+    
+    print("\n🧪 Test 2: Interactive callers jump ahead of queued background work")
+    limiter = RateLimiter(rate_per_second=10, burst=1)
+    limiter.acquire()
+    order = []
+    def worker(priority, label):
+        limiter.acquire(priority)
+        order.append(label)
+    threads = [threading.Thread(target=worker, args=(BACKGROUND, f"bg{i}")) for i in range(4)]
+    threads += [threading.Thread(target=worker, args=(INTERACTIVE, f"ui{i}")) for i in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    depth = limiter.stats()
+    for thread in threads:
+        thread.join()
+    print(f"   Grant order: {order}")
+    assert depth["background"]["queue_depth"] + depth["interactive"]["queue_depth"] >= 5
+    assert sorted(order[:2]) == ["ui0", "ui1"]
+    assert order[2:] == ["bg0", "bg1", "bg2", "bg3"]
+    print("   ✅ Interactive first, background in arrival order")
+    
+    print("\n🧪 Test 3: Waiting gives up at the timeout")
+    limiter = RateLimiter(rate_per_second=1, burst=1)
+    limiter.acquire()
+    assert limiter.acquire(timeout=0.1) is False
+    stats = limiter.stats()
+    assert stats["interactive"]["timeouts"] == 1 and stats["queue_depth"] == 0
+    print("   ✅ Timed out and left the queue")
+    
+    print("\n🧪 Test 4: Coroutines and threads share one bucket")
+    limiter = RateLimiter(rate_per_second=50, burst=1)
+    async def many():
+        results = await asyncio.gather(*(limiter.acquire_async(BACKGROUND) for _ in range(5)))
+        return results
+    thread = threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)])
+    started = time.monotonic()
+    thread.start()
+    assert all(asyncio.run(many()))
+    thread.join()
+    elapsed = time.monotonic() - started
+    print(f"   10 tokens in {elapsed:.2f}s")
+    assert elapsed >= 0.15
+    stats = limiter.stats()
+    assert stats["interactive"]["granted"] == 5 and stats["background"]["granted"] == 5
+    print(f"   ✅ Wait p50/p99: {stats['background']['wait_p50_ms']}/{stats['background']['wait_p99_ms']} ms")
+    
+    print("\n🧪 Test 5: pause() holds everyone (429 Retry-After)")
+    limiter = RateLimiter(rate_per_second=100, burst=5)
+    limiter.pause(0.3)
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.25
+    print("   ✅ Waited out the pause")
+    
+    print("\n🧪 Test 6: get_json queues on the limiter within its deadline")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OKHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/poi"
+    try:
+        limiter = RateLimiter(rate_per_second=0.5, burst=1)
+        assert get_json(url, rate_limiter=limiter) == []
+        try:
+            get_json(url, rate_limiter=limiter, deadline_seconds=0.3)
+            raise AssertionError("expected Timeout")
+        except requests.exceptions.Timeout:
+            pass
+    finally:
+        server.shutdown()
+    print("   ✅ Second call timed out waiting for a token")
+    
+    print("\n" + "=" * 60)
+    print("✅ Rate limiter test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_rate_limiter()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the persistent OpenChargeMap response cache (no network required)
+"""
+
+import os
+import tempfile
+import time
+from utils.response_cache import ResponseCache
+
+def test_response_cache():
+    print("=" * 60)
+    print("Testing OpenChargeMap Response Cache")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        key = ResponseCache.make_key("poi", 36.0, -120.0, 330.0, 150, 20)
+        stations = [{"id": "OCM-1", "network": "EVgo", "power_kw": 350}]
+        
+        # Test 1: miss, then hit
+        print("\n🧪 Test 1: Miss then hit")
+        cache = ResponseCache(path, ttl_seconds=60, max_entries=2)
+        assert cache.get(key) is None
+        cache.set(key, stations)
+        assert cache.get(key) == stations
+        print(f"   ✅ Stats: {cache.stats()}")
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        
+        # Test 2: survives a restart
+        print("\n🧪 Test 2: Reopen from disk")
+        reopened = ResponseCache(path, ttl_seconds=60, max_entries=2)
+        assert reopened.get(key) == stations
+        print("   ✅ Entry loaded from disk")
+        
+        # Test 3: LRU bound
+        print("\n🧪 Test 3: LRU eviction")
+        reopened.set("b", [1])
+        reopened.get(key)
+        reopened.set("c", [2])
+        assert reopened.get("b") is None
+        assert reopened.get(key) == stations
+        assert reopened.stats()["entries"] == 2
+        print(f"   ✅ Stats: {reopened.stats()}")
+        
+        # Test 4: TTL expiry
+        print("\n🧪 Test 4: TTL expiry")
+        short = ResponseCache(None, ttl_seconds=0.05)
+        short.set(key, stations)
+        time.sleep(0.1)
+        assert short.get(key) is None
+        print("   ✅ Expired entry dropped")
+    
+    print("\n" + "=" * 60)
+    print("✅ Response cache test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_response_cache()
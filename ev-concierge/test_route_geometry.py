@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test batched route geometry against the per-station functions (no network required)
+"""
+
+import random
+from utils import location_coords
+from utils.location_coords import (
+    along_track_km,
+    cross_track_km,
+    great_circle_geometry_batch,
+    haversine_km,
+    haversine_km_batch,
+)
+
+# Seattle → Portland → Sacramento → Los Angeles
+ROUTE = [(47.6062, -122.3321), (45.5152, -122.6784), (38.5816, -121.4944), (34.0522, -118.2437)]
+
+def check_great_circle():
+    seattle, san_diego = ROUTE[0], (32.7157, -117.1611)
+    sacramento = ROUTE[2]
+    
+    # Known great-circle distance Seattle → San Diego ≈ 1,712 km
+    assert abs(haversine_km(seattle, san_diego) - 1712) < 2
+    
+    # Batch matches scalar cross/along-track for points that project inside the segment
+    r = random.Random(7)
+    lats = [r.uniform(33, 47) for _ in range(300)]
+    lons = [r.uniform(-124, -115) for _ in range(300)]
+    deviations, alongs = great_circle_geometry_batch(lats, lons, [seattle, san_diego])
+    distances = haversine_km_batch(seattle, lats, lons)
+    route_km = haversine_km(seattle, san_diego)
+    
+    for i, point in enumerate(zip(lats, lons)):
+        assert abs(distances[i] - haversine_km(seattle, point)) < 1e-6
+        along = along_track_km(point, seattle, san_diego)
+        if 0 < along < route_km:
+            assert abs(deviations[i] - abs(cross_track_km(point, seattle, san_diego))) < 1e-6
+            assert abs(alongs[i] - along) < 1e-6
+    
+    # Sacramento sits ~215 km west of the straight Seattle → San Diego line
+    (deviation,), _ = great_circle_geometry_batch([sacramento[0]], [sacramento[1]], [seattle, san_diego])
+    assert 200 < deviation < 230
+
+def test_route_geometry():
+    print("=" * 60)
+    print("Testing Batched Route Geometry")
+    print("=" * 60)
+    
+    print(f"\n🧪 Test 1: Great-circle kernels (NumPy: {location_coords.np is not None})")
+    check_great_circle()
+    print("   ✅ Haversine, cross-track and along-track agree")
+    
+    print("\n🧪 Test 2: Pure-Python fallback")
+    numpy_module = location_coords.np
+    location_coords.np = None
+    try:
+        check_great_circle()
+    finally:
+        location_coords.np = numpy_module
+    print("   ✅ Fallback matches scalar")
+    
+    print("\n" + "=" * 60)
+    print("✅ Route geometry test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_route_geometry()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the offline road router and get_route_info (no network required)
+"""
+
+import heapq
+import json
+import math
+import random
+import time
+from tools.charging_tools import _resolve_route
+from tools.route_tools import get_route_info
+from utils.location_coords import calculate_distance_km, get_coordinates, route_tiles
+from utils.openchargemap_client import STRAIGHT_LINE_DEVIATION_KM, TILE_KM
+from utils.routing import DISTANCE, DURATION, get_road_network, plan_route
+
+# Published road distances in miles
+ROAD_MILES = {
+    ("Los Angeles, CA", "San Francisco, CA"): 382,
+    ("Los Angeles, CA", "Las Vegas, NV"): 270,
+    ("Los Angeles, CA", "San Diego, CA"): 120,
+    ("San Francisco, CA", "Seattle, WA"): 808,
+    ("Los Angeles, CA", "Seattle, WA"): 1135,
+}
+
+def dijkstra_cost(network, source, target, weight):
+    """Reference shortest-path cost without a heuristic."""
+    best = {source: 0.0}
+    queue = [(0.0, source)]
+    while queue:
+        cost, node = heapq.heappop(queue)
+        if node == target:
+            return cost
+        if cost > best[node]:
+            continue
+        for neighbour, km, minutes, _ in network._edges[node]:
+            new_cost = cost + (minutes if weight == DURATION else km)
+            if new_cost < best.get(neighbour, float('inf')):
+                best[neighbour] = new_cost
+                heapq.heappush(queue, (new_cost, neighbour))
+    return None
+
+def path_cost(network, path, weight):
+    return sum(network._segment(a, b, weight == DURATION)[1 if weight == DURATION else 0] for a, b in zip(path, path[1:]))
+
+def test_routing():
+    print("=" * 60)
+    print("Testing Road Router")
+    print("=" * 60)
+    
+    network = get_road_network()
+    
+    print("\n🧪 Test 1: Graph loads and is connected")
+    origin = network.node("Los Angeles, CA")
+    unreachable = [network.labels[node] for node in range(len(network)) if network.shortest_path(origin, node) is None]
+    print(f"   {len(network)} towns, {network.segment_count} road segments")
+    assert not unreachable, unreachable
+    print("   ✅ Every town reachable from Los Angeles")
+    
+    print("\n🧪 Test 2: Distances close to published road mileage")
+    for (start, end), miles in ROAD_MILES.items():
+        route = plan_route(start, end)
+        print(f"   {start} → {end}: {route.distance_miles:.0f} mi (road atlas {miles}), {route.duration_hours:.1f} h")
+        assert abs(route.distance_miles - miles) / miles < 0.10
+    assert plan_route("Los Angeles, CA", "San Francisco, CA").highways[0] == "I-5"
+    print("   ✅ Within 10%")
+    
+    print("\n🧪 Test 3: A* finds the same optimum as plain Dijkstra")
+    r = random.Random(7)
+    for _ in range(100):
+        source, target = r.randrange(len(network)), r.randrange(len(network))
+        for weight in (DURATION, DISTANCE):
+            path = network.shortest_path(source, target, weight)
+            assert abs(path_cost(network, path, weight) - dijkstra_cost(network, source, target, weight)) < 1e-6
+    print("   ✅ 200 random queries agree")
+    
+    print("\n🧪 Test 4: Off-graph endpoints")
+    near_fresno = (36.70, -119.85)
+    route = network.route(near_fresno, get_coordinates("Bakersfield, CA"))
+    assert route.places[0] == "Fresno, CA" and route.points[0] == near_fresno
+    assert route.points[-1] == get_coordinates("Bakersfield, CA")
+    assert plan_route("New York, NY", "Los Angeles, CA") is None  # too far from the graph
+    assert plan_route("Atlantis", "Los Angeles, CA") is None
+    print("   ✅ Snapped within range, None otherwise")
+    
+    print("\n🧪 Test 5: Queries take milliseconds")
+    coords = [get_coordinates(label) for label in network.labels]
+    pairs = [(r.choice(coords), r.choice(coords)) for _ in range(200)]
+    started = time.perf_counter()
+    for start, end in pairs:
+        network.route(start, end)
+    per_query_ms = (time.perf_counter() - started) / len(pairs) * 1000
+    print(f"   {per_query_ms:.2f} ms per route")
+    assert per_query_ms < 10
+    print("   ✅ Fast enough to plan every search")
+    
+    print("\n🧪 Test 6: get_route_info and charger search use the road")
+    info = json.loads(get_route_info._tool_func("Los Angeles, CA", "Las Vegas, NV"))
+    print(f"   {info}")
+    assert 240 < info["distance_miles"] < 300 and info["route"].endswith("I-15")
+    assert json.loads(get_route_info._tool_func("Los Angeles, CA", "Atlantis"))["error"] == "no_route"
+    _, _, route_points, error = _resolve_route("Los Angeles, CA", "San Francisco, CA")
+    assert error is None and len(route_points) > 2
+    print(f"   ✅ Corridor search follows a {len(route_points)}-point polyline")
+    
+    print("\n🧪 Test 7: One search circle per TILE_KM of road")
+    for start, end in (("Seattle, WA", "Los Angeles, CA"), ("Los Angeles, CA", "San Francisco, CA"), ("Los Angeles, CA", "Las Vegas, NV")):
+        route_points = plan_route(start, end).points
+        polyline_km = sum(calculate_distance_km(a, b) for a, b in zip(route_points, route_points[1:]))
+        tiles = route_tiles(route_points, tile_km=TILE_KM, buffer_km=STRAIGHT_LINE_DEVIATION_KM)
+        print(f"   {start} → {end}: {len(route_points)} points, {polyline_km:.0f} km, {len(tiles)} tiles")
+        assert len(tiles) == math.ceil(polyline_km / TILE_KM)
+        # Every vertex is still inside some circle, with the buffer to spare
+        for point in route_points:
+            assert min(calculate_distance_km(point, center) - radius for center, radius in tiles) <= -STRAIGHT_LINE_DEVIATION_KM + 1e-6
+    assert route_tiles([(34.0, -118.0), (34.0, -118.0)]) == [((34.0, -118.0), 30)]
+    print("   ✅ Short segments merged, route fully covered")
+    
+    print("\n" + "=" * 60)
+    print("✅ Road router test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_routing()
@@ -4,6 +4,8 @@ Test scenarios for EV Concierge
 Different battery/distance combinations to test all agent paths
 """
 
+from utils.distance_matrix import trip_distance_miles
+
 # City coordinates for API queries
 CITY_COORDINATES = {
     "Los Angeles, CA": (34.0522, -118.2437),
@@ -26,7 +28,7 @@ SCENARIOS = {
         "trip": {
             "origin": "San Diego, CA",
             "destination": "Los Angeles, CA",
-            "distance_miles": 120,
+            "distance_miles": trip_distance_miles("San Diego, CA", "Los Angeles, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "expected": {
@@ -46,7 +48,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "San Francisco, CA",
-            "distance_miles": 380,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "San Francisco, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "expected": {
@@ -68,7 +70,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "San Diego, CA",
-            "distance_miles": 120,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "San Diego, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "expected": {
@@ -89,7 +91,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "Seattle, WA",
-            "distance_miles": 1150,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "Seattle, WA"),
             "departure": "2024-01-15T06:00:00"
         },
         "expected": {
@@ -110,7 +112,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "Las Vegas, NV",
-            "distance_miles": 270,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "Las Vegas, NV"),
             "departure": "2024-01-15T09:00:00"
         },
         "weather": {
@@ -133,7 +135,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "San Francisco, CA",
-            "distance_miles": 380,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "San Francisco, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "preferences": {
@@ -157,7 +159,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "San Francisco, CA",
-            "distance_miles": 380,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "San Francisco, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "preferences": {
@@ -184,7 +186,7 @@ SCENARIOS = {
         "trip": {
             "origin": "Los Angeles, CA",
             "destination": "San Diego, CA",
-            "distance_miles": 120,
+            "distance_miles": trip_distance_miles("Los Angeles, CA", "San Diego, CA"),
             "departure": "2024-01-15T09:00:00"
         },
         "expected": {
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing for concurrent charger searches (no network required)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import utils.openchargemap_client as ocm
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+from utils.station_table import StationTable
+
+LOS_ANGELES = (34.0522, -118.2437)
+LAS_VEGAS = (36.1699, -115.1398)
+
+def corridor_stations():
+    return StationTable.from_dicts(
+        {"id": f"OCM-{i}", "latitude": 34.0522 + i * 0.2, "longitude": -118.2437 + i * 0.3, "power_kw": 150}
+        for i in range(10)
+    )
+
+def test_single_flight():
+    print("=" * 60)
+    print("Testing Single-Flight Request Coalescing")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Concurrent identical calls run once")
+    flight = SingleFlight()
+    calls = []
+    def slow_fetch(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return value * 2
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do("LA-LV", slow_fetch, 21), range(8)))
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 7, "in_flight": 0}
+    print(f"   ✅ 8 callers, 1 execution")
+    
+    print("\n🧪 Test 2: Errors reach every waiting caller")
+    def failing_fetch():
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+    errors = []
+    def call():
+        try:
+            flight.do("broken", failing_fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ["upstream down"] * 4
+    print("   ✅ All 4 callers saw the error")
+    
+    print("\n🧪 Test 3: Nothing is cached after the call completes")
+    flight.do("LA-LV", slow_fetch, 1)
+    assert len(calls) == 2
+    print("   ✅ Next call fetched again")
+    
+    print("\n🧪 Test 4: Concurrent searches share one corridor fetch")
+    fetches = []
+    def fake_fetch_route_stations(*args, **kwargs):
+        fetches.append(args)
+        time.sleep(0.2)
+        return corridor_stations()
+    original = ocm.fetch_route_stations
+    ocm.fetch_route_stations = fake_fetch_route_stations
+    try:
+        ranges = [[100, 300], [200, 300], [300]] * 4
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(pool.map(
+                lambda r: ocm.get_chargers_for_ranges(LOS_ANGELES, LAS_VEGAS, r, min_power_kw=150),
+                ranges
+            ))
+    finally:
+        ocm.fetch_route_stations = original
+    assert len(fetches) == 1
+    assert len(results[0][0]) < len(results[0][1]) == len(results[2][0])
+    print(f"   ✅ {len(ranges)} searches, {len(fetches)} fetch")
+    
+    print("\n🧪 Test 5: Async searches coalesce, and a cancelled caller does not cancel the rest")
+    async_fetches = []
+    async def fake_fetch_route_stations_async(*args, **kwargs):
+        async_fetches.append(args)
+        await asyncio.sleep(0.2)
+        return corridor_stations()
+    async def run():
+        searches = [
+            asyncio.ensure_future(ocm.get_chargers_for_ranges_async(LOS_ANGELES, LAS_VEGAS, [300]))
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0.05)
+        searches[0].cancel()
+        return await asyncio.gather(*searches[1:])
+    original_async = ocm.fetch_route_stations_async
+    ocm.fetch_route_stations_async = fake_fetch_route_stations_async
+    try:
+        results = asyncio.run(run())
+    finally:
+        ocm.fetch_route_stations_async = original_async
+    assert len(async_fetches) == 1
+    assert all(len(result[0]) == len(results[0][0]) > 0 for result in results)
+    print(f"   ✅ 10 searches, {len(async_fetches)} fetch, 9 results after one cancellation")
+    print(f"   Stats: {ocm.get_coalescing_stats()}")
+    
+    print("\n" + "=" * 60)
+    print("✅ Single-flight test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_single_flight()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test along-route station ranking (no network required)
+"""
+
+from utils.openchargemap_client import filter_stations_along_route
+
+LOS_ANGELES = (34.0522, -118.2437)
+SAN_FRANCISCO = (37.7749, -122.4194)
+
+def make_station(station_id, lat, lon):
+    return {"id": station_id, "latitude": lat, "longitude": lon, "power_kw": 150}
+
+def test_station_ranking():
+    print("=" * 60)
+    print("Testing Along-Route Station Ranking")
+    print("=" * 60)
+    
+    stations = [
+        # Far along the route, right on the line
+        make_station("ON-ROUTE-FAR", 36.9, -121.3),
+        # Early on the route, right on the line
+        make_station("ON-ROUTE-NEAR", 34.9, -119.3),
+        # Beside the origin but 100 km off to the east (a long detour)
+        make_station("OFF-ROUTE", 34.3, -117.2),
+        # Halfway, on the line
+        make_station("ON-ROUTE-MID", 35.9, -120.3),
+    ]
+    
+    print("\n🧪 Test 1: Stations come back in route order")
+    ranked = filter_stations_along_route(stations, LOS_ANGELES, SAN_FRANCISCO, current_range_miles=400, max_results=10)
+    order = [s['id'] for s in ranked]
+    print(f"   Order: {order}")
+    assert order == ["OFF-ROUTE", "ON-ROUTE-NEAR", "ON-ROUTE-MID", "ON-ROUTE-FAR"]
+    print("   ✅ Ordered by position along the route")
+    
+    print("\n🧪 Test 2: Detours are penalized")
+    best = filter_stations_along_route(stations, LOS_ANGELES, SAN_FRANCISCO, current_range_miles=400, max_results=1)
+    assert [s['id'] for s in best] == ["ON-ROUTE-NEAR"]
+    print("   ✅ Off-route station ranked behind the on-route one")
+    
+    print("\n🧪 Test 3: Top-k keeps the best stations, in route order")
+    top_two = filter_stations_along_route(stations, LOS_ANGELES, SAN_FRANCISCO, current_range_miles=400, max_results=2)
+    assert [s['id'] for s in top_two] == ["OFF-ROUTE", "ON-ROUTE-NEAR"]
+    assert stations[0] == make_station("ON-ROUTE-FAR", 36.9, -121.3)  # input untouched
+    print(f"   ✅ Top 2: {[s['id'] for s in top_two]}")
+    
+    print("\n" + "=" * 60)
+    print("✅ Station ranking test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_station_ranking()
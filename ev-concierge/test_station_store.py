@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the offline station store and its grid index (no network required)
+"""
+
+import os
+import tempfile
+from utils.station_store import StationStore
+from utils.location_coords import cross_track_km, along_track_km, haversine_km
+
+def make_station(station_id, lat, lon, power_kw=150):
+    return {
+        "id": station_id,
+        "network": "EVgo",
+        "location": "Test, CA",
+        "address": "1 Main St, Test, CA",
+        "latitude": lat,
+        "longitude": lon,
+        "power_kw": power_kw,
+        "price_per_kwh": 0.40,
+        "available": True,
+        "slots": [],
+        "amenities": []
+    }
+
+def test_station_store():
+    print("=" * 60)
+    print("Testing Offline Station Store")
+    print("=" * 60)
+    
+    la = (34.0522, -118.2437)
+    sf = (37.7749, -122.4194)
+    
+    stations = [make_station(f"OCM-{i}", 32.0 + i * 0.05, -124.0 + i * 0.07, 50 + (i % 4) * 100) for i in range(200)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stations.sqlite3")
+        store = StationStore(path)
+        store.upsert_stations(stations)
+        print(f"\n   Imported {len(store)} stations")
+        
+        # Test 1: radius query matches a brute-force scan
+        print("\n🧪 Test 1: Radius query")
+        expected = {s['id'] for s in stations if haversine_km((35.0, -120.0), (s['latitude'], s['longitude'])) <= 100}
+        found = {s['id'] for s in store.query_radius((35.0, -120.0), 100)}
+        assert found == expected, (found, expected)
+        print(f"   ✅ {len(found)} stations within 100 km")
+        
+        # Test 2: corridor query matches a brute-force scan
+        print("\n🧪 Test 2: Corridor query (LA → SF)")
+        expected = {
+            s['id'] for s in stations
+            if s['power_kw'] >= 150
+            and abs(cross_track_km((s['latitude'], s['longitude']), la, sf)) <= 50
+            and 0 <= along_track_km((s['latitude'], s['longitude']), la, sf) <= haversine_km(la, sf)
+        }
+        found = {s['id'] for s in store.query_corridor(la, sf, 50, min_power_kw=150)}
+        assert found == expected, (found, expected)
+        print(f"   ✅ {len(found)} stations within 50 km of the route")
+        
+        # Test 3: bounding box
+        print("\n🧪 Test 3: Bounding box query")
+        found = store.query_bbox(33.0, -123.0, 34.0, -121.0)
+        assert all(33.0 <= s['latitude'] <= 34.0 and -123.0 <= s['longitude'] <= -121.0 for s in found)
+        print(f"   ✅ {len(found)} stations in box")
+        
+        # Test 4: upsert, delete and reopen
+        print("\n🧪 Test 4: Upsert, delete and reopen")
+        store.upsert_stations([make_station("OCM-0", 35.0, -120.0)])
+        assert store.delete_stations(["OCM-1", "OCM-missing"]) == 1
+        store.close()
+        reopened = StationStore(path)
+        assert len(reopened) == 199
+        assert any(s['id'] == "OCM-0" for s in reopened.query_radius((35.0, -120.0), 1))
+        print(f"   ✅ Reopened store has {len(reopened)} stations")
+        reopened.close()
+    
+    print("\n" + "=" * 60)
+    print("✅ Station store test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_station_store()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test incremental station sync against recorded pages (no network required)
+"""
+
+import json
+import os
+import tempfile
+from utils.station_store import StationStore
+from utils.station_sync import sync_station_store, replay_fetcher, WATERMARK_KEY
+
+def make_poi(poi_id, modified, status_id=50):
+    return {
+        "ID": poi_id,
+        "DateLastStatusUpdate": modified,
+        "StatusTypeID": status_id,
+        "OperatorInfo": {"Title": "EVgo Network"},
+        "AddressInfo": {
+            "Title": f"Station {poi_id}",
+            "Town": "Fresno",
+            "StateOrProvince": "CA",
+            "Latitude": 36.7 + poi_id * 0.01,
+            "Longitude": -119.8
+        },
+        "Connections": [{"PowerKW": 150}],
+        "StatusType": {"IsOperational": True}
+    }
+
+def test_station_sync():
+    print("=" * 60)
+    print("Testing Incremental Station Sync")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StationStore(os.path.join(tmp, "stations.sqlite3"))
+        
+        # Test 1: full download across two pages
+        print("\n🧪 Test 1: Initial sync (two pages)")
+        calls = []
+        pages = [
+            [make_poi(1, "2024-01-01T00:00:00Z"), make_poi(2, "2024-01-02T00:00:00Z")],
+            [make_poi(3, "2024-01-03T00:00:00Z")],
+        ]
+        def fetch(params):
+            calls.append(params)
+            return pages[len(calls) - 1]
+        summary = sync_station_store(store, fetch, page_size=2)
+        print(f"   {summary}")
+        assert len(store) == 3 and summary["pages"] == 2
+        assert calls[1]["greaterthanid"] == 2 and "modifiedsince" not in calls[0]
+        assert store.get_meta(WATERMARK_KEY) == "2024-01-03T00:00:00Z"
+        print("   ✅ 3 stations imported, watermark recorded")
+        
+        # Test 2: replayed delta with an update and a removal
+        print("\n🧪 Test 2: Replayed delta (update + removal)")
+        recordings = os.path.join(tmp, "recordings")
+        os.makedirs(recordings)
+        with open(os.path.join(recordings, "page-0001.json"), 'w') as f:
+            json.dump([make_poi(2, "2024-02-01T00:00:00Z"), make_poi(3, "2024-02-02T00:00:00Z", status_id=200)], f)
+        summary = sync_station_store(store, replay_fetcher(recordings))
+        print(f"   {summary}")
+        assert summary["since"] == "2024-01-03T00:00:00Z"
+        assert summary["upserted"] == 1 and summary["deleted"] == 1
+        assert len(store) == 2
+        assert store.get_meta(WATERMARK_KEY) == "2024-02-02T00:00:00Z"
+        print("   ✅ Delta applied, watermark advanced")
+        store.close()
+    
+    print("\n" + "=" * 60)
+    print("✅ Station sync test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_station_sync()
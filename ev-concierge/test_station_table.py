@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the compact Station / StationTable representation (no network required)
+"""
+
+import json
+import tracemalloc
+from utils.station_table import Station, StationTable
+
+def make_station(i):
+    return {
+        "id": f"OCM-{i}",
+        "network": ["EVgo", "Tesla Supercharger", "ChargePoint"][i % 3],
+        "location": ["Fresno, CA", "Barstow, CA"][i % 2],
+        "address": f"{i} Main St, Fresno, CA",
+        "latitude": 35.0 + i / 1000,
+        "longitude": -119.0 - i / 1000,
+        "power_kw": 150,
+        "price_per_kwh": 0.43,
+        "available": i % 5 != 0,
+        "slots": ["10:00", "10:30", "11:00", "11:30", "12:00"],
+        "amenities": []
+    }
+
+def retained_bytes(build):
+    tracemalloc.start()
+    value = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return retained
+
+def test_station_table():
+    print("=" * 60)
+    print("Testing Station Table")
+    print("=" * 60)
+    
+    stations = [make_station(i) for i in range(2000)]
+    
+    print("\n🧪 Test 1: Dicts round-trip unchanged")
+    table = StationTable.from_dicts(stations)
+    assert len(table) == len(stations)
+    assert table.to_dicts() == stations
+    assert Station.from_dict(stations[7]).to_dict() == stations[7]
+    print(f"   ✅ {len(table)} stations")
+    
+    print("\n🧪 Test 2: Duplicate ids are skipped")
+    assert table.extend(stations[:10] + [make_station(5000)]) == 1
+    assert len(table) == len(stations) + 1
+    assert "OCM-5000" in table
+    print("   ✅ Merged by id")
+    
+    print("\n🧪 Test 3: take() keeps the requested order")
+    picked = table.take([3, 1, 2])
+    assert picked.ids == ["OCM-3", "OCM-1", "OCM-2"]
+    assert picked[0] == table[3]
+    print("   ✅ Rows selected")
+    
+    print("\n🧪 Test 4: Columns survive a JSON round trip")
+    columns = json.loads(json.dumps(table.to_columns()))
+    restored = StationTable.from_columns(columns)
+    assert restored.to_dicts() == table.to_dicts()
+    assert restored.networks[0] is restored.networks[3]  # interned
+    print(f"   ✅ {len(json.dumps(columns)) // len(table)} bytes/station as columns "
+          f"vs {len(json.dumps(stations)) // len(stations)} as dicts")
+    
+    print("\n🧪 Test 5: Memory per station")
+    encoded = json.dumps(stations)
+    as_dicts = retained_bytes(lambda: json.loads(encoded)) / len(stations)
+    as_table = retained_bytes(lambda: StationTable.from_dicts(json.loads(encoded))) / len(stations)
+    print(f"   Dicts: {as_dicts:.0f} B, StationTable: {as_table:.0f} B")
+    assert as_table * 3 < as_dicts
+    print("   ✅ Table is several times smaller")
+    
+    print("\n" + "=" * 60)
+    print("✅ Station table test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_station_table()
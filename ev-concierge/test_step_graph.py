@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test the step graph and the coordinator's parallel plan (no network or model calls)
+"""
+
+import asyncio
+import json
+import time
+import agents.coordinator as coordinator_module
+from agents.coordinator import CoordinatorAgent
+from utils.step_graph import StepGraph
+
+VEHICLE = {"model": "Tesla Model Y", "battery_percent": 30, "range_miles": 300}
+TRIP = {"origin": "Los Angeles, CA", "destination": "San Francisco, CA", "distance_miles": 406, "departure": "2024-01-15T09:00:00"}
+PREFS = {"wallet_id": "wallet-1", "auto_order_coffee": True, "favorite_drink": "Large Latte", "favorite_food": "Croissant"}
+STATION = {"id": "OCM-1", "network": "EVgo", "location": "Kettleman City, CA", "latitude": 36.0, "longitude": -119.96,
+           "power_kw": 150, "price_per_kwh": 0.4}
+
+def sleeper(name, seconds, result=None):
+    async def run(steps):
+        await asyncio.sleep(seconds)
+        return result if result is not None else name
+    return run
+
+def test_step_graph():
+    print("=" * 60)
+    print("Testing Step Graph")
+    print("=" * 60)
+    
+    print("\n🧪 Test 1: Independent steps overlap")
+    graph = StepGraph()
+    graph.add("a", sleeper("a", 0.2))
+    graph.add("b", sleeper("b", 0.2))
+    graph.add("c", sleeper("c", 0.1), after=("a", "b"))
+    started = time.perf_counter()
+    results = asyncio.run(graph.run())
+    elapsed = time.perf_counter() - started
+    timing = {t.step: t for t in graph.timeline}
+    assert results == {"a": "a", "b": "b", "c": "c"}
+    assert timing["c"].start_s >= max(timing["a"].end_s, timing["b"].end_s)
+    assert elapsed < 0.45, elapsed
+    print(f"   ✅ 0.2 + 0.2 + 0.1 s of steps in {elapsed:.2f} s")
+    
+    print("\n🧪 Test 2: Skipped steps and their dependents")
+    graph = StepGraph()
+    graph.add("a", sleeper("a", 0))
+    graph.add("b", sleeper("b", 0), after=("a",), when=lambda steps: False)
+    graph.add("c", sleeper("c", 0), after=("b",), when=lambda steps: steps["b"] is not None)
+    results = asyncio.run(graph.run())
+    assert results == {"a": "a", "b": None, "c": None}
+    assert [t.status for t in graph.timeline] == ["done", "skipped", "skipped"]
+    print("   ✅ Skipped steps give None")
+    
+    print("\n🧪 Test 3: A failure cancels the rest")
+    async def fail(steps):
+        raise RuntimeError("boom")
+    graph = StepGraph()
+    graph.add("slow", sleeper("slow", 5))
+    graph.add("fail", fail)
+    graph.add("after", sleeper("after", 0), after=("fail",))
+    started = time.perf_counter()
+    try:
+        asyncio.run(graph.run())
+        raise AssertionError("expected the step's error")
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    assert time.perf_counter() - started < 1
+    assert "after" not in graph.results
+    print("   ✅ Error raised, slow step cancelled")
+    
+    print("\n🧪 Test 4: Dependencies must already exist")
+    graph = StepGraph()
+    try:
+        graph.add("a", sleeper("a", 0), after=("missing",))
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    graph.add("a", sleeper("a", 0))
+    try:
+        graph.add("a", sleeper("a", 0))
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    print("   ✅ Unknown and duplicate steps rejected")
+    
+    print("\n" + "=" * 60)
+    print("✅ Step graph test complete!")
+    print("=" * 60)
+
+def test_coordinator_critical_path():
+    print("=" * 60)
+    print("Testing Coordinator Critical Path")
+    print("=" * 60)
+    
+    coordinator = CoordinatorAgent()
+    seen = {}
+    
+    async def narrate(vehicle_data, trip_data, energy):
+        await asyncio.sleep(0.3)
+        return "Charge once on the way."
+    
+    async def find_and_reserve(trip_data, preferences):
+        await asyncio.sleep(0.3)
+        return {"reservation": "Reserved", "tool_results": [[STATION], {
+            "reservation_id": "RES-1", "charger_id": "OCM-1", "location": STATION["location"],
+            "network": STATION["network"], "time_slot": "10:00", "duration_min": 30}]}
+    
+    async def order_amenities(location, prefs, duration, options=None):
+        seen["options"] = options
+        await asyncio.sleep(0.2)
+        return {"tool_results": [{"order_id": "ORD-1", "restaurant": "Starbucks", "items": ["Large Latte"], "total_usd": 5.5}]}
+    
+    async def process_payments(transactions, wallet_id, wallet=None, fees=None):
+        seen["payment"] = (transactions, wallet, fees)
+        await asyncio.sleep(0.2)
+        return {"tool_results": []}
+    
+    async def search_chargers(*args, **kwargs):
+        return json.dumps([STATION])
+    
+    coordinator.trip_agent.narrate_async = narrate
+    coordinator.charging_agent.find_and_reserve_async = find_and_reserve
+    coordinator.amenities_agent.order_amenities_async = order_amenities
+    coordinator.payment_agent.process_payments_async = process_payments
+    original_search = coordinator_module.search_chargers_async
+    original_mode = coordinator_module.TRIP_ANALYSIS_MODE
+    coordinator_module.search_chargers_async = search_chargers
+    coordinator_module.TRIP_ANALYSIS_MODE = "background"
+    
+    try:
+        print("\n🧪 Test 1: Steps overlap along the dependency graph")
+        started = time.perf_counter()
+        result = coordinator.orchestrate(VEHICLE, TRIP, PREFS)
+        elapsed = time.perf_counter() - started
+        timing = {t["step"]: t for t in result["timeline"]}
+        print(f"   {elapsed:.2f} s for 1.0 s of agent calls")
+        # charging 0.3 -> amenities 0.2 -> payment 0.2 is the critical path
+        assert 0.7 <= elapsed < 0.95, elapsed
+        assert timing["amenity_options"]["end_s"] <= timing["charging"]["end_s"]
+        assert timing["wallet"]["end_s"] <= timing["charging"]["end_s"]
+        assert timing["charging_fees"]["end_s"] <= timing["amenities"]["end_s"]
+        print("   ✅ Amenity discovery and wallet check ran during the reservation")
+        
+        print("\n🧪 Test 2: Prefetched results are handed to the agents")
+        assert seen["options"]["location"] == STATION["location"]
+        assert "Starbucks" in seen["options"]["menus"]
+        transactions, wallet, fees = seen["payment"]
+        assert [t["merchant"] for t in transactions] == ["EVgo Charging", "Starbucks"]
+        assert wallet["valid"] and len(fees) == 2
+        assert "Charge once on the way." in result["summary"] and "RES-1" in result["summary"]
+        print("   ✅ Menus, wallet and fees reused")
+        
+        print("\n🧪 Test 3: A failed prefetch doesn't stop the plan")
+        async def search_down(*args, **kwargs):
+            raise ConnectionError("Open Charge Map unreachable")
+        coordinator_module.search_chargers_async = search_down
+        result = coordinator.orchestrate(VEHICLE, TRIP, PREFS)
+        timing = {t["step"]: t for t in result["timeline"]}
+        assert timing["stations"]["status"] == "done" and timing["amenity_options"]["status"] == "skipped"
+        assert seen["options"] is None and "RES-1" in result["summary"]
+        print("   ✅ Amenities looked up by the agent itself")
+    finally:
+        coordinator_module.search_chargers_async = original_search
+        coordinator_module.TRIP_ANALYSIS_MODE = original_mode
+    
+    print("\n" + "=" * 60)
+    print("✅ Coordinator critical path test complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_step_graph()
+    test_coordinator_critical_path()
@@ -3,8 +3,64 @@ from strands.tools import tool
 from utils.config import USE_MOCK_DATA
 from utils.mock_data import get_mock_chargers
 from utils.location_coords import get_coordinates
-from utils.openchargemap_client import get_chargers_along_route
+from utils.routing import KM_PER_MILE, get_road_network
+from utils.openchargemap_client import StationSearchUnavailable, get_chargers_for_ranges, get_chargers_for_ranges_async
+from utils.station_table import StationTable
+from utils.charge_planner import plan_charging_trip
 import json
+import math
+
+def _resolve_route(route: str, destination: str):
+    """
+    Look up coordinates for both ends and the road between them.
+    
+    Returns:
+        (origin_coords, dest_coords, route_points, error): route_points is
+        the road polyline (None to search along the straight line when no
+        road route is known); error is an invalid_location result or None
+    """
+    origin_coords = get_coordinates(route)
+    dest_coords = get_coordinates(destination)
+    
+    if not origin_coords or not dest_coords:
+        print(f"⚠️  Could not find coordinates for {route} or {destination}")
+        return None, None, None, {
+            "error": "invalid_location",
+            "message": f"Could not find coordinates for {route} or {destination}",
+            "stations": []
+        }
+    
+    road_route = get_road_network().route(origin_coords, dest_coords)
+    if road_route is None:
+        print(f"⚠️  No road route from {route} to {destination}, searching along the straight line")
+        return origin_coords, dest_coords, None, None
+    return origin_coords, dest_coords, road_route.points, None
+
+def _charger_search_result(current_range_miles: int, result: StationTable, full_range_stations: StationTable):
+    """Convert reachable stations to dicts, or give guidance when none are in range."""
+    if result:
+        return result.to_dicts()
+    
+    # If no reachable stations, provide guidance
+    print("⚠️  No reachable stations found with current battery level")
+    
+    return {
+        "error": "insufficient_range",
+        "message": f"No charging stations reachable with current range ({current_range_miles} miles). Please charge at home before starting your trip.",
+        "current_range_miles": current_range_miles,
+        "recommended_action": "Charge to 100% at home before departure",
+        "stations_if_fully_charged": full_range_stations.to_dicts(range(min(3, len(full_range_stations)))),
+        "stations": []
+    }
+
+def _search_unavailable_result(error: Exception) -> dict:
+    """Report a failed lookup without implying that no stations are in range."""
+    print(f"⚠️  Charger search unavailable: {error}")
+    return {
+        "error": "search_unavailable",
+        "message": "Charging station data is temporarily unavailable. Please try again shortly.",
+        "stations": []
+    }
 
 @tool
 def search_chargers(route: str, destination: str, min_power_kw: int = 150, current_range_miles: int = 300) -> str:
@@ -20,52 +76,118 @@ def search_chargers(route: str, destination: str, min_power_kw: int = 150, curre
         JSON list of charging stations within range
     """
     if USE_MOCK_DATA:
-        result = get_mock_chargers(route, destination)
-    else:
-        # Get coordinates for origin and destination
-        origin_coords = get_coordinates(route)
-        dest_coords = get_coordinates(destination)
-        
-        if not origin_coords or not dest_coords:
-            print(f"⚠️  Could not find coordinates for {route} or {destination}")
-            result = {
-                "error": "invalid_location",
-                "message": f"Could not find coordinates for {route} or {destination}",
-                "stations": []
-            }
-        else:
-            # Query OpenChargeMap API with reachability filter
-            result = get_chargers_along_route(
-                origin_coords,
-                dest_coords,
-                min_power_kw=min_power_kw,
-                max_results=10,
-                current_range_miles=current_range_miles
-            )
-            
-            # If no reachable stations, provide guidance
-            if not result:
-                print("⚠️  No reachable stations found with current battery level")
-                
-                # Find stations if they had full battery
-                full_range_stations = get_chargers_along_route(
-                    origin_coords,
-                    dest_coords,
-                    min_power_kw=min_power_kw,
-                    max_results=5,
-                    current_range_miles=300  # Assume full range
-                )
-                
-                result = {
-                    "error": "insufficient_range",
-                    "message": f"No charging stations reachable with current range ({current_range_miles} miles). Please charge at home before starting your trip.",
-                    "current_range_miles": current_range_miles,
-                    "recommended_action": "Charge to 100% at home before departure",
-                    "stations_if_fully_charged": full_range_stations[:3] if full_range_stations else [],
-                    "stations": []
-                }
+        return json.dumps(get_mock_chargers(route, destination))
     
-    return json.dumps(result)
+    origin_coords, dest_coords, route_points, error = _resolve_route(route, destination)
+    if error:
+        return json.dumps(error)
+    
+    # Query OpenChargeMap once, filtering for the current range and
+    # for a full battery (300 miles) in the same pass
+    try:
+        result, full_range_stations = get_chargers_for_ranges(
+            origin_coords,
+            dest_coords,
+            [current_range_miles, 300],
+            min_power_kw=min_power_kw,
+            max_results=10,
+            route_points=route_points
+        )
+    except StationSearchUnavailable as e:
+        return json.dumps(_search_unavailable_result(e))
+    return json.dumps(_charger_search_result(current_range_miles, result, full_range_stations))
+
+@tool(name="search_chargers")
+async def search_chargers_async(route: str, destination: str, min_power_kw: int = 150, current_range_miles: int = 300) -> str:
+    """Search for available EV chargers along route.
+    
+    Args:
+        route: Starting location (e.g., "Los Angeles, CA")
+        destination: Ending location (e.g., "San Francisco, CA")
+        min_power_kw: Minimum power rating filter (default 150)
+        current_range_miles: Current vehicle range in miles (default 300)
+    
+    Returns:
+        JSON list of charging stations within range
+    """
+    if USE_MOCK_DATA:
+        return json.dumps(get_mock_chargers(route, destination))
+    
+    origin_coords, dest_coords, route_points, error = _resolve_route(route, destination)
+    if error:
+        return json.dumps(error)
+    
+    # Same search as search_chargers, but the corridor tiles are fetched
+    # concurrently without blocking the agent's event loop
+    try:
+        result, full_range_stations = await get_chargers_for_ranges_async(
+            origin_coords,
+            dest_coords,
+            [current_range_miles, 300],
+            min_power_kw=min_power_kw,
+            max_results=10,
+            route_points=route_points
+        )
+    except StationSearchUnavailable as e:
+        return json.dumps(_search_unavailable_result(e))
+    return json.dumps(_charger_search_result(current_range_miles, result, full_range_stations))
+
+@tool
+def plan_charging_stops(route: str, destination: str, battery_percent: int, vehicle_range_miles: int = 300, min_power_kw: int = 50, weather_temp_f: int = 70, vehicle_model: str = "") -> str:
+    """Plan every charging stop for a trip longer than one battery range.
+    
+    Args:
+        route: Starting location (e.g., "Seattle, WA")
+        destination: Ending location (e.g., "Los Angeles, CA")
+        battery_percent: Current battery level
+        vehicle_range_miles: Range on a full battery (default 300)
+        min_power_kw: Minimum charger power (default 50)
+        weather_temp_f: Outside temperature (default 70)
+        vehicle_model: Vehicle model, for its charging curve (e.g., "Tesla Model Y")
+    
+    Returns:
+        JSON with the stops in driving order (station details plus arrival
+        and departure battery levels and charging minutes) and trip totals
+    """
+    if USE_MOCK_DATA:
+        return json.dumps({
+            "error": "planning_unavailable",
+            "message": "Multi-stop planning needs real station locations (set USE_MOCK_DATA=false)",
+            "stops": []
+        })
+    
+    try:
+        plan, stations = plan_charging_trip(
+            route, destination, battery_percent, vehicle_range_miles, weather_temp_f, min_power_kw, vehicle_model
+        )
+    except StationSearchUnavailable as e:
+        return json.dumps(_search_unavailable_result(e))
+    
+    if plan is None:
+        return json.dumps({
+            "error": "no_plan",
+            "message": f"No sequence of charging stops reaches {destination} from {route} ({len(stations)} stations checked)",
+            "stops": []
+        })
+    
+    stops = []
+    for stop in plan.stops:
+        station = stations[stop.row].to_dict()
+        station.update({
+            "miles_from_origin": round(stop.along_km / KM_PER_MILE),
+            "arrive_percent": round(stop.arrive_percent),
+            "depart_percent": round(stop.depart_percent),
+            "charge_min": math.ceil(stop.charge_min)
+        })
+        stops.append(station)
+    
+    return json.dumps({
+        "stops": stops,
+        "distance_miles": round(plan.distance_km / KM_PER_MILE),
+        "total_hours": round(plan.total_min / 60, 1),
+        "charging_min": round(plan.charge_min),
+        "arrival_percent": round(plan.arrival_percent)
+    })
 
 @tool
 def reserve_charging_slot(charger_id: str, time_slot: str, duration_min: int = 30, location: str = "", network: str = "") -> str:
@@ -1,31 +1,30 @@
 from strands.tools import tool
+from utils.energy import energy_needs
+from utils.routing import plan_route
 import json
 
 @tool
 def calculate_energy_needs(battery_percent: int, trip_distance_miles: int, vehicle_range_miles: int, weather_temp_f: int = 70) -> str:
     """Calculate energy requirements for a trip considering weather"""
-    temp_factor = 1.0 if 50 <= weather_temp_f <= 80 else 1.15
-    required_percent = (trip_distance_miles / vehicle_range_miles) * 100 * temp_factor
-    buffer = 20
-    
-    result = {
-        "current_battery": battery_percent,
-        "required_battery": round(required_percent + buffer, 1),
-        "needs_charging": battery_percent < required_percent + buffer,
-        "deficit_percent": max(0, round(required_percent + buffer - battery_percent, 1)),
-        "charging_strategy": "en-route" if battery_percent > 30 else "pre-trip"
-    }
+    result = energy_needs(battery_percent, trip_distance_miles, vehicle_range_miles, weather_temp_f)
     
     return json.dumps(result)
 
 @tool
 def get_route_info(origin: str, destination: str) -> str:
     """Get route information including distance and duration"""
+    route = plan_route(origin, destination)
+    if route is None:
+        return json.dumps({
+            "error": "no_route",
+            "message": f"Could not find a road route from {origin} to {destination}"
+        })
+    
     result = {
-        "distance_miles": 280,
-        "duration_hours": 4.5,
-        "route": "I-5 South",
-        "traffic_delay_min": 15
+        "distance_miles": round(route.distance_miles),
+        "duration_hours": round(route.duration_hours, 1),
+        "route": " → ".join(route.highways),
+        "via": route.places[1:-1]
     }
     
     return json.dumps(result)
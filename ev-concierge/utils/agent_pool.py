@@ -0,0 +1,121 @@
+"""
+Shared model clients and reusable strands Agents.
+
+Every BedrockModel creates its own boto3 client (about 150 ms), and every
+Agent registers its tools and prompt. get_model returns one model per
+(model ID, region, temperature), shared by all agents. Each agent role has
+an AgentPool: a call takes an idle Agent (or builds one), and when it is
+given back its conversation is cleared so the next caller starts fresh.
+Up to AGENT_POOL_SIZE idle agents are kept per role; busier moments build
+extra agents that are dropped afterwards, so a caller never waits.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from strands import Agent
+from strands.agent.state import AgentState
+from strands.models import BedrockModel
+from strands.telemetry.metrics import EventLoopMetrics
+
+from utils.config import AGENT_POOL_SIZE, AWS_REGION, BEDROCK_MODEL_ID
+
+_models: dict[tuple[str, str, float], BedrockModel] = {}
+_pools: dict[str, 'AgentPool'] = {}
+_lock = threading.Lock()
+
+
+def get_model(model_id: str = BEDROCK_MODEL_ID, region_name: str = AWS_REGION, temperature: float = 0.7) -> BedrockModel:
+    """
+    Return the shared model client for a model ID, creating it on first use.
+    """
+    key = (model_id, region_name, temperature)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = BedrockModel(model_id=model_id, region_name=region_name, temperature=temperature)
+        return model
+
+
+def reset_agent(agent: Agent) -> None:
+    """Clear an agent's conversation, state and metrics, keeping its tools and prompt."""
+    agent.messages = []
+    agent.state = AgentState()
+    agent.event_loop_metrics = EventLoopMetrics()
+    if hasattr(agent.conversation_manager, 'removed_message_count'):
+        agent.conversation_manager.removed_message_count = 0
+
+
+class AgentPool:
+    """Idle Agents for one role, handed out to one caller at a time."""
+
+    def __init__(self, role: str, factory: Callable[[], Agent], size: int = AGENT_POOL_SIZE):
+        """
+        Args:
+            role: Name of the agent role (for stats)
+            factory: Builds a new Agent for the role
+            size: Idle agents kept for reuse
+        """
+        self.role = role
+        self.factory = factory
+        self.size = size
+        self._idle: list[Agent] = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self) -> Agent:
+        """Take an idle agent, or build one if none is free."""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.created += 1
+        return self.factory()
+
+    def release(self, agent: Agent) -> None:
+        """
+        Give an agent back after a call, clearing its conversation.
+
+        Call it in a finally block so an agent whose call failed or was
+        cancelled also goes back to the pool.
+        """
+        reset_agent(agent)
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(agent)
+            else:
+                self.discarded += 1
+
+    def stats(self) -> dict:
+        """Return reuse counters and the number of idle agents."""
+        with self._lock:
+            return {
+                "role": self.role,
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
+
+
+def get_agent_pool(role: str, factory: Callable[[], Agent], size: Optional[int] = None) -> AgentPool:
+    """
+    Return the pool for an agent role, creating it on first use.
+
+    A role's system prompt and tools must not change between calls: the
+    factory given when the pool is created is the one used from then on.
+    """
+    with _lock:
+        pool = _pools.get(role)
+        if pool is None:
+            pool = _pools[role] = AgentPool(role, factory, AGENT_POOL_SIZE if size is None else size)
+        return pool
+
+
+def pool_stats() -> list[dict]:
+    """Return stats() for every agent pool."""
+    with _lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
@@ -0,0 +1,288 @@
+"""
+Multi-stop charging plans for trips longer than one battery range.
+
+The trip is a graph of origin, candidate chargers (ordered along the road
+route) and destination. A search state is (node, battery level), with the
+battery discretized in SOC_STEP_PERCENT buckets; arrival levels are
+rounded down, so a plan never assumes more charge than it has. Moving
+from a charger to any later node within range costs the drive time plus
+the detour off and back onto the road; charging at a node moves to a
+higher bucket at the cost of the stop overhead plus the charge time,
+read from the vehicle's charging curve (utils/charging_curve.py).
+
+Every edge points further along the route, so the graph is acyclic and
+nodes are settled in route order: when a node is reached, all of its
+labels are final (label-setting without a priority queue). Each node's
+outgoing edges are relaxed for all battery levels at once with NumPy.
+
+Usage:
+    python -m utils.charge_planner "Seattle, WA" "Los Angeles, CA" 80 300
+"""
+
+import math
+import sys
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from utils.charging_curve import ChargingCurve, get_charging_curve
+from utils.energy import percent_per_km
+from utils.location_coords import get_coordinates, great_circle_geometry_batch
+from utils.openchargemap_client import get_corridor_stations
+from utils.routing import ACCESS_SPEED_KMH, ROAD_CURVATURE, get_road_network
+from utils.station_table import StationTable
+
+# Battery level granularity of the search
+SOC_STEP_PERCENT = 2
+
+# Lowest battery level allowed when arriving anywhere
+ARRIVAL_RESERVE_PERCENT = 10
+
+# Highest level a plan charges to; the charging curve already makes the
+# last few percent slow, so plans only go this high to cross a long gap
+MAX_CHARGE_PERCENT = 100
+
+# Parking, plugging in and paying, per stop
+STOP_OVERHEAD_MIN = 5
+
+
+class PlannedStop(NamedTuple):
+    # Row in the candidate table
+    row: int
+    along_km: float
+    arrive_percent: float
+    depart_percent: float
+    charge_min: float
+
+
+class ChargingPlan(NamedTuple):
+    stops: list[PlannedStop]
+    distance_km: float
+    drive_min: float
+    charge_min: float
+    arrival_percent: float
+
+    @property
+    def total_min(self) -> float:
+        return self.drive_min + self.charge_min + STOP_OVERHEAD_MIN * len(self.stops)
+
+
+def plan_stops(
+    route_km: float,
+    route_min: float,
+    along_km,
+    deviation_km,
+    power_kw,
+    battery_percent: float,
+    vehicle_range_miles: float,
+    weather_temp_f: float = 70,
+    curve: Optional[ChargingCurve] = None,
+    reserve_percent: float = ARRIVAL_RESERVE_PERCENT,
+    max_charge_percent: float = MAX_CHARGE_PERCENT
+) -> Optional[ChargingPlan]:
+    """
+    Find the fastest sequence of charging stops for a route.
+
+    Args:
+        route_km: Road distance from origin to destination
+        route_min: Driving time from origin to destination
+        along_km: Road distance from the origin to each candidate charger
+        deviation_km: Straight-line distance of each charger from the road
+        power_kw: Power of each charger
+        battery_percent: Battery level at the origin
+        vehicle_range_miles: Range on a full battery
+        weather_temp_f: Outside temperature
+        curve: The vehicle's charging curve (default vehicle if omitted)
+        reserve_percent: Lowest battery level allowed on arrival anywhere
+        max_charge_percent: Highest level to charge to
+
+    Returns:
+        The ChargingPlan (stops in driving order, rows indexing the
+        candidates), or None if no sequence of stops reaches the destination
+    """
+    curve = curve or get_charging_curve()
+    along = np.clip(np.asarray(along_km, dtype=float), 0.0, route_km)
+    order = np.argsort(along, kind="stable")
+    # Node 0 is the origin, 1..n the chargers in route order, n + 1 the destination
+    position = np.concatenate(([0.0], along[order], [route_km]))
+    detour_km = np.concatenate(([0.0], np.asarray(deviation_km, dtype=float)[order] * ROAD_CURVATURE, [0.0]))
+    power = np.concatenate(([0.0], np.asarray(power_kw, dtype=float)[order], [0.0]))
+    nodes = len(position)
+    destination = nodes - 1
+
+    road_min_per_km = route_min / route_km if route_km > 0 else 0.0
+    access_min_per_km = 60 / ACCESS_SPEED_KMH
+    per_km = percent_per_km(vehicle_range_miles, weather_temp_f)
+    levels = np.arange(0.0, max_charge_percent + 1e-9, SOC_STEP_PERCENT)
+    buckets = len(levels)
+    reserve_bucket = math.ceil(reserve_percent / SOC_STEP_PERCENT - 1e-9)
+    # Furthest any departure can drive, used to bound each node's edges
+    reach_km = (max(max_charge_percent, battery_percent) - reserve_percent) / per_km
+
+    # Best arrival time per (node, bucket), with back-pointers: the node and
+    # departure bucket it was reached from, and for each departure bucket
+    # the arrival bucket charging started at
+    best = np.full((nodes, buckets), np.inf)
+    previous_node = np.full((nodes, buckets), -1, dtype=np.int32)
+    previous_depart = np.full((nodes, buckets), -1, dtype=np.int32)
+    charged_from = np.tile(np.arange(buckets, dtype=np.int32), (nodes, 1))
+    upper = np.triu(np.ones((buckets, buckets), dtype=bool), k=1)
+
+    def relax(node: int, depart_levels: np.ndarray, depart_times: np.ndarray) -> None:
+        """Drive from node to every later node in range, for all departure levels."""
+        last = np.searchsorted(position, position[node] + reach_km, side="right")
+        targets = np.arange(node + 1, max(last, node + 1))
+        if not len(targets):
+            return
+        road_km = position[targets] - position[node]
+        off_road_km = detour_km[node] + detour_km[targets]
+        drive_min = road_km * road_min_per_km + off_road_km * access_min_per_km
+        used = (road_km + off_road_km) * per_km
+
+        arrive = np.floor((depart_levels[:, None] - used[None, :]) / SOC_STEP_PERCENT + 1e-9).astype(np.int64)
+        arrive = np.minimum(arrive, buckets - 1)
+        times = depart_times[:, None] + drive_min[None, :]
+        valid = (arrive >= reserve_bucket) & np.isfinite(times)
+        departs, columns = np.nonzero(valid)
+        if not len(departs):
+            return
+        target_nodes = targets[columns]
+        arrive_buckets = arrive[departs, columns]
+        candidate = times[departs, columns]
+        better = candidate < best[target_nodes, arrive_buckets]
+        # Each departure level lands in a different bucket of a given target,
+        # so the (node, bucket) pairs written here are unique
+        target_nodes, arrive_buckets = target_nodes[better], arrive_buckets[better]
+        best[target_nodes, arrive_buckets] = candidate[better]
+        previous_node[target_nodes, arrive_buckets] = node
+        previous_depart[target_nodes, arrive_buckets] = departs[better]
+
+    relax(0, np.array([float(battery_percent)]), np.array([0.0]))
+
+    for node in range(1, destination):
+        arrival = best[node]
+        if not np.isfinite(arrival).any():
+            continue
+        if power[node] <= 0:
+            relax(node, levels, arrival)
+            continue
+        # Cumulative charge time from empty, so charging s -> t costs T[t] - T[s]
+        cumulative = curve.cumulative_minutes(levels, power[node])
+        charging = arrival[:, None] + (cumulative[None, :] - cumulative[:, None]) + STOP_OVERHEAD_MIN
+        charging = np.where(upper, charging, np.inf)
+        start = np.argmin(charging, axis=0)
+        charged = charging[start, np.arange(buckets)]
+        depart = np.where(charged < arrival, charged, arrival)
+        charged_from[node] = np.where(charged < arrival, start, np.arange(buckets))
+        relax(node, levels, depart)
+
+    finished = np.isfinite(best[destination])
+    if not finished.any():
+        return None
+    # Fastest arrival, and among equally fast plans the most battery left
+    fastest = best[destination].min()
+    bucket = int(np.flatnonzero(best[destination] == fastest)[-1])
+
+    path = []
+    node = destination
+    while node != 0:
+        from_node = int(previous_node[node, bucket])
+        depart_bucket = int(previous_depart[node, bucket])
+        if from_node != 0:
+            start = int(charged_from[from_node, depart_bucket])
+            if start != depart_bucket:
+                path.append((from_node, depart_bucket))
+            bucket = start
+        node = from_node
+    path.reverse()
+
+    # Replay the plan with exact battery levels (the search rounded down)
+    stops = []
+    level = float(battery_percent)
+    at_km, at_detour = 0.0, 0.0
+    drive_min = charge_min = 0.0
+    for node, depart_bucket in path + [(destination, None)]:
+        road_km = position[node] - at_km
+        off_road_km = at_detour + detour_km[node]
+        drive_min += road_km * road_min_per_km + off_road_km * access_min_per_km
+        level -= (road_km + off_road_km) * per_km
+        if depart_bucket is not None:
+            target = float(levels[depart_bucket])
+            minutes = curve.minutes(level, target, power[node])
+            stops.append(PlannedStop(int(order[node - 1]), float(position[node]), level, target, minutes))
+            charge_min += minutes
+            level = max(level, target)
+        at_km, at_detour = position[node], detour_km[node]
+
+    distance_km = route_km + 2 * sum(detour_km[node] for node, _ in path)
+    return ChargingPlan(stops, float(distance_km), float(drive_min), float(charge_min), level)
+
+
+def plan_charging_trip(
+    origin: str,
+    destination: str,
+    battery_percent: float,
+    vehicle_range_miles: float,
+    weather_temp_f: float = 70,
+    min_power_kw: int = 50,
+    vehicle_model: Optional[str] = None
+) -> tuple[Optional[ChargingPlan], StationTable]:
+    """
+    Plan the charging stops for a trip between two place names.
+
+    Candidates are every station near the road route (see
+    get_corridor_stations), not just those reachable on the current charge.
+
+    Returns:
+        (plan, candidates): the plan is None if the places are unknown, no
+        road connects them or no sequence of stops reaches the destination
+
+    Raises:
+        StationSearchUnavailable: If the station lookup failed
+    """
+    origin_coords = get_coordinates(origin)
+    dest_coords = get_coordinates(destination)
+    if not origin_coords or not dest_coords:
+        return None, StationTable()
+    route = get_road_network().route(origin_coords, dest_coords)
+    if route is None:
+        return None, StationTable()
+
+    stations, geometry = get_corridor_stations(
+        origin_coords,
+        dest_coords,
+        min_power_kw=min_power_kw,
+        route_points=route.points
+    )
+    # Positions along the polyline are great-circle; scale them to road km
+    _, polyline_km = great_circle_geometry_batch([dest_coords[0]], [dest_coords[1]], route.points)
+    scale = route.distance_km / float(polyline_km[0]) if float(polyline_km[0]) > 0 else 1.0
+
+    plan = plan_stops(
+        route.distance_km,
+        route.duration_min,
+        [along * scale for _, along in geometry],
+        [deviation for deviation, _ in geometry],
+        stations.power_kw,
+        battery_percent,
+        vehicle_range_miles,
+        weather_temp_f,
+        get_charging_curve(vehicle_model)
+    )
+    return plan, stations
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        print(__doc__)
+        sys.exit(1)
+    plan, stations = plan_charging_trip(sys.argv[1], sys.argv[2], float(sys.argv[3]), float(sys.argv[4]))
+    if plan is None:
+        print(f"❌ No charging plan found ({len(stations)} candidate stations)")
+        sys.exit(1)
+    print(f"🔋 {len(plan.stops)} stops, {plan.total_min / 60:.1f} hours ({plan.charge_min:.0f} min charging), "
+          f"arriving with {plan.arrival_percent:.0f}%")
+    for stop in plan.stops:
+        station = stations[stop.row]
+        print(f"   {stop.along_km / 1.609344:5.0f} mi  {station.network} - {station.location} ({station.power_kw} kW): "
+              f"{stop.arrive_percent:.0f}% → {stop.depart_percent:.0f}% in {stop.charge_min:.0f} min")
@@ -7,6 +7,14 @@ AWS_REGION = os.getenv('AWS_REGION', 'us-west-2')
 BEDROCK_MODEL_ID = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0')
 USE_MOCK_DATA = os.getenv('USE_MOCK_DATA', 'true').lower() == 'true'
 
+# How the coordinator gets the trip energy analysis:
+#   'agent'      - the trip planning LLM calls calculate_energy_needs
+#   'background' - calculated directly; the LLM only writes the analysis text,
+#                  while food is ordered and paid for, and only for trips with a charging stop
+#   'lazy'       - calculated directly; the text is written when the summary needs it
+#   'off'        - calculated directly, no analysis text
+TRIP_ANALYSIS_MODE = os.getenv('TRIP_ANALYSIS_MODE', 'background').lower()
+
 # API Keys
 EVGO_API_KEY = os.getenv('EVGO_API_KEY')
 CHARGEPOINT_API_KEY = os.getenv('CHARGEPOINT_API_KEY')
@@ -16,3 +24,62 @@ OPENCHARGEMAP_API_KEY = os.getenv('OPENCHARGEMAP_API_KEY', '')
 
 # OpenChargeMap Configuration
 OPENCHARGEMAP_BASE_URL = 'https://api.openchargemap.io/v3'
+
+# OpenChargeMap station source: 'api' queries the live API, 'store' uses the
+# offline snapshot at OCM_STATION_STORE_PATH (see utils/station_store.py)
+OCM_BACKEND = os.getenv('OCM_BACKEND', 'api').lower()
+OCM_STATION_STORE_PATH = os.getenv(
+    'OCM_STATION_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'stations.sqlite3')
+)
+
+# OpenChargeMap response cache (set OCM_CACHE_PATH= to keep the cache in memory only)
+OCM_CACHE_PATH = os.getenv(
+    'OCM_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'openchargemap.sqlite3')
+)
+OCM_CACHE_TTL_SECONDS = int(os.getenv('OCM_CACHE_TTL_SECONDS', '21600'))
+OCM_CACHE_MAX_ENTRIES = int(os.getenv('OCM_CACHE_MAX_ENTRIES', '2000'))
+
+# Idle strands Agents kept per agent role for reuse (utils/agent_pool.py)
+AGENT_POOL_SIZE = int(os.getenv('AGENT_POOL_SIZE', '4'))
+
+# Shared HTTP session (utils/http_session.py)
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+HTTP_BACKOFF_SECONDS = float(os.getenv('HTTP_BACKOFF_SECONDS', '0.5'))
+HTTP_DEADLINE_SECONDS = float(os.getenv('HTTP_DEADLINE_SECONDS', '10'))
+
+# OpenChargeMap request budget shared by every caller (utils/rate_limiter.py);
+# set OCM_RATE_LIMIT_PER_SECOND=0 to disable
+OCM_RATE_LIMIT_PER_SECOND = float(os.getenv('OCM_RATE_LIMIT_PER_SECOND', '2'))
+OCM_RATE_LIMIT_BURST = int(os.getenv('OCM_RATE_LIMIT_BURST', '5'))
+
+# Offline place-name index (utils/gazetteer.py): the bundled CSV or a GeoNames
+# cities dump such as cities1000.txt
+GAZETTEER_PATH = os.getenv(
+    'GAZETTEER_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'places.csv')
+)
+
+# Highway graph for offline routing (utils/routing.py)
+ROAD_NETWORK_PATH = os.getenv(
+    'ROAD_NETWORK_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'road_network.csv')
+)
+
+# Hub cities whose pairwise trips are precomputed (utils/distance_matrix.py),
+# separated by ';'. Set DISTANCE_MATRIX_PATH= to keep the matrix in memory only
+ROUTE_HUBS = [hub.strip() for hub in os.getenv(
+    'ROUTE_HUBS',
+    'Los Angeles, CA;San Francisco, CA;San Diego, CA;San Jose, CA;Sacramento, CA;'
+    'Fresno, CA;Bakersfield, CA;Barstow, CA;Redding, CA;Las Vegas, NV;Reno, NV;'
+    'Phoenix, AZ;Tucson, AZ;Flagstaff, AZ;Salt Lake City, UT;Portland, OR;'
+    'Eugene, OR;Medford, OR;Seattle, WA;Spokane, WA;Boise, ID;Denver, CO;'
+    'Albuquerque, NM;El Paso, TX'
+).split(';') if hub.strip()]
+DISTANCE_MATRIX_PATH = os.getenv(
+    'DISTANCE_MATRIX_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'distance_matrix.bin')
+)
+ROUTE_CACHE_MAX_ENTRIES = int(os.getenv('ROUTE_CACHE_MAX_ENTRIES', '1000'))
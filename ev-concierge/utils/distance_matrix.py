@@ -0,0 +1,276 @@
+"""
+Precomputed road distances and durations between hub cities.
+
+Every hub-to-hub trip is routed once (utils/routing.py) and saved as two
+float32 matrices in a binary file that later processes memory-map, so a
+hub lookup is two array reads. Other pairs are routed on demand and kept
+in a bounded LRU. The file records what it was built from (hubs, road
+graph, gazetteer) and is rebuilt automatically when any of them change.
+
+File layout: MAGIC, a 4-byte header length, a JSON header, padding to a
+4-byte boundary, then the n*n distance_km and duration_min matrices
+(row = origin hub); NaN marks hubs with no road between them.
+
+Usage:
+    python -m utils.distance_matrix build
+    python -m utils.distance_matrix "Los Angeles, CA" "Las Vegas, NV"
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from utils.config import (
+    DISTANCE_MATRIX_PATH,
+    GAZETTEER_PATH,
+    ROAD_NETWORK_PATH,
+    ROUTE_CACHE_MAX_ENTRIES,
+    ROUTE_HUBS,
+)
+from utils.gazetteer import get_gazetteer
+from utils.routing import KM_PER_MILE, ROAD_CURVATURE, get_road_network, plan_route
+
+MAGIC = b"EVDM1\n"
+
+
+class TripLeg(NamedTuple):
+    distance_km: float
+    duration_min: float
+
+    @property
+    def distance_miles(self) -> float:
+        return self.distance_km / KM_PER_MILE
+
+    @property
+    def duration_hours(self) -> float:
+        return self.duration_min / 60
+
+
+def _fingerprint(hubs: list[str]) -> dict:
+    """What a matrix file depends on; any change means it must be rebuilt."""
+    sources = {}
+    for path in (ROAD_NETWORK_PATH, GAZETTEER_PATH):
+        stat = os.stat(path)
+        sources[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return {"hubs": hubs, "sources": sources, "road_curvature": ROAD_CURVATURE}
+
+
+class DistanceMatrix:
+    """Hub-to-hub trip matrix with an LRU of routed non-hub pairs."""
+
+    def __init__(self, hubs: list[str], distance_km, duration_min, max_entries: int = 1000, mapped: Optional[mmap.mmap] = None):
+        """
+        Args:
+            hubs: Hub labels ("City, ST"), the matrices' row/column order
+            distance_km: n*n float sequence (array or memoryview), row-major
+            duration_min: n*n float sequence, row-major
+            max_entries: Non-hub pairs kept in the LRU
+            mapped: The memory map backing the matrices, closed by close()
+        """
+        self.hubs = hubs
+        self._hub_index = {hub: i for i, hub in enumerate(hubs)}
+        self._distance_km = distance_km
+        self._duration_min = duration_min
+        self._mapped = mapped
+        self.max_entries = max_entries
+        self._routed: OrderedDict[tuple[str, str], Optional[TripLeg]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hub_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def build(cls, hubs: list[str], max_entries: int = 1000) -> 'DistanceMatrix':
+        """Route every hub pair (n*n A* queries)."""
+        network = get_road_network()
+        gazetteer = get_gazetteer()
+        coordinates = []
+        for hub in hubs:
+            place = gazetteer.lookup(hub, fuzzy=False)
+            if place is None:
+                raise ValueError(f"Route hub not in gazetteer: {hub}")
+            coordinates.append(place.coordinates)
+
+        distance_km = array('f')
+        duration_min = array('f')
+        for origin in coordinates:
+            for destination in coordinates:
+                route = network.route(origin, destination)
+                distance_km.append(route.distance_km if route else math.nan)
+                duration_min.append(route.duration_min if route else math.nan)
+        return cls(list(hubs), distance_km, duration_min, max_entries)
+
+    def save(self, path: str) -> None:
+        """Write the hub matrices (atomically, via a temporary file)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = json.dumps(_fingerprint(self.hubs)).encode()
+        padding = -(len(MAGIC) + 4 + len(header)) % 4
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(b"\0" * padding)
+            array('f', self._distance_km).tofile(f)
+            array('f', self._duration_min).tofile(f)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, hubs: list[str], max_entries: int = 1000) -> Optional['DistanceMatrix']:
+        """
+        Memory-map a saved matrix.
+
+        Returns:
+            The matrix, or None if the file is missing, unreadable or was
+            built from different hubs or data
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if mapped[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a distance matrix file")
+            offset = len(MAGIC)
+            (header_length,) = struct.unpack_from("<I", mapped, offset)
+            offset += 4
+            header = json.loads(mapped[offset:offset + header_length])
+            if header != _fingerprint(hubs):
+                raise ValueError("stale distance matrix")
+            offset += header_length
+            offset += -offset % 4
+            cells = len(hubs) * len(hubs)
+            if len(mapped) - offset != 8 * cells:
+                raise ValueError("truncated distance matrix")
+        except (ValueError, struct.error):
+            mapped.close()
+            return None
+        view = memoryview(mapped)[offset:].cast('f')
+        return cls(hubs, view[:cells], view[cells:], max_entries, mapped)
+
+    def close(self) -> None:
+        """Release the memory map (the matrix is unusable afterwards)."""
+        if self._mapped is not None:
+            for view in (self._distance_km, self._duration_min):
+                view.release()
+            self._distance_km = self._duration_min = None
+            self._mapped.close()
+            self._mapped = None
+
+    def _label(self, name: str) -> str:
+        if name in self._hub_index:
+            return name
+        place = get_gazetteer().lookup(name)
+        return place.label if place else name
+
+    def get(self, origin: str, destination: str) -> Optional[TripLeg]:
+        """
+        Road distance and duration between two place names.
+
+        Hub pairs are read from the matrix; other pairs are routed once
+        and then served from the LRU.
+
+        Returns:
+            The TripLeg, or None if a name is unknown or no road connects them
+        """
+        origin, destination = self._label(origin), self._label(destination)
+        i = self._hub_index.get(origin)
+        j = self._hub_index.get(destination)
+        if i is not None and j is not None:
+            cell = i * len(self.hubs) + j
+            distance_km = self._distance_km[cell]
+            with self._lock:
+                self.hub_hits += 1
+            if math.isnan(distance_km):
+                return None
+            return TripLeg(distance_km, self._duration_min[cell])
+
+        key = (origin, destination)
+        with self._lock:
+            if key in self._routed:
+                self._routed.move_to_end(key)
+                self.hits += 1
+                return self._routed[key]
+            self.misses += 1
+
+        route = plan_route(origin, destination)
+        leg = TripLeg(route.distance_km, route.duration_min) if route else None
+        with self._lock:
+            self._routed[key] = leg
+            while len(self._routed) > self.max_entries:
+                self._routed.popitem(last=False)
+                self.evictions += 1
+        return leg
+
+    def stats(self) -> dict:
+        """Return lookup counters and the LRU size."""
+        with self._lock:
+            return {
+                "hubs": len(self.hubs),
+                "mapped": self._mapped is not None,
+                "hub_hits": self.hub_hits,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._routed),
+            }
+
+
+_matrix: Optional[DistanceMatrix] = None
+_matrix_lock = threading.Lock()
+
+
+def get_distance_matrix() -> DistanceMatrix:
+    """
+    Return the shared matrix for ROUTE_HUBS.
+
+    The file at DISTANCE_MATRIX_PATH is memory-mapped, or built and saved
+    first if it is missing or stale. An empty path keeps it in memory only.
+    """
+    global _matrix
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                matrix = None
+                if DISTANCE_MATRIX_PATH:
+                    matrix = DistanceMatrix.load(DISTANCE_MATRIX_PATH, ROUTE_HUBS, ROUTE_CACHE_MAX_ENTRIES)
+                if matrix is None:
+                    print(f"🗺️  Building distance matrix for {len(ROUTE_HUBS)} hubs")
+                    matrix = DistanceMatrix.build(ROUTE_HUBS, ROUTE_CACHE_MAX_ENTRIES)
+                    if DISTANCE_MATRIX_PATH:
+                        matrix.save(DISTANCE_MATRIX_PATH)
+                        matrix = DistanceMatrix.load(DISTANCE_MATRIX_PATH, ROUTE_HUBS, ROUTE_CACHE_MAX_ENTRIES) or matrix
+                _matrix = matrix
+    return _matrix
+
+
+def trip_distance_miles(origin: str, destination: str) -> Optional[int]:
+    """Road distance in whole miles, or None if there is no route."""
+    leg = get_distance_matrix().get(origin, destination)
+    return round(leg.distance_miles) if leg else None
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args == ["build"]:
+        matrix = DistanceMatrix.build(ROUTE_HUBS, ROUTE_CACHE_MAX_ENTRIES)
+        matrix.save(DISTANCE_MATRIX_PATH)
+        print(f"✅ Saved {len(ROUTE_HUBS)}x{len(ROUTE_HUBS)} matrix to {DISTANCE_MATRIX_PATH}")
+    elif len(args) == 2:
+        leg = get_distance_matrix().get(*args)
+        print(f"🛣️  {leg.distance_miles:.0f} miles, {leg.duration_hours:.1f} hours" if leg else "❌ No route found")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,173 @@
+"""
+Battery energy model shared by the trip tools and the charging planner.
+
+calculate_energy_needs (tools/route_tools.py) and the multi-stop planner
+(utils/charge_planner.py) both use these functions, so a trip that the
+tool says needs charging is planned with the same consumption figures.
+energy_needs_batch screens whole fleet schedules in one call.
+
+Usage:
+    python -m utils.energy trips.csv screened.csv
+
+The input needs battery_percent, trip_distance_miles and
+vehicle_range_miles columns (weather_temp_f is optional); other columns
+are copied through and the energy_needs fields are appended.
+"""
+
+import csv
+import sys
+
+import numpy as np
+
+from utils.routing import KM_PER_MILE
+
+# Battery kept in hand at the destination by calculate_energy_needs
+RESERVE_PERCENT = 20
+
+# Range is lost outside this temperature band (cabin heating/cooling)
+MILD_TEMP_F = (50, 80)
+EXTREME_TEMP_FACTOR = 1.15
+
+# Below this battery level charging is recommended before departure
+PRE_TRIP_PERCENT = 30
+
+
+def temperature_factor(weather_temp_f: float = 70) -> float:
+    """Consumption multiplier for the outside temperature."""
+    low, high = MILD_TEMP_F
+    return 1.0 if low <= weather_temp_f <= high else EXTREME_TEMP_FACTOR
+
+
+def percent_per_km(vehicle_range_miles: float, weather_temp_f: float = 70) -> float:
+    """Battery percent used per kilometre driven."""
+    return 100 * temperature_factor(weather_temp_f) / (vehicle_range_miles * KM_PER_MILE)
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """
+    round(value, 1) for every element, as energy_needs rounds.
+
+    np.round multiplies by 10 first, so a value printed as 21.15 (really
+    21.1499...) can come out as 21.2 where round() gives 21.1. Values that
+    close to a midpoint between two tenths are compared with it exactly:
+    20 * value is formed as 16 * value + 4 * value, both exact, keeping the
+    error of the sum. Values exactly on the midpoint (e.g. 4.25) go to the
+    even tenth, as round() does.
+    """
+    values = np.asarray(values, dtype=float)
+    scaled = values * 10
+    tenths = np.floor(scaled)
+    rounded = np.asarray(tenths + (scaled - tenths >= 0.5))
+    near = np.abs(scaled - tenths - 0.5) < 1e-6 * (1 + np.abs(scaled))
+    if near.any():
+        values, tenths = values[near], tenths[near]
+        midpoint = 2 * tenths + 1
+        sixteen, four = values * 16, values * 4
+        twenty = sixteen + four
+        # twenty + error is exactly 20 * value (Knuth's two-sum)
+        part = twenty - sixteen
+        error = (sixteen - (twenty - part)) + (four - part)
+        tie = (twenty == midpoint) & (error == 0)
+        below = (twenty < midpoint) | ((twenty == midpoint) & (error < 0)) | (tie & (tenths % 2 == 0))
+        rounded[near] = np.where(below, tenths, tenths + 1)
+    return rounded / 10
+
+
+def energy_needs_batch(battery_percent, trip_distance_miles, vehicle_range_miles, weather_temp_f=70) -> dict:
+    """
+    energy_needs for many trips at once (e.g. screening a fleet schedule).
+
+    Arguments are arrays (or scalars, broadcast against the arrays) and the
+    work is a handful of NumPy passes, however many trips there are. The
+    arithmetic is the same, operation for operation, as energy_needs, and
+    the results are rounded as round(value, 1) does, so both always give
+    the same answer.
+
+    Returns:
+        Dict of arrays: current_battery, required_battery, needs_charging,
+        deficit_percent and charging_strategy ("en-route" or "pre-trip")
+    """
+    battery = np.asarray(battery_percent, dtype=float)
+    distance = np.asarray(trip_distance_miles, dtype=float)
+    vehicle_range = np.asarray(vehicle_range_miles, dtype=float)
+    temp = np.asarray(weather_temp_f, dtype=float)
+
+    low, high = MILD_TEMP_F
+    factor = np.where((temp >= low) & (temp <= high), 1.0, EXTREME_TEMP_FACTOR)
+    required_percent = (distance / vehicle_range) * 100 * factor
+    required_with_reserve = required_percent + RESERVE_PERCENT
+
+    return {
+        "current_battery": battery,
+        "required_battery": _round_tenths(required_with_reserve),
+        "needs_charging": battery < required_with_reserve,
+        "deficit_percent": np.maximum(0, _round_tenths(required_with_reserve - battery)),
+        "charging_strategy": np.where(battery > PRE_TRIP_PERCENT, "en-route", "pre-trip")
+    }
+
+
+def energy_needs(battery_percent: float, trip_distance_miles: float, vehicle_range_miles: float, weather_temp_f: float = 70) -> dict:
+    """
+    Work out whether a trip needs charging.
+
+    Args:
+        battery_percent: Current state of charge
+        trip_distance_miles: Road distance of the trip
+        vehicle_range_miles: Range on a full battery
+        weather_temp_f: Outside temperature
+
+    Returns:
+        Dict with current_battery, required_battery, needs_charging,
+        deficit_percent and charging_strategy ("en-route" or "pre-trip")
+    """
+    required_percent = (trip_distance_miles / vehicle_range_miles) * 100 * temperature_factor(weather_temp_f)
+    required_with_reserve = required_percent + RESERVE_PERCENT
+
+    return {
+        "current_battery": battery_percent,
+        "required_battery": round(required_with_reserve, 1),
+        "needs_charging": battery_percent < required_with_reserve,
+        "deficit_percent": max(0, round(required_with_reserve - battery_percent, 1)),
+        "charging_strategy": "en-route" if battery_percent > PRE_TRIP_PERCENT else "pre-trip"
+    }
+
+
+def screen_trips(input_path: str, output_path: str) -> int:
+    """
+    Run energy_needs_batch over a CSV of scheduled trips.
+
+    Returns:
+        Number of trips that need charging
+    """
+    with open(input_path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        fields = list(reader.fieldnames or [])
+
+    def column(name: str, default=None):
+        if default is not None and name not in fields:
+            return default
+        return np.array([float(row[name]) for row in rows])
+
+    result = energy_needs_batch(
+        column("battery_percent"),
+        column("trip_distance_miles"),
+        column("vehicle_range_miles"),
+        column("weather_temp_f", default=70)
+    )
+    added = ["required_battery", "needs_charging", "deficit_percent", "charging_strategy"]
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields + added)
+        columns = [result[name].tolist() for name in added]
+        for row, values in zip(rows, zip(*columns)):
+            writer.writerow([row[name] for name in fields] + list(values))
+    return int(result["needs_charging"].sum())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    needing = screen_trips(sys.argv[1], sys.argv[2])
+    print(f"🔋 {needing} trips need charging, written to {sys.argv[2]}")
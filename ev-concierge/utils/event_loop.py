@@ -0,0 +1,95 @@
+"""
+One long-lived event loop for synchronous callers.
+
+asyncio.run creates a loop for a single coroutine and closes it afterwards,
+taking everything bound to that loop with it: the pooled httpx client from
+utils/http_session.py and the model's async connections. run_sync instead
+submits coroutines to one loop running in a daemon thread, so those pools
+last across agent steps and requests. Any number of threads can call it at
+once; their coroutines share the loop.
+"""
+
+import asyncio
+import atexit
+import threading
+from typing import Any, Coroutine, Optional
+
+from utils.http_session import close_async_client
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared loop, starting its thread on first use.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="shared-event-loop", daemon=True)
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def run_sync(coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared loop and wait for its result.
+
+    Unlike asyncio.run this also works from a thread that already has a
+    running loop (Streamlit, Jupyter).
+
+    Args:
+        coroutine: The coroutine to run
+        timeout: Seconds to wait; the coroutine is cancelled if it runs longer
+
+    Raises:
+        RuntimeError: If called from a coroutine on the shared loop itself,
+            which would wait forever on its own thread (await it instead)
+    """
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coroutine.close()
+        raise RuntimeError("run_sync called on the shared event loop; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        # Timed out or interrupted: don't leave it running on the loop
+        future.cancel()
+        raise
+
+
+async def _close() -> None:
+    await close_async_client()
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """
+    Cancel what is still running, close the pooled HTTP client and stop the
+    loop. Runs at exit; a later run_sync starts a new loop.
+    """
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.close()
+
+
+atexit.register(shutdown)
@@ -0,0 +1,392 @@
+"""
+Offline gazetteer: place names to coordinates and back.
+
+Places are loaded once from a bundled CSV (data/places.csv) or a GeoNames
+cities dump (cities1000.txt etc.) and indexed four ways:
+
+- exact: a hash of normalized names ("los angeles ca", "la", "fresno")
+- prefix: the sorted list of normalized names, searched with bisect, for
+  autocomplete
+- fuzzy: a trigram index that narrows typo lookups ("Sacramneto") to a
+  handful of candidates before scoring them
+- spatial: a grid of GRID_DEGREES cells for reverse geocoding, one point
+  at a time or a whole batch of station coordinates in NumPy
+
+Usage:
+    python -m utils.gazetteer "Fresno, CA"
+    python -m utils.gazetteer 36.74 -119.79
+"""
+
+import bisect
+import csv
+import difflib
+import math
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # reverse_batch falls back to one lookup per point
+    np = None
+
+from utils.config import GAZETTEER_PATH
+from utils.location_coords import EARTH_RADIUS_KM, KM_PER_DEGREE
+
+# Reverse-geocoding grid cell size
+GRID_DEGREES = 0.5
+
+# Minimum similarity (0-1) for a fuzzy match
+FUZZY_CUTOFF = 0.8
+
+# Trigram candidates scored per fuzzy lookup
+FUZZY_CANDIDATES = 20
+
+STATE_ABBREVIATIONS = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar",
+    "california": "ca", "colorado": "co", "connecticut": "ct", "delaware": "de",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id",
+    "illinois": "il", "indiana": "in", "iowa": "ia", "kansas": "ks",
+    "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md",
+    "massachusetts": "ma", "michigan": "mi", "minnesota": "mn", "mississippi": "ms",
+    "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny",
+    "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok",
+    "oregon": "or", "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc",
+    "south dakota": "sd", "tennessee": "tn", "texas": "tx", "utah": "ut",
+    "vermont": "vt", "virginia": "va", "washington": "wa", "west virginia": "wv",
+    "wisconsin": "wi", "wyoming": "wy",
+}
+
+# Spelled-out words that places are commonly written with either way
+_WORD_SYNONYMS = {"saint": "st", "mount": "mt", "fort": "ft"}
+
+_COUNTRY_SUFFIXES = ("usa", "us", "united states", "united states of america")
+
+_DROP_PATTERN = re.compile(r"[.'’]")
+_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
+_STATE_SUFFIX_PATTERN = re.compile(
+    r" (%s)$" % "|".join(sorted(STATE_ABBREVIATIONS, key=len, reverse=True))
+)
+_COUNTRY_SUFFIX_PATTERN = re.compile(r" (%s)$" % "|".join(_COUNTRY_SUFFIXES))
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    latitude: float
+    longitude: float
+    population: int = 0
+
+    @property
+    def label(self) -> str:
+        """Display name in the app's "City, ST" format."""
+        return f"{self.name}, {self.state}" if self.state else self.name
+
+    @property
+    def coordinates(self) -> tuple[float, float]:
+        return (self.latitude, self.longitude)
+
+
+@lru_cache(maxsize=4096)
+def normalize_place_name(name: str) -> str:
+    """
+    Reduce a place name to the form used as an index key.
+
+    Accents, case and punctuation are dropped, trailing country names
+    removed, state names abbreviated and "Saint"/"Mount"/"Fort" shortened,
+    so "St. George, Utah, USA" and "saint george ut" give the same key.
+    """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = _SEPARATOR_PATTERN.sub(" ", _DROP_PATTERN.sub("", text)).strip()
+    text = _COUNTRY_SUFFIX_PATTERN.sub("", text)
+    text = _STATE_SUFFIX_PATTERN.sub(lambda m: " " + STATE_ABBREVIATIONS[m.group(1)], text)
+    return " ".join(_WORD_SYNONYMS.get(word, word) for word in text.split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """In-memory place index; see the module docstring for the lookups it supports."""
+
+    def __init__(self, places: Iterable[Place], aliases: Optional[dict[int, list[str]]] = None):
+        self.places: list[Place] = []
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        # normalized "name st" / "name" / alias -> place index
+        self._exact: dict[str, int] = {}
+        # normalized name (no state) -> place indexes, most populous first
+        self._by_name: dict[str, list[int]] = defaultdict(list)
+
+        for index, place in enumerate(places):
+            self.places.append(place)
+            self.latitudes.append(place.latitude)
+            self.longitudes.append(place.longitude)
+            names = [place.name] + (aliases or {}).get(index, [])
+            for name in names:
+                key = normalize_place_name(name)
+                if key:
+                    self._by_name[key].append(index)
+
+        states = {normalize_place_name(place.state) for place in self.places}
+        for key, indexes in self._by_name.items():
+            indexes.sort(key=lambda i: -self.places[i].population)
+            self._exact.setdefault(key, indexes[0])
+            for index in indexes:
+                state = normalize_place_name(self.places[index].state)
+                if state:
+                    self._exact.setdefault(f"{key} {state}", index)
+        self._states = states - {""}
+
+        self._names = sorted(self._by_name)
+        self._trigram_index: dict[str, list[int]] = defaultdict(list)
+        for position, key in enumerate(self._names):
+            for gram in _trigrams(key):
+                self._trigram_index[gram].append(position)
+
+        self._grid: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for index, place in enumerate(self.places):
+            self._grid[self._cell(place.latitude, place.longitude)].append(index)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Gazetteer':
+        """
+        Load a gazetteer from the bundled CSV format or a GeoNames dump.
+
+        The CSV has columns name, state, latitude, longitude, population and
+        aliases ("|"-separated). Files ending in .txt are read as GeoNames
+        "cities" tables, using the admin1 code as the state.
+        """
+        places = []
+        aliases = {}
+        with open(path, encoding="utf-8", newline="") as f:
+            if path.endswith(".txt"):
+                for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    if len(row) < 15:
+                        continue
+                    if row[2] and row[2] != row[1]:
+                        aliases[len(places)] = [row[2]]
+                    places.append(Place(row[1], row[10], float(row[4]), float(row[5]), int(row[14] or 0)))
+            else:
+                for row in csv.DictReader(f):
+                    if row.get("aliases"):
+                        aliases[len(places)] = row["aliases"].split("|")
+                    places.append(Place(
+                        row["name"],
+                        row.get("state", ""),
+                        float(row["latitude"]),
+                        float(row["longitude"]),
+                        int(row.get("population") or 0)
+                    ))
+        return cls(places, aliases)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _split_state(self, key: str) -> tuple[str, Optional[str]]:
+        name, _, state = key.rpartition(" ")
+        if name and state in self._states:
+            return name, state
+        return key, None
+
+    def lookup(self, query: str, fuzzy: bool = True) -> Optional[Place]:
+        """
+        Find the place a name refers to.
+
+        Exact matches (after normalization) win; a bare name without a state
+        resolves to its most populous place. Otherwise the closest spelling
+        scoring at least FUZZY_CUTOFF is used, restricted to the given state.
+
+        Args:
+            query: Place name, e.g. "Fresno, CA", "LA" or "Sacramneto"
+            fuzzy: Set False to accept exact matches only
+
+        Returns:
+            The matching Place, or None
+        """
+        key = normalize_place_name(query)
+        index = self._exact.get(key)
+        if index is not None:
+            return self.places[index]
+        if not fuzzy or not key:
+            return None
+
+        name, state = self._split_state(key)
+        for _, candidate in self._fuzzy_candidates(name):
+            for index in self._by_name[candidate]:
+                if state is None or normalize_place_name(self.places[index].state) == state:
+                    return self.places[index]
+        return None
+
+    def _fuzzy_candidates(self, name: str) -> list[tuple[float, str]]:
+        """Names similar to name, best first, down to FUZZY_CUTOFF."""
+        shared = Counter()
+        for gram in _trigrams(name):
+            shared.update(self._trigram_index.get(gram, ()))
+        matcher = difflib.SequenceMatcher(b=name)
+        scored = []
+        for position, _ in shared.most_common(FUZZY_CANDIDATES):
+            candidate = self._names[position]
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() >= FUZZY_CUTOFF and matcher.quick_ratio() >= FUZZY_CUTOFF:
+                score = matcher.ratio()
+                if score >= FUZZY_CUTOFF:
+                    scored.append((score, candidate))
+        scored.sort(key=lambda item: -item[0])
+        return scored
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Place]:
+        """
+        Autocomplete a partly typed name.
+
+        Returns:
+            Up to limit places whose name starts with prefix, most populous first
+        """
+        key = normalize_place_name(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._names, key)
+        end = bisect.bisect_left(self._names, key + "\uffff", start)
+        indexes = {index for name in self._names[start:end] for index in self._by_name[name]}
+        ranked = sorted(indexes, key=lambda i: -self.places[i].population)
+        return [self.places[i] for i in ranked[:limit]]
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (math.floor(latitude / GRID_DEGREES), math.floor(longitude / GRID_DEGREES))
+
+    def _neighbour_cells(self, row: int, col: int, max_km: float) -> Iterator[tuple[int, int]]:
+        """Grid cells that can hold a place within max_km of any point in cell (row, col)."""
+        lat_cells = math.ceil(max_km / KM_PER_DEGREE / GRID_DEGREES)
+        cell_lat = max(abs(row), abs(row + 1)) * GRID_DEGREES
+        cos_lat = max(math.cos(math.radians(min(cell_lat + max_km / KM_PER_DEGREE, 89.0))), 0.01)
+        lon_cells = math.ceil(max_km / (KM_PER_DEGREE * cos_lat) / GRID_DEGREES)
+        for r in range(row - lat_cells, row + lat_cells + 1):
+            for c in range(col - lon_cells, col + lon_cells + 1):
+                yield (r, c)
+
+    def reverse(self, latitude: float, longitude: float, max_km: float = 50) -> Optional[Place]:
+        """
+        Find the nearest place to a coordinate.
+
+        Only grid cells that can hold a place within max_km are scanned.
+
+        Returns:
+            The nearest Place within max_km, or None
+        """
+        lat1 = math.radians(latitude)
+        cos_lat1 = math.cos(lat1)
+        best_index, best_km = None, max_km
+        for cell in self._neighbour_cells(*self._cell(latitude, longitude), max_km):
+            for index in self._grid.get(cell, ()):
+                lat2 = math.radians(self.latitudes[index])
+                dlat = lat2 - lat1
+                dlon = math.radians(self.longitudes[index] - longitude)
+                a = math.sin(dlat / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin(dlon / 2) ** 2
+                km = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+                if km <= best_km:
+                    best_index, best_km = index, km
+        return None if best_index is None else self.places[best_index]
+
+    def reverse_batch(self, latitudes, longitudes, max_km: float = 50) -> list[Optional[Place]]:
+        """
+        Find the nearest place for many coordinates at once.
+
+        Points are grouped by grid cell; each group is measured against the
+        places around its cell as one NumPy distance matrix. Without NumPy
+        this falls back to reverse() per point.
+
+        Args:
+            latitudes: Sequence (list, array or ndarray) of latitudes
+            longitudes: Matching sequence of longitudes
+            max_km: Largest distance to accept a place at
+
+        Returns:
+            The nearest Place within max_km for each point, or None
+        """
+        if np is None:
+            return [self.reverse(lat, lon, max_km) for lat, lon in zip(latitudes, longitudes)]
+
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        results: list[Optional[Place]] = [None] * len(lats)
+        if not len(lats) or not self.places:
+            return results
+
+        rows = np.floor(lats / GRID_DEGREES).astype(np.int64)
+        cols = np.floor(lons / GRID_DEGREES).astype(np.int64)
+        cells, inverse = np.unique(np.stack([rows, cols], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+
+        place_lats = np.radians(np.frombuffer(self.latitudes, dtype=float))
+        place_lons = np.radians(np.frombuffer(self.longitudes, dtype=float))
+        point_lats = np.radians(lats)
+        point_lons = np.radians(lons)
+        for (row, col), members in zip(cells.tolist(), groups):
+            candidates = [index for cell in self._neighbour_cells(row, col, max_km) for index in self._grid.get(cell, ())]
+            if not candidates:
+                continue
+            candidates = np.array(candidates)
+            lat1 = point_lats[members][:, None]
+            lat2 = place_lats[candidates][None, :]
+            dlon = place_lons[candidates][None, :] - point_lons[members][:, None]
+            a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+            km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+            nearest = km.argmin(axis=1)
+            nearest_km = km[np.arange(len(members)), nearest]
+            for member, best, best_km in zip(members.tolist(), candidates[nearest].tolist(), nearest_km.tolist()):
+                if best_km <= max_km:
+                    results[member] = self.places[best]
+        return results
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Return the shared gazetteer, loading GAZETTEER_PATH on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.from_file(GAZETTEER_PATH)
+    return _gazetteer
+
+
+def geocode(query: str) -> Optional[tuple[float, float]]:
+    """Coordinates for a place name, or None if the gazetteer has no match."""
+    place = get_gazetteer().lookup(query)
+    return place.coordinates if place else None
+
+
+def reverse_geocode(latitude: float, longitude: float, max_km: float = 50) -> Optional[str]:
+    """"City, ST" label of the nearest place within max_km, or None."""
+    place = get_gazetteer().reverse(latitude, longitude, max_km)
+    return place.label if place else None
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    try:
+        latitude, longitude = (float(arg) for arg in args)
+    except ValueError:
+        place = get_gazetteer().lookup(" ".join(args))
+        print(f"📍 {place.label}: {place.latitude}, {place.longitude}" if place else "❌ Not found")
+        for suggestion in get_gazetteer().complete(" ".join(args), limit=5):
+            print(f"   {suggestion.label}")
+    else:
+        print(f"📍 {reverse_geocode(latitude, longitude) or '❌ No place within 50 km'}")
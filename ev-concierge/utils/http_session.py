@@ -0,0 +1,287 @@
+"""
+Shared HTTP session for outbound API calls.
+
+One module-level requests.Session keeps connections alive across calls
+(bounded pool per host), retries transient failures with exponential
+backoff and full jitter, and enforces a deadline that covers every
+attempt of a request. get_json_async provides the same behavior on an
+httpx.AsyncClient for code running inside an event loop.
+"""
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Any, Iterator, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from utils.config import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_SECONDS, HTTP_DEADLINE_SECONDS
+from utils.json_stream import iter_json_array
+from utils.rate_limiter import INTERACTIVE, RateLimiter
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+CONNECT_TIMEOUT_SECONDS = 3.05
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+# httpx clients are bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_metrics = {"requests": 0, "attempts": 0, "retries": 0, "failures": 0}
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared session, creating it on first use.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _count(metric: str) -> None:
+    with _lock:
+        _metrics[metric] += 1
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the pooled httpx.AsyncClient for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+        client = httpx.AsyncClient(limits=limits)
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the running loop's pooled client (call before the loop shuts down)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _backoff_seconds(attempt: int, response=None) -> float:
+    """Full-jitter exponential backoff, honoring Retry-After when the server sends one."""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+    return random.uniform(0, HTTP_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def _throttle(rate_limiter: Optional[RateLimiter], response, delay: float) -> None:
+    """After a 429, hold every caller sharing the limiter, not just this one."""
+    if rate_limiter is not None and response is not None and response.status_code == 429:
+        rate_limiter.pause(delay)
+
+
+def get_json(
+    url: str,
+    params: Optional[dict] = None,
+    deadline_seconds: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    priority: int = INTERACTIVE
+) -> Any:
+    """
+    GET a URL through the shared session and decode the JSON body.
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        deadline_seconds: Time budget for all attempts, including time queued
+            for the rate limiter (default HTTP_DEADLINE_SECONDS)
+        max_retries: Retries after the first attempt (default HTTP_MAX_RETRIES)
+        rate_limiter: Request budget every attempt must take a token from
+        priority: Queue priority with the rate limiter (INTERACTIVE or BACKGROUND)
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        requests.exceptions.RequestException: If every attempt failed or the
+            deadline ran out
+    """
+    return _get(url, params, deadline_seconds, max_retries, rate_limiter, priority, stream=False).json()
+
+
+def iter_json_array_response(
+    url: str,
+    params: Optional[dict] = None,
+    deadline_seconds: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    priority: int = INTERACTIVE
+) -> Iterator[Any]:
+    """
+    GET a URL whose body is a JSON array and yield its elements as they arrive.
+
+    Retries cover the request up to the response headers; once elements
+    have been yielded the body is not re-requested. Other arguments are as
+    for get_json.
+
+    Raises:
+        requests.exceptions.RequestException: If every attempt failed or the
+            deadline ran out
+        ValueError: If the body is not a JSON array
+    """
+    response = _get(url, params, deadline_seconds, max_retries, rate_limiter, priority, stream=True)
+    with response:
+        yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+
+
+def _get(
+    url: str,
+    params: Optional[dict],
+    deadline_seconds: Optional[float],
+    max_retries: Optional[int],
+    rate_limiter: Optional[RateLimiter],
+    priority: int,
+    stream: bool
+) -> requests.Response:
+    deadline_seconds = HTTP_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    max_retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+    deadline = time.monotonic() + deadline_seconds
+    session = get_session()
+    _count("requests")
+
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _count("failures")
+            raise requests.exceptions.Timeout(f"Deadline of {deadline_seconds}s exceeded for {url}")
+
+        if rate_limiter is not None and not rate_limiter.acquire(priority, timeout=remaining):
+            _count("failures")
+            raise requests.exceptions.Timeout(f"Deadline of {deadline_seconds}s exceeded waiting for rate limit on {url}")
+        remaining = deadline - time.monotonic()
+
+        _count("attempts")
+        response = None
+        try:
+            response = session.get(url, params=params, timeout=(min(CONNECT_TIMEOUT_SECONDS, remaining), remaining), stream=stream)
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+            response.close()
+            error = requests.exceptions.HTTPError(f"{response.status_code} from {url}", response=response)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+        except requests.exceptions.RequestException:
+            _count("failures")
+            raise
+
+        delay = _backoff_seconds(attempt, response)
+        _throttle(rate_limiter, response, delay)
+        if attempt >= max_retries or time.monotonic() + delay >= deadline:
+            _count("failures")
+            raise error
+
+        _count("retries")
+        attempt += 1
+        time.sleep(delay)
+
+
+async def get_json_async(
+    url: str,
+    params: Optional[dict] = None,
+    deadline_seconds: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    priority: int = INTERACTIVE
+) -> Any:
+    """
+    Async counterpart of get_json using the loop's pooled httpx client.
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        httpx.HTTPError: If every attempt failed or the deadline ran out
+    """
+    deadline_seconds = HTTP_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    max_retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    client = get_async_client()
+    _count("requests")
+
+    attempt = 0
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            _count("failures")
+            raise httpx.TimeoutException(f"Deadline of {deadline_seconds}s exceeded for {url}")
+
+        if rate_limiter is not None and not await rate_limiter.acquire_async(priority, timeout=remaining):
+            _count("failures")
+            raise httpx.TimeoutException(f"Deadline of {deadline_seconds}s exceeded waiting for rate limit on {url}")
+        remaining = deadline - loop.time()
+
+        _count("attempts")
+        response = None
+        try:
+            timeout = httpx.Timeout(remaining, connect=min(CONNECT_TIMEOUT_SECONDS, remaining))
+            response = await client.get(url, params=params, timeout=timeout)
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response.json()
+            error = httpx.HTTPStatusError(f"{response.status_code} from {url}", request=response.request, response=response)
+        except httpx.TransportError as e:
+            error = e
+        except httpx.HTTPError:
+            _count("failures")
+            raise
+
+        delay = _backoff_seconds(attempt, response)
+        _throttle(rate_limiter, response, delay)
+        if attempt >= max_retries or loop.time() + delay >= deadline:
+            _count("failures")
+            raise error
+
+        _count("retries")
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def session_stats() -> dict:
+    """
+    Return request counters and connection reuse for the shared session.
+
+    connections_opened counts new TCP/TLS connections; pooled_requests
+    counts requests sent over the pools, so reuse_ratio is the share of
+    requests that skipped connection setup.
+    """
+    opened = 0
+    pooled_requests = 0
+    if _session is not None:
+        adapter = _session.get_adapter("https://")
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                pooled_requests += pool.num_requests
+
+    with _lock:
+        stats = dict(_metrics)
+    stats["connections_opened"] = opened
+    stats["pooled_requests"] = pooled_requests
+    stats["reuse_ratio"] = round(1 - opened / pooled_requests, 3) if pooled_requests else 0.0
+    return stats
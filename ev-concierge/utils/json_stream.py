@@ -0,0 +1,87 @@
+"""
+Incremental decoding of large JSON arrays.
+
+OpenChargeMap responses and data dumps are a single top-level array of
+POIs. iter_json_array yields one element at a time from a stream of text
+or byte chunks, so only the element being decoded is held in memory
+rather than the whole list.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+_WHITESPACE = ' \t\n\r'
+_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(chunks: Iterable[Union[str, bytes]]) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array delivered in arbitrary chunks.
+
+    Args:
+        chunks: Pieces of the document (str, or UTF-8 bytes)
+
+    Yields:
+        Each decoded array element, in order
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    expect_value = True
+
+    def pieces():
+        for chunk in chunks:
+            yield utf8.decode(chunk) if isinstance(chunk, bytes) else chunk, False
+        yield utf8.decode(b'', final=True), True
+
+    for text, eof in pieces():
+        buffer = buffer[position:] + text
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+
+            char = buffer[position]
+            if not started:
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array, found {char!r}")
+                started = True
+                position += 1
+                continue
+            if char == ']':
+                return
+            if not expect_value:
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+                expect_value = True
+                position += 1
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break  # element continues in the next chunk
+            if end == len(buffer) and not eof:
+                break  # a number could still have more digits
+            yield value
+            position = end
+            expect_value = False
+
+    raise ValueError("Unterminated JSON array")
+
+
+def iter_json_file(path: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of the JSON array stored in a file."""
+    with open(path, 'rb') as f:
+        yield from iter_json_array(iter(lambda: f.read(chunk_size), b''))
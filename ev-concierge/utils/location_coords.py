@@ -3,6 +3,17 @@ Location coordinate mappings for cities in the EV Concierge application.
 Maps city names to (latitude, longitude) tuples for OpenChargeMap API queries.
 """
 
+import bisect
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Batched helpers fall back to pure Python
+    np = None
+
+KM_PER_DEGREE = 111
+EARTH_RADIUS_KM = 6371.0088
+
 CITY_COORDINATES = {
     "Los Angeles, CA": (34.0522, -118.2437),
     "San Francisco, CA": (37.7749, -122.4194),
@@ -15,13 +26,21 @@ def get_coordinates(city_name: str) -> tuple[float, float] | None:
     """
     Get coordinates for a city name.
     
+    Names outside CITY_COORDINATES are resolved with the offline gazetteer,
+    which also accepts abbreviations and misspellings ("LA", "Frenso, CA").
+    
     Args:
         city_name: City name (e.g., "Los Angeles, CA")
     
     Returns:
         Tuple of (latitude, longitude) or None if city not found
     """
-    return CITY_COORDINATES.get(city_name)
+    coords = CITY_COORDINATES.get(city_name)
+    if coords is None:
+        # Imported here: the gazetteer itself depends on this module
+        from utils.gazetteer import geocode
+        coords = geocode(city_name)
+    return coords
 
 def calculate_midpoint(coord1: tuple[float, float], coord2: tuple[float, float]) -> tuple[float, float]:
     """
@@ -54,7 +73,6 @@ def calculate_distance_km(coord1: tuple[float, float], coord2: tuple[float, floa
     lat2, lon2 = coord2
     
     # Approximate: 1 degree latitude ≈ 111 km, 1 degree longitude ≈ 111 km * cos(latitude)
-    import math
     avg_lat = (lat1 + lat2) / 2
     lat_diff_km = (lat2 - lat1) * 111
     lon_diff_km = (lon2 - lon1) * 111 * math.cos(math.radians(avg_lat))
@@ -74,8 +92,6 @@ def distance_from_line(point: tuple[float, float], line_start: tuple[float, floa
     Returns:
         Distance in kilometers
     """
-    import math
-    
     # Convert to approximate km coordinates
     lat, lon = point
     lat1, lon1 = line_start
@@ -106,3 +122,257 @@ def distance_from_line(point: tuple[float, float], line_start: tuple[float, floa
     
     # Distance from point to closest point on line
     return math.sqrt((px - closest_x)**2 + (py - closest_y)**2)
+
+def interpolate(coord1: tuple[float, float], coord2: tuple[float, float], fraction: float) -> tuple[float, float]:
+    """
+    Linearly interpolate between two coordinates.
+    
+    Args:
+        coord1: Start coordinate (lat, lon)
+        coord2: End coordinate (lat, lon)
+        fraction: 0.0 returns coord1, 1.0 returns coord2
+    
+    Returns:
+        Interpolated coordinate (lat, lon)
+    """
+    lat1, lon1 = coord1
+    lat2, lon2 = coord2
+    return (lat1 + (lat2 - lat1) * fraction, lon1 + (lon2 - lon1) * fraction)
+
+def route_tiles(route_points: list[tuple[float, float]], tile_km: float = 150, buffer_km: float = 30) -> list[tuple[tuple[float, float], float]]:
+    """
+    Cover a route polyline with a chain of search circles.
+    
+    The polyline is walked by distance and cut into pieces of tile_km (the
+    last one shorter), however many vertices each piece spans. Every piece
+    gets a circle centered on its midpoint along the route, reaching
+    buffer_km past its ends, so a route needs ceil(length / tile_km) circles.
+    
+    Args:
+        route_points: Route polyline as (lat, lon) points, origin first
+        tile_km: Route length covered by one circle
+        buffer_km: Extra radius around each piece of the route
+    
+    Returns:
+        List of (center, radius_km) tuples ordered along the route
+    """
+    if not route_points:
+        return []
+    cumulative = [0.0]
+    for start, end in zip(route_points, route_points[1:]):
+        cumulative.append(cumulative[-1] + calculate_distance_km(start, end))
+    total_km = cumulative[-1]
+    if total_km <= 0:
+        return [(route_points[0], buffer_km)]
+    
+    def point_at(distance_km: float) -> tuple[float, float]:
+        # Last vertex at or before distance_km, then interpolate along its segment
+        index = min(bisect.bisect_right(cumulative, distance_km), len(cumulative) - 1) - 1
+        segment_km = cumulative[index + 1] - cumulative[index]
+        fraction = (distance_km - cumulative[index]) / segment_km if segment_km > 0 else 0.0
+        return interpolate(route_points[index], route_points[index + 1], fraction)
+    
+    tiles = []
+    pieces = max(1, math.ceil(total_km / tile_km - 1e-9))
+    for i in range(pieces):
+        piece_start = i * tile_km
+        piece_end = min((i + 1) * tile_km, total_km)
+        # Every point of the piece is within half its route length of the midpoint
+        tiles.append((point_at((piece_start + piece_end) / 2), (piece_end - piece_start) / 2 + buffer_km))
+    
+    return tiles
+
+def haversine_km(coord1: tuple[float, float], coord2: tuple[float, float]) -> float:
+    """
+    Calculate the great-circle distance between two coordinates in kilometers.
+    
+    Args:
+        coord1: First coordinate (lat, lon)
+        coord2: Second coordinate (lat, lon)
+    
+    Returns:
+        Distance in kilometers
+    """
+    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _initial_bearing(coord1: tuple[float, float], coord2: tuple[float, float]) -> float:
+    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+    y = math.sin(lon2 - lon1) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)
+    return math.atan2(y, x)
+
+def cross_track_km(point: tuple[float, float], line_start: tuple[float, float], line_end: tuple[float, float]) -> float:
+    """
+    Signed distance from a point to the great circle through line_start and line_end.
+    
+    Positive values are to the right of the direction of travel.
+    
+    Args:
+        point: Point coordinates (lat, lon)
+        line_start: Start of line (lat, lon)
+        line_end: End of line (lat, lon)
+    
+    Returns:
+        Distance in kilometers
+    """
+    angular_distance = haversine_km(line_start, point) / EARTH_RADIUS_KM
+    bearing_diff = _initial_bearing(line_start, point) - _initial_bearing(line_start, line_end)
+    return math.asin(math.sin(angular_distance) * math.sin(bearing_diff)) * EARTH_RADIUS_KM
+
+def along_track_km(point: tuple[float, float], line_start: tuple[float, float], line_end: tuple[float, float]) -> float:
+    """
+    Distance from line_start to the point's projection on the great circle toward line_end.
+    
+    Negative when the projection falls behind line_start.
+    
+    Args:
+        point: Point coordinates (lat, lon)
+        line_start: Start of line (lat, lon)
+        line_end: End of line (lat, lon)
+    
+    Returns:
+        Distance in kilometers
+    """
+    angular_distance = haversine_km(line_start, point) / EARTH_RADIUS_KM
+    cross_track = cross_track_km(point, line_start, line_end) / EARTH_RADIUS_KM
+    along = math.acos(max(-1.0, min(1.0, math.cos(angular_distance) / math.cos(cross_track))))
+    bearing_diff = _initial_bearing(line_start, point) - _initial_bearing(line_start, line_end)
+    return math.copysign(along, math.cos(bearing_diff)) * EARTH_RADIUS_KM
+
+def haversine_km_batch(origin: tuple[float, float], lats, lons):
+    """
+    Batched haversine_km from one origin to many points.
+    
+    Args:
+        origin: Origin coordinate (lat, lon)
+        lats: Sequence of point latitudes
+        lons: Sequence of point longitudes
+    
+    Returns:
+        Distances in kilometers (NumPy array, or list without NumPy)
+    """
+    if np is None:
+        return [haversine_km(origin, point) for point in zip(lats, lons)]
+    
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lon2 = np.radians(np.asarray(lons, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+def _unit_vector(coord: tuple[float, float]) -> tuple[float, float, float]:
+    lat, lon = math.radians(coord[0]), math.radians(coord[1])
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+def _segment_frames(route_points: list[tuple[float, float]]) -> list[tuple]:
+    """Precompute (start, end, normal, length_rad, start_km) per great-circle segment."""
+    frames = []
+    route_km = 0.0
+    segments = list(zip(route_points, route_points[1:])) or [(route_points[0], route_points[0])]
+    for start, end in segments:
+        a, b = _unit_vector(start), _unit_vector(end)
+        normal = _cross(a, b)
+        norm = math.sqrt(_dot(normal, normal))
+        length = math.atan2(norm, _dot(a, b))
+        normal = tuple(c / norm for c in normal) if norm > 1e-15 else None
+        frames.append((a, b, normal, length, route_km))
+        route_km += length * EARTH_RADIUS_KM
+    return frames
+
+def great_circle_geometry_batch(lats, lons, route_points: list[tuple[float, float]]):
+    """
+    Batched spherical deviation and along-route distance against a polyline.
+    
+    Each point is projected onto every great-circle segment, falling back
+    to the nearer endpoint when the projection lies outside the segment.
+    
+    Args:
+        lats: Sequence of point latitudes
+        lons: Sequence of point longitudes
+        route_points: Route polyline as (lat, lon) points, origin first
+    
+    Returns:
+        (deviation_km, along_km) - distance to the nearest route segment and
+        route distance from the origin to the closest point on that segment
+        (NumPy arrays, or lists without NumPy)
+    """
+    frames = _segment_frames(route_points)
+    
+    if np is None:
+        return _great_circle_geometry_python(list(lats), list(lons), frames)
+    
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    points = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+    
+    best_deviation = np.full(lat.shape, np.inf)
+    best_along = np.zeros(lat.shape)
+    
+    for a, b, normal, length, start_km in frames:
+        a = np.asarray(a)
+        b = np.asarray(b)
+        to_start = np.arctan2(np.linalg.norm(np.cross(points, a), axis=-1), points @ a)
+        if normal is None:
+            deviation = to_start
+            along = np.zeros(lat.shape)
+        else:
+            normal = np.asarray(normal)
+            sin_cross = points @ normal
+            projected = points - sin_cross[:, None] * normal
+            along = np.arctan2(np.cross(a, projected) @ normal, projected @ a)
+            to_end = np.arctan2(np.linalg.norm(np.cross(points, b), axis=-1), points @ b)
+            deviation = np.where(
+                along < 0, to_start,
+                np.where(along > length, to_end, np.abs(np.arcsin(np.clip(sin_cross, -1.0, 1.0))))
+            )
+            along = np.clip(along, 0.0, length)
+        
+        deviation = deviation * EARTH_RADIUS_KM
+        closer = deviation < best_deviation
+        best_deviation = np.where(closer, deviation, best_deviation)
+        best_along = np.where(closer, start_km + along * EARTH_RADIUS_KM, best_along)
+    
+    return best_deviation, best_along
+
+def _great_circle_geometry_python(lats: list, lons: list, frames: list) -> tuple[list, list]:
+    """Pure-Python version of great_circle_geometry_batch."""
+    deviations = []
+    alongs = []
+    for lat, lon in zip(lats, lons):
+        p = _unit_vector((lat, lon))
+        best_deviation = math.inf
+        best_along = 0.0
+        for a, b, normal, length, start_km in frames:
+            cross_start = _cross(p, a)
+            to_start = math.atan2(math.sqrt(_dot(cross_start, cross_start)), _dot(p, a))
+            if normal is None:
+                deviation, along = to_start, 0.0
+            else:
+                sin_cross = _dot(p, normal)
+                projected = tuple(p[i] - sin_cross * normal[i] for i in range(3))
+                along = math.atan2(_dot(_cross(a, projected), normal), _dot(projected, a))
+                if along < 0:
+                    deviation, along = to_start, 0.0
+                elif along > length:
+                    cross_end = _cross(p, b)
+                    deviation = math.atan2(math.sqrt(_dot(cross_end, cross_end)), _dot(p, b))
+                    along = length
+                else:
+                    deviation = abs(math.asin(max(-1.0, min(1.0, sin_cross))))
+            deviation *= EARTH_RADIUS_KM
+            if deviation < best_deviation:
+                best_deviation = deviation
+                best_along = start_km + along * EARTH_RADIUS_KM
+        deviations.append(best_deviation)
+        alongs.append(best_along)
+    return deviations, alongs
@@ -2,15 +2,68 @@
 OpenChargeMap API client for fetching real charging station data.
 """
 
+import asyncio
+import heapq
+import httpx
+import re
 import requests
 import os
-from typing import Optional
+import sys
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Union
 from dotenv import load_dotenv
-from utils.location_coords import calculate_midpoint, calculate_distance_km, distance_from_line
+from utils.config import (
+    OCM_BACKEND,
+    OCM_CACHE_PATH,
+    OCM_CACHE_TTL_SECONDS,
+    OCM_CACHE_MAX_ENTRIES,
+    OCM_RATE_LIMIT_PER_SECOND,
+    OCM_RATE_LIMIT_BURST,
+)
+from utils.gazetteer import get_gazetteer
+from utils.http_session import get_json_async, iter_json_array_response
+from utils.location_coords import great_circle_geometry_batch, haversine_km_batch, route_tiles
+from utils.rate_limiter import INTERACTIVE, RateLimiter
+from utils.response_cache import ResponseCache
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+from utils.station_store import get_station_store
+from utils.station_table import DEFAULT_PRICE_PER_KWH, MOCK_SLOTS, StationTable
 
 # Load environment variables
 load_dotenv()
 
+OPENCHARGEMAP_POI_URL = "https://api.openchargemap.io/v3/poi/"
+
+_response_cache: Optional[ResponseCache] = None
+_rate_limiter: Optional[RateLimiter] = None
+
+# Corridor fetches in flight, shared by identical concurrent searches
+_route_flights = SingleFlight()
+_route_flights_async = AsyncSingleFlight()
+
+# Stations further than this from the route are dropped. A straight
+# origin-destination line needs room for the road's curvature; a road
+# polyline (more than two points) can be held much tighter.
+STRAIGHT_LINE_DEVIATION_KM = 120
+ROAD_ROUTE_DEVIATION_KM = 40
+
+# Corridor search splits the route into pieces of at most TILE_KM and queries
+# a circle reaching the deviation limit around each piece
+TILE_KM = 150
+
+# maxresults sent for every corridor tile. It does not depend on how many
+# results the caller keeps, so every search of a corridor (search_chargers,
+# the multi-stop planner) shares one fetch and one cache entry per tile.
+CORRIDOR_RESULTS_PER_TILE = 100
+
+# Ranking charges each km off the route twice (out and back) on top of the
+# station's position along the route
+DETOUR_WEIGHT = 2.0
+
+# Stations are labelled with the nearest gazetteer town within this distance;
+# further out they keep the town OpenChargeMap reports
+STATION_LOCATION_MAX_KM = 30
+
 # Network name mapping
 NETWORK_MAPPING = {
     "EVgo Network": "EVgo",
@@ -30,10 +83,36 @@ NETWORK_MAPPING = {
     "Webasto": "Webasto",
 }
 
+# One alternation over every known (lowercased) operator name; a match is
+# resolved by the mapping's own order so a name containing two networks keeps
+# the result of checking NETWORK_MAPPING key by key
+_NETWORK_PRIORITY = {key.lower(): index for index, key in enumerate(NETWORK_MAPPING)}
+_NETWORK_BY_KEY = {key.lower(): value for key, value in NETWORK_MAPPING.items()}
+_NETWORK_PATTERN = re.compile('|'.join(re.escape(key) for key in sorted(_NETWORK_PRIORITY, key=len, reverse=True)))
+
+# Operator inferred from a station title when OperatorInfo is missing,
+# checked in this order. A plain substring test on the lowercased title is
+# faster than a regex for this handful of keywords.
+TITLE_OPERATORS = (
+    (('evgo',), 'EVgo'),
+    (('chargepoint', 'charge point'), 'ChargePoint'),
+    (('electrify america',), 'Electrify America'),
+    (('tesla', 'supercharger'), 'Tesla Supercharger'),
+    (('blink',), 'Blink'),
+)
+
+_PRICE_PATTERN = re.compile(r'\$\s*(\d*\.?\d+)')
+
+_EMPTY: dict = {}
+
+@lru_cache(maxsize=1024)
 def map_operator_to_network(operator_name: Optional[str]) -> str:
     """
     Map OpenChargeMap operator names to standardized network names.
     
+    Results are memoized; a response repeats the same few operators on
+    most of its POIs.
+    
     Args:
         operator_name: Operator name from OpenChargeMap
     
@@ -48,225 +127,795 @@ def map_operator_to_network(operator_name: Optional[str]) -> str:
         return NETWORK_MAPPING[operator_name]
     
     # Check if any known network name is contained in the operator name
-    operator_lower = operator_name.lower()
-    for key, value in NETWORK_MAPPING.items():
-        if key.lower() in operator_lower:
-            return value
+    keys = _NETWORK_PATTERN.findall(operator_name.lower())
+    if keys:
+        return _NETWORK_BY_KEY[min(keys, key=_NETWORK_PRIORITY.__getitem__)]
     
     return operator_name
 
-def parse_openchargemap_response(api_response: list) -> list[dict]:
+def infer_operator_from_title(title: str) -> Optional[str]:
+    """Guess the operator from a station title such as "Tesla Supercharger Fresno"."""
+    title = title.lower()
+    for keywords, operator in TITLE_OPERATORS:
+        for keyword in keywords:
+            if keyword in title:
+                return operator
+    return None
+
+@lru_cache(maxsize=1024)
+def parse_usage_cost(usage_cost: Optional[str]) -> float:
+    """Extract the price from a UsageCost string like "$0.43/kWh", or the default estimate."""
+    match = _PRICE_PATTERN.search(usage_cost) if usage_cost else None
+    return float(match.group(1)) if match else DEFAULT_PRICE_PER_KWH
+
+def parse_openchargemap_response(api_response: Iterable[dict]) -> list[dict]:
     """
     Parse OpenChargeMap API response into internal format.
     
     Args:
-        api_response: Raw JSON response from OpenChargeMap (list of POIs)
+        api_response: Raw POIs from OpenChargeMap (a decoded list, or an
+            iterator such as iter_json_array_response)
     
     Returns:
         List of standardized charging station dictionaries
     """
-    stations = []
+    return list(iter_stations(api_response))
+
+def iter_stations(pois: Iterable[dict]) -> Iterator[dict]:
+    """
+    Parse POIs one at a time, skipping those without coordinates.
     
-    for poi in api_response:
+    Yields:
+        Standardized charging station dictionaries
+    """
+    for poi in pois:
         try:
-            # Extract address info
-            address_info = poi.get('AddressInfo', {})
+            address_info = poi.get('AddressInfo') or _EMPTY
             
-            # Extract operator - try multiple fields
-            operator_info = poi.get('OperatorInfo', {})
-            operator_name = operator_info.get('Title') if operator_info else None
+            # Extract coordinates
+            latitude = address_info.get('Latitude')
+            longitude = address_info.get('Longitude')
             
-            # If no operator, try to infer from title or comments
-            if not operator_name:
-                title = address_info.get('Title', '').lower()
-                if 'evgo' in title:
-                    operator_name = 'EVgo'
-                elif 'chargepoint' in title or 'charge point' in title:
-                    operator_name = 'ChargePoint'
-                elif 'electrify america' in title:
-                    operator_name = 'Electrify America'
-                elif 'tesla' in title or 'supercharger' in title:
-                    operator_name = 'Tesla Supercharger'
-                elif 'blink' in title:
-                    operator_name = 'Blink'
+            if not latitude or not longitude:
+                continue  # Skip stations without coordinates
             
-            network = map_operator_to_network(operator_name)
+            # Extract operator, inferring it from the title if missing
+            title = address_info.get('Title') or ''
+            operator_name = (poi.get('OperatorInfo') or _EMPTY).get('Title')
+            if not operator_name and title:
+                operator_name = infer_operator_from_title(title)
             
             # Extract location
-            title = address_info.get('Title', 'Unknown Location')
-            town = address_info.get('Town', '')
-            state = address_info.get('StateOrProvince', '')
-            location = f"{town}, {state}" if town and state else title
+            town = address_info.get('Town') or ''
+            state = address_info.get('StateOrProvince') or ''
+            location = f"{town}, {state}" if town and state else (title or 'Unknown Location')
             
             # Extract address
-            address_line = address_info.get('AddressLine1', '')
+            address_line = address_info.get('AddressLine1')
             address = f"{address_line}, {town}, {state}" if address_line else location
             
-            # Extract coordinates
-            latitude = address_info.get('Latitude')
-            longitude = address_info.get('Longitude')
-            
-            if not latitude or not longitude:
-                continue  # Skip stations without coordinates
-            
             # Extract power rating (max from all connections)
-            connections = poi.get('Connections', [])
             max_power = 0
-            for conn in connections:
+            for conn in poi.get('Connections') or ():
                 power = conn.get('PowerKW')
                 if power and power > max_power:
                     max_power = power
             
             # Check operational status
-            status_type = poi.get('StatusType', {})
+            status_type = poi.get('StatusType')
             is_operational = status_type.get('IsOperational', True) if status_type else True
             
-            # Extract usage cost (if available)
-            usage_cost = poi.get('UsageCost', '')
-            price_per_kwh = 0.40  # Default estimate
-            if usage_cost and '$' in usage_cost:
-                try:
-                    # Try to extract price from string like "$0.43/kWh"
-                    price_str = usage_cost.split('$')[1].split('/')[0]
-                    price_per_kwh = float(price_str)
-                except:
-                    pass
-            
-            station = {
+            yield {
                 "id": f"OCM-{poi.get('ID', 'unknown')}",
-                "network": network,
+                "network": map_operator_to_network(operator_name),
                 "location": location,
                 "address": address,
                 "latitude": latitude,
                 "longitude": longitude,
                 "power_kw": int(max_power) if max_power > 0 else 50,  # Default to 50kW if unknown
-                "price_per_kwh": price_per_kwh,
+                "price_per_kwh": parse_usage_cost(poi.get('UsageCost')),
                 "available": is_operational,
-                "slots": ["10:00", "10:30", "11:00", "11:30", "12:00"],  # Mock slots
+                "slots": list(MOCK_SLOTS),
                 "amenities": []  # Will be populated in future enhancement
             }
             
-            stations.append(station)
-            
         except Exception as e:
             print(f"Error parsing station: {e}")
             continue
+
+def label_station_locations(stations: StationTable) -> StationTable:
+    """
+    Replace each station's location with the nearest gazetteer town.
     
+    OpenChargeMap's Town field is free text and often missing (the parser
+    then falls back to the station title), so the same town shows up under
+    several spellings. All coordinates are resolved in one batch, giving
+    consistent "City, ST" keys for the amenities step.
+    
+    Returns:
+        The same table, updated in place
+    """
+    places = get_gazetteer().reverse_batch(stations.latitudes, stations.longitudes, STATION_LOCATION_MAX_KM)
+    for row, place in enumerate(places):
+        if place is not None:
+            stations.locations[row] = sys.intern(place.label)
     return stations
 
-def get_chargers_along_route(
+def get_response_cache() -> ResponseCache:
+    """
+    Return the shared OpenChargeMap response cache, opening it on first use.
+    """
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            OCM_CACHE_PATH,
+            ttl_seconds=OCM_CACHE_TTL_SECONDS,
+            max_entries=OCM_CACHE_MAX_ENTRIES
+        )
+    return _response_cache
+
+def get_cache_stats() -> dict:
+    """Return hit/miss counters for the OpenChargeMap response cache."""
+    return get_response_cache().stats()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the request budget shared by every OpenChargeMap caller.
+    
+    Interactive searches pass INTERACTIVE (the default) and the background
+    sync passes BACKGROUND, so live users are served first.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(OCM_RATE_LIMIT_PER_SECOND, OCM_RATE_LIMIT_BURST)
+    return _rate_limiter
+
+def get_rate_limiter_stats() -> dict:
+    """Return queue depth and wait times for the OpenChargeMap request budget."""
+    return get_rate_limiter().stats()
+
+class StationSearchUnavailable(Exception):
+    """Every OpenChargeMap request for a route failed, so no stations are known."""
+
+def _poi_request(
+    api_key: str,
+    midpoint: tuple[float, float],
+    search_radius: float,
+    min_power_kw: int,
+    max_results: int
+) -> tuple[str, dict]:
+    """Build the cache key and API parameters for a POI search around a point."""
+    cache_key = ResponseCache.make_key(
+        "poi",
+        round(midpoint[0], 4),
+        round(midpoint[1], 4),
+        round(search_radius, 1),
+        min_power_kw,
+        max_results
+    )
+    params = {
+        "key": api_key,
+        "latitude": midpoint[0],
+        "longitude": midpoint[1],
+        "distance": search_radius,
+        "distanceunit": "KM",
+        "maxresults": max_results,
+        "minpowerkw": min_power_kw,
+        "compact": "false",  # Get full response with operator info
+        "verbose": "false"
+    }
+    return cache_key, params
+
+def _cached_stations(cache_key: str) -> Optional[StationTable]:
+    cached = get_response_cache().get(cache_key)
+    if cached is None:
+        return None
+    # Entries written before tables were cached as columns are lists of dicts
+    stations = StationTable.from_dicts(cached) if isinstance(cached, list) else StationTable.from_columns(cached)
+    print(f"   Cache hit: {len(stations)} stations")
+    return stations
+
+def _store_stations(cache_key: str, parsed: Iterable[dict]) -> StationTable:
+    stations = label_station_locations(StationTable.from_dicts(parsed))
+    print(f"   Found {len(stations)} stations from API")
+    get_response_cache().set(cache_key, stations.to_columns())
+    return stations
+
+def fetch_stations(
+    api_key: str,
+    midpoint: tuple[float, float],
+    search_radius: float,
+    min_power_kw: int,
+    max_results: int,
+    priority: int = INTERACTIVE
+) -> StationTable:
+    """
+    Fetch and parse stations around a point, serving repeats from the cache.
+    
+    Args:
+        api_key: OpenChargeMap API key
+        midpoint: (latitude, longitude) of the search center
+        search_radius: Search radius in kilometers
+        min_power_kw: Minimum power rating filter
+        max_results: Value sent as the API's maxresults parameter
+        priority: Queue priority for the shared rate limiter
+    
+    Returns:
+        Table of parsed charging stations
+    
+    Raises:
+        requests.exceptions.RequestException: If the API request fails
+        ValueError: If the response body is not a complete JSON array
+    """
+    cache_key, params = _poi_request(api_key, midpoint, search_radius, min_power_kw, max_results)
+    
+    cached = _cached_stations(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Parse POIs as they arrive instead of decoding the whole body first
+    pois = iter_json_array_response(
+        OPENCHARGEMAP_POI_URL,
+        params=params,
+        rate_limiter=get_rate_limiter(),
+        priority=priority
+    )
+    return _store_stations(cache_key, iter_stations(pois))
+
+async def fetch_stations_async(
+    api_key: str,
+    midpoint: tuple[float, float],
+    search_radius: float,
+    min_power_kw: int,
+    max_results: int,
+    priority: int = INTERACTIVE
+) -> StationTable:
+    """
+    Async version of fetch_stations, sharing its cache and rate limiter.
+    
+    Raises:
+        httpx.HTTPError: If the API request fails
+        ValueError: If the response body is not valid JSON
+    """
+    cache_key, params = _poi_request(api_key, midpoint, search_radius, min_power_kw, max_results)
+    
+    cached = _cached_stations(cache_key)
+    if cached is not None:
+        return cached
+    
+    data = await get_json_async(
+        OPENCHARGEMAP_POI_URL,
+        params=params,
+        rate_limiter=get_rate_limiter(),
+        priority=priority
+    )
+    return _store_stations(cache_key, iter_stations(data))
+
+def route_deviation_limit_km(route_points: list[tuple[float, float]]) -> float:
+    """Return how far off the route a station may be for this kind of route."""
+    return ROAD_ROUTE_DEVIATION_KM if len(route_points) > 2 else STRAIGHT_LINE_DEVIATION_KM
+
+def fetch_route_stations(
     origin_coords: tuple[float, float],
     destination_coords: tuple[float, float],
     min_power_kw: int = 50,
-    max_results: int = 10,
     distance_km: int = 50,
-    current_range_miles: int = 300
-) -> list[dict]:
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> StationTable:
     """
-    Query OpenChargeMap for charging stations along a route.
+    Fetch and parse every candidate station for a route, without filtering.
+    
+    The route is covered by a chain of small search circles (see
+    route_tiles), each fetched separately and merged by station ID, so long
+    trips are not truncated by a single maxresults limit.
+    
+    The result can be passed to filter_stations_along_route any number of
+    times, e.g. once per battery range, without repeating the API request.
     
     Args:
         origin_coords: (latitude, longitude) of starting point
         destination_coords: (latitude, longitude) of destination
         min_power_kw: Minimum power rating filter
-        max_results: Maximum number of results to return
-        distance_km: Search radius from route midpoint in kilometers
-        current_range_miles: Current vehicle range in miles (for reachability filter)
+        distance_km: Minimum search radius per tile in kilometers
+        route_points: Optional route polyline (defaults to the straight line
+            from origin to destination)
     
     Returns:
-        List of charging station dictionaries (only reachable stations)
+        Table of parsed charging stations (empty on error)
+    
+    Raises:
+        StationSearchUnavailable: If every API request failed, so an empty
+            result would wrongly suggest there are no stations
     """
+    route_points = route_points or [origin_coords, destination_coords]
+    max_deviation_km = route_deviation_limit_km(route_points)
+    
+    if OCM_BACKEND == 'store':
+        stations = label_station_locations(StationTable.from_dicts(get_station_store().query_polyline(
+            route_points,
+            max_deviation_km=max_deviation_km,
+            min_power_kw=min_power_kw
+        )))
+        print(f"📦 Found {len(stations)} stations in local station store")
+        return stations
+    
     api_key = os.getenv('OPENCHARGEMAP_API_KEY', '')
     
     if not api_key:
         print("⚠️  OpenChargeMap API key not found. Falling back to mock data.")
-        return []
-    
-    # Calculate midpoint and search radius
-    midpoint = calculate_midpoint(origin_coords, destination_coords)
-    route_distance = calculate_distance_km(origin_coords, destination_coords)
+        return StationTable()
     
-    # Use route distance / 2 + buffer as search radius
-    search_radius = max(distance_km, route_distance / 2 + 30)
-    
-    # Build API request
-    base_url = "https://api.openchargemap.io/v3/poi/"
-    params = {
-        "key": api_key,
-        "latitude": midpoint[0],
-        "longitude": midpoint[1],
-        "distance": search_radius,
-        "distanceunit": "KM",
-        "maxresults": max_results * 2,  # Get more results to filter
-        "minpowerkw": min_power_kw,
-        "compact": "false",  # Get full response with operator info
-        "verbose": "false"
-    }
+    tiles = route_tiles(route_points, tile_km=TILE_KM, buffer_km=max_deviation_km)
     
     try:
         print(f"🔍 Querying OpenChargeMap API...")
-        print(f"   Midpoint: {midpoint}")
-        print(f"   Search radius: {search_radius:.1f} km")
+        print(f"   Corridor tiles: {len(tiles)}")
         print(f"   Min power: {min_power_kw} kW")
         
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        print(f"   Found {len(data)} stations from API")
+        stations = StationTable()
+        failed_tiles = 0
+        for center, radius in tiles:
+            try:
+                tile_stations = fetch_stations(api_key, center, max(distance_km, radius), min_power_kw, CORRIDOR_RESULTS_PER_TILE)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # ValueError: the body was cut off or is not a JSON array
+                print(f"❌ Error querying OpenChargeMap API: {e}")
+                failed_tiles += 1
+                continue
+            stations.extend(tile_stations)
         
-        # Parse response
-        stations = parse_openchargemap_response(data)
+        if failed_tiles:
+            print(f"   ⚠️  {failed_tiles} of {len(tiles)} tiles failed")
+            if failed_tiles == len(tiles):
+                raise StationSearchUnavailable(f"All {len(tiles)} OpenChargeMap requests failed")
+        print(f"   Unique stations in corridor: {len(stations)}")
+        return stations
         
-        # Convert current range to km (with 20% safety buffer)
-        current_range_km = (current_range_miles * 1.60934) * 0.8  # 80% of range for safety
-        
-        # Filter stations by:
-        # 1. Distance from route line (not too far off route)
-        # 2. Reachability (within current battery range from origin)
-        max_deviation_km = 150  # 150km from the route line (allows for reasonable detours)
-        
-        filtered_stations = []
-        reachable_count = 0
-        on_route_count = 0
-        
-        for station in stations:
-            station_coords = (station['latitude'], station['longitude'])
-            
-            # Check if station is on the route
-            deviation = distance_from_line(station_coords, origin_coords, destination_coords)
-            
-            # Check if station is reachable with current battery
-            distance_from_origin = calculate_distance_km(origin_coords, station_coords)
-            
-            if deviation <= max_deviation_km:
-                on_route_count += 1
-            
-            if distance_from_origin <= current_range_km:
-                reachable_count += 1
-            
-            if deviation <= max_deviation_km and distance_from_origin <= current_range_km:
-                station['_distance_from_origin'] = distance_from_origin
-                station['_deviation_from_route'] = deviation
-                filtered_stations.append(station)
-        
-        print(f"   Stations on route (within {max_deviation_km}km): {on_route_count}")
-        print(f"   Stations reachable (within {current_range_km:.0f}km): {reachable_count}")
-        print(f"   Stations matching both criteria: {len(filtered_stations)}")
+    except StationSearchUnavailable:
+        raise
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return StationTable()
+
+async def fetch_route_stations_async(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    min_power_kw: int = 50,
+    distance_km: int = 50,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> StationTable:
+    """
+    Async version of fetch_route_stations.
+    
+    All corridor tiles are requested concurrently over the event loop's
+    pooled client, so a long route costs roughly one round trip instead
+    of one per tile. A store query runs in a worker thread.
+    
+    Returns:
+        Table of parsed charging stations (empty on error)
+    
+    Raises:
+        StationSearchUnavailable: If every API request failed, so an empty
+            result would wrongly suggest there are no stations
+    """
+    route_points = route_points or [origin_coords, destination_coords]
+    max_deviation_km = route_deviation_limit_km(route_points)
+    
+    if OCM_BACKEND == 'store':
+        stations = label_station_locations(StationTable.from_dicts(await asyncio.to_thread(
+            get_station_store().query_polyline,
+            route_points,
+            max_deviation_km=max_deviation_km,
+            min_power_kw=min_power_kw
+        )))
+        print(f"📦 Found {len(stations)} stations in local station store")
+        return stations
+    
+    api_key = os.getenv('OPENCHARGEMAP_API_KEY', '')
+    
+    if not api_key:
+        print("⚠️  OpenChargeMap API key not found. Falling back to mock data.")
+        return StationTable()
+    
+    tiles = route_tiles(route_points, tile_km=TILE_KM, buffer_km=max_deviation_km)
+    
+    try:
+        print(f"🔍 Querying OpenChargeMap API (async)...")
+        print(f"   Corridor tiles: {len(tiles)}")
+        print(f"   Min power: {min_power_kw} kW")
         
-        # Sort by distance from origin (order along the route)
-        filtered_stations.sort(key=lambda s: s['_distance_from_origin'])
+        results = await asyncio.gather(
+            *(
+                fetch_stations_async(api_key, center, max(distance_km, radius), min_power_kw, CORRIDOR_RESULTS_PER_TILE)
+                for center, radius in tiles
+            ),
+            return_exceptions=True
+        )
         
-        # Remove temporary fields and limit results
-        for station in filtered_stations:
-            station.pop('_distance_from_origin', None)
-            station.pop('_deviation_from_route', None)
+        stations = StationTable()
+        failed_tiles = 0
+        for tile_stations in results:
+            if isinstance(tile_stations, (httpx.HTTPError, ValueError)):
+                print(f"❌ Error querying OpenChargeMap API: {tile_stations}")
+                failed_tiles += 1
+                continue
+            if isinstance(tile_stations, BaseException):
+                raise tile_stations
+            stations.extend(tile_stations)
         
-        return filtered_stations[:max_results]
+        if failed_tiles:
+            print(f"   ⚠️  {failed_tiles} of {len(tiles)} tiles failed")
+            if failed_tiles == len(tiles):
+                raise StationSearchUnavailable(f"All {len(tiles)} OpenChargeMap requests failed")
+        print(f"   Unique stations in corridor: {len(stations)}")
+        return stations
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error querying OpenChargeMap API: {e}")
-        return []
+    except StationSearchUnavailable:
+        raise
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
+        return StationTable()
+
+def measure_stations(
+    stations: StationTable,
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[tuple[float, float, float, int]]:
+    """
+    Compute route geometry for each station once.
+    
+    Args:
+        stations: Parsed stations from fetch_route_stations
+        origin_coords: (latitude, longitude) of starting point
+        destination_coords: (latitude, longitude) of destination
+        route_points: Optional route polyline (defaults to the straight line)
+    
+    Returns:
+        List of (distance_from_origin_km, deviation_from_route_km,
+        along_route_km, row) tuples, row indexing into stations
+    """
+    route_points = route_points or [origin_coords, destination_coords]
+    
+    if not stations:
         return []
+    
+    # The coordinate columns are typed arrays, read by the kernels without copying
+    lats = stations.latitudes
+    lons = stations.longitudes
+    
+    # Great-circle distance from the route (not too far off route) and
+    # position along it (ranking)
+    deviations, alongs = great_circle_geometry_batch(lats, lons, route_points)
+    
+    # Great-circle distance from origin (reachability with current battery)
+    distances = haversine_km_batch(origin_coords, lats, lons)
+    
+    return [
+        (float(distance), float(deviation), float(along), row)
+        for row, (distance, deviation, along) in enumerate(zip(distances, deviations, alongs))
+    ]
+
+def rank_stations_along_route(matches: list[tuple[float, float, int]], max_results: int) -> list[int]:
+    """
+    Pick the best stations in route order.
+    
+    Each station is scored by its detour-adjusted route position
+    (along_route_km + DETOUR_WEIGHT * deviation_km), so a station beside
+    the road is not ranked behind one further back that happens to be
+    closer to the origin in a straight line. Only the top max_results are
+    kept, using a bounded heap instead of sorting every match; those are
+    then put back in route order.
+    
+    Args:
+        matches: (deviation_km, along_route_km, row) tuples
+        max_results: Maximum number of stations to return
+    
+    Returns:
+        Rows of the selected stations, ordered along the route
+    """
+    best = heapq.nsmallest(
+        max_results,
+        matches,
+        key=lambda match: match[1] + DETOUR_WEIGHT * match[0]
+    )
+    best.sort(key=lambda match: match[1])
+    return [row for _, _, row in best]
+
+def select_reachable_stations(
+    stations: StationTable,
+    measured: list[tuple[float, float, float, int]],
+    current_range_miles: int = 300,
+    max_results: int = 10,
+    max_deviation_km: float = STRAIGHT_LINE_DEVIATION_KM
+) -> StationTable:
+    """
+    Keep measured stations that are near the route and within range.
+    
+    Args:
+        stations: The table that was measured
+        measured: Output of measure_stations
+        current_range_miles: Current vehicle range in miles (for reachability filter)
+        max_results: Maximum number of results to return
+        max_deviation_km: Maximum distance from the route (see route_deviation_limit_km)
+    
+    Returns:
+        New table of the reachable stations, ordered along the route
+    """
+    # Convert current range to km (with 20% safety buffer)
+    current_range_km = (current_range_miles * 1.60934) * 0.8  # 80% of range for safety
+    
+    matches = []
+    reachable_count = 0
+    on_route_count = 0
+    
+    for distance_from_origin, deviation, along, row in measured:
+        if deviation <= max_deviation_km:
+            on_route_count += 1
+        
+        if distance_from_origin <= current_range_km:
+            reachable_count += 1
+        
+        if deviation <= max_deviation_km and distance_from_origin <= current_range_km:
+            matches.append((deviation, along, row))
+    
+    print(f"   Stations on route (within {max_deviation_km}km): {on_route_count}")
+    print(f"   Stations reachable (within {current_range_km:.0f}km): {reachable_count}")
+    print(f"   Stations matching both criteria: {len(matches)}")
+    
+    return stations.take(rank_stations_along_route(matches, max_results))
+
+def filter_stations_along_route(
+    stations: Union[StationTable, list[dict]],
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    current_range_miles: int = 300,
+    max_results: int = 10,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[dict]:
+    """
+    Keep stations that are near the route and reachable with the current range.
+    
+    The input is not modified, so the same fetched stations can be
+    filtered repeatedly.
+    
+    Args:
+        stations: Parsed stations (a StationTable or station dictionaries)
+        origin_coords: (latitude, longitude) of starting point
+        destination_coords: (latitude, longitude) of destination
+        current_range_miles: Current vehicle range in miles (for reachability filter)
+        max_results: Maximum number of results to return
+        route_points: Optional route polyline (defaults to the straight line)
+    
+    Returns:
+        Reachable station dictionaries ordered along the route
+    """
+    if not isinstance(stations, StationTable):
+        stations = StationTable.from_dicts(stations)
+    measured = measure_stations(stations, origin_coords, destination_coords, route_points)
+    max_deviation_km = route_deviation_limit_km(route_points or [origin_coords, destination_coords])
+    return select_reachable_stations(stations, measured, current_range_miles, max_results, max_deviation_km).to_dicts()
+
+def _route_key(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    min_power_kw: int,
+    distance_km: int,
+    route_points: Optional[list[tuple[float, float]]]
+) -> str:
+    """
+    Identify a corridor fetch; searches with equal keys fetch the same stations.
+    
+    How many results a caller keeps is not part of the key: every fetch
+    requests CORRIDOR_RESULTS_PER_TILE and callers truncate afterwards.
+    """
+    points = route_points or [origin_coords, destination_coords]
+    return ResponseCache.make_key(
+        "route",
+        OCM_BACKEND,
+        [[round(lat, 4), round(lon, 4)] for lat, lon in points],
+        min_power_kw,
+        distance_km
+    )
+
+def get_coalescing_stats() -> dict:
+    """Return how many corridor fetches ran and how many searches joined one in flight."""
+    return {"sync": _route_flights.stats(), "async": _route_flights_async.stats()}
+
+def get_chargers_for_ranges(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    ranges_miles: list[int],
+    min_power_kw: int = 50,
+    max_results: int = 10,
+    distance_km: int = 50,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[StationTable]:
+    """
+    Query OpenChargeMap once and filter the result for several vehicle ranges.
+    
+    Route geometry is computed once per station; only the range check is
+    repeated for each entry in ranges_miles. Identical corridor searches
+    running at the same time (in other threads) wait for the first one's
+    fetch instead of querying OpenChargeMap again.
+    
+    Args:
+        origin_coords: (latitude, longitude) of starting point
+        destination_coords: (latitude, longitude) of destination
+        ranges_miles: Vehicle ranges in miles, e.g. [current_range, full_range]
+        min_power_kw: Minimum power rating filter
+        max_results: Maximum number of results per range
+        distance_km: Minimum search radius per tile in kilometers
+        route_points: Optional route polyline (defaults to the straight line)
+    
+    Returns:
+        One table of reachable stations per entry in ranges_miles (convert
+        with StationTable.to_dicts when building a tool result)
+    """
+    # Concurrent searches of the same corridor share one fetch
+    stations = _route_flights.do(
+        _route_key(origin_coords, destination_coords, min_power_kw, distance_km, route_points),
+        fetch_route_stations,
+        origin_coords,
+        destination_coords,
+        min_power_kw=min_power_kw,
+        distance_km=distance_km,
+        route_points=route_points
+    )
+    
+    return _select_for_ranges(stations, origin_coords, destination_coords, ranges_miles, max_results, route_points)
+
+async def get_chargers_for_ranges_async(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    ranges_miles: list[int],
+    min_power_kw: int = 50,
+    max_results: int = 10,
+    distance_km: int = 50,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[StationTable]:
+    """
+    Async version of get_chargers_for_ranges for use inside an event loop.
+    Identical searches awaiting at the same time share one corridor fetch.
+    
+    Returns:
+        One table of reachable stations per entry in ranges_miles
+    """
+    stations = await _route_flights_async.do(
+        _route_key(origin_coords, destination_coords, min_power_kw, distance_km, route_points),
+        fetch_route_stations_async,
+        origin_coords,
+        destination_coords,
+        min_power_kw=min_power_kw,
+        distance_km=distance_km,
+        route_points=route_points
+    )
+    return _select_for_ranges(stations, origin_coords, destination_coords, ranges_miles, max_results, route_points)
+
+def _select_for_ranges(
+    stations: StationTable,
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    ranges_miles: list[int],
+    max_results: int,
+    route_points: Optional[list[tuple[float, float]]]
+) -> list[StationTable]:
+    measured = measure_stations(stations, origin_coords, destination_coords, route_points)
+    max_deviation_km = route_deviation_limit_km(route_points or [origin_coords, destination_coords])
+    
+    return [
+        select_reachable_stations(
+            stations,
+            measured,
+            current_range_miles=range_miles,
+            max_results=max_results,
+            max_deviation_km=max_deviation_km
+        )
+        for range_miles in ranges_miles
+    ]
+
+def get_corridor_stations(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    min_power_kw: int = 50,
+    distance_km: int = 50,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> tuple[StationTable, list[tuple[float, float]]]:
+    """
+    Every station near the route, whatever the current range.
+    
+    Uses the same (coalesced, cached) corridor fetch as
+    get_chargers_for_ranges, for callers that plan more than one stop.
+    
+    Args:
+        origin_coords: (latitude, longitude) of starting point
+        destination_coords: (latitude, longitude) of destination
+        min_power_kw: Minimum power rating filter
+        distance_km: Minimum search radius per tile in kilometers
+        route_points: Optional route polyline (defaults to the straight line)
+    
+    Returns:
+        (stations, geometry): the stations within the route's deviation
+        limit, ordered along the route, and a (deviation_km,
+        along_route_km) pair for each
+    """
+    stations = _route_flights.do(
+        _route_key(origin_coords, destination_coords, min_power_kw, distance_km, route_points),
+        fetch_route_stations,
+        origin_coords,
+        destination_coords,
+        min_power_kw=min_power_kw,
+        distance_km=distance_km,
+        route_points=route_points
+    )
+    
+    measured = measure_stations(stations, origin_coords, destination_coords, route_points)
+    max_deviation_km = route_deviation_limit_km(route_points or [origin_coords, destination_coords])
+    on_route = sorted(
+        (along, deviation, row) for _, deviation, along, row in measured if deviation <= max_deviation_km
+    )
+    return (
+        stations.take(row for _, _, row in on_route),
+        [(deviation, along) for along, deviation, _ in on_route]
+    )
+
+def get_chargers_along_route(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    min_power_kw: int = 50,
+    max_results: int = 10,
+    distance_km: int = 50,
+    current_range_miles: int = 300,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[dict]:
+    """
+    Query OpenChargeMap for charging stations along a route.
+    
+    Args:
+        origin_coords: (latitude, longitude) of starting point
+        destination_coords: (latitude, longitude) of destination
+        min_power_kw: Minimum power rating filter
+        max_results: Maximum number of results to return
+        distance_km: Minimum search radius per tile in kilometers
+        current_range_miles: Current vehicle range in miles (for reachability filter)
+        route_points: Optional route polyline (defaults to the straight line)
+    
+    Returns:
+        List of charging station dictionaries (only reachable stations)
+    """
+    return get_chargers_for_ranges(
+        origin_coords,
+        destination_coords,
+        [current_range_miles],
+        min_power_kw=min_power_kw,
+        max_results=max_results,
+        distance_km=distance_km,
+        route_points=route_points
+    )[0].to_dicts()
+
+async def get_chargers_along_route_async(
+    origin_coords: tuple[float, float],
+    destination_coords: tuple[float, float],
+    min_power_kw: int = 50,
+    max_results: int = 10,
+    distance_km: int = 50,
+    current_range_miles: int = 300,
+    route_points: Optional[list[tuple[float, float]]] = None
+) -> list[dict]:
+    """
+    Async version of get_chargers_along_route; tiles are fetched concurrently
+    without blocking the event loop.
+    
+    Returns:
+        List of charging station dictionaries (only reachable stations)
+    """
+    results = await get_chargers_for_ranges_async(
+        origin_coords,
+        destination_coords,
+        [current_range_miles],
+        min_power_kw=min_power_kw,
+        max_results=max_results,
+        distance_km=distance_km,
+        route_points=route_points
+    )
+    return results[0].to_dicts()
@@ -0,0 +1,236 @@
+"""
+Token-bucket rate limiter with a priority queue.
+
+Every request takes one token; tokens refill at a fixed rate up to a burst
+size. When the bucket is empty callers queue, and tokens go to the
+highest-priority waiter first (interactive trip planning before background
+sync), in arrival order within a priority. Threads and coroutines share the
+same bucket and queue.
+
+There is no background thread: each waiter wakes when the next token is
+due and hands out whatever tokens have accrued to the head of the queue.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Recent waits kept per priority for percentile reporting
+WAIT_SAMPLES = 1000
+
+
+class _Waiter:
+    __slots__ = ('priority', 'sequence', 'granted', 'cancelled', 'wake')
+
+    def __init__(self, priority: int, sequence: int, wake):
+        self.priority = priority
+        self.sequence = sequence
+        self.granted = False
+        self.cancelled = False
+        self.wake = wake
+
+    def __lt__(self, other: '_Waiter') -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class RateLimiter:
+    """
+    Shared request budget of rate_per_second with bursts of up to burst.
+
+    A rate of zero or less disables limiting: acquire returns immediately.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._granted = {priority: 0 for priority in PRIORITY_NAMES}
+        self._timeouts = {priority: 0 for priority in PRIORITY_NAMES}
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_second > 0
+
+    def _refill(self, now: float) -> None:
+        if now < self._paused_until:
+            # Nothing accrues while paused
+            self._updated = now
+            return
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def _dispatch(self) -> float:
+        """
+        Grant accrued tokens to waiters in priority order (lock held).
+
+        Returns:
+            Seconds until the next token is due
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        while self._queue and self._tokens >= 1:
+            waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._tokens -= 1
+            waiter.granted = True
+            waiter.wake()
+        return max((1 - self._tokens) / self.rate_per_second, 0.001)
+
+    def _try_immediate(self, priority: int) -> bool:
+        """Take a token without queueing if nobody is ahead (lock held)."""
+        now = time.monotonic()
+        self._refill(now)
+        if self._queue or now < self._paused_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._record(priority, 0.0)
+        return True
+
+    def _enqueue(self, priority: int, wake) -> _Waiter:
+        waiter = _Waiter(priority, next(self._sequence), wake)
+        heapq.heappush(self._queue, waiter)
+        return waiter
+
+    def _record(self, priority: int, waited: float) -> None:
+        self._granted[priority] += 1
+        self._waits[priority].append(waited)
+
+    def _give_up(self, waiter: _Waiter) -> None:
+        # Lazily removed from the heap by _dispatch
+        waiter.cancelled = True
+        self._timeouts[waiter.priority] += 1
+
+    def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a token.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND
+            timeout: Longest time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            True once a token was taken, False if the timeout ran out first
+        """
+        if not self.enabled:
+            return True
+
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        event = threading.Event()
+        with self._lock:
+            if self._try_immediate(priority):
+                return True
+            waiter = self._enqueue(priority, event.set)
+
+        while True:
+            with self._lock:
+                delay = self._dispatch()
+                if waiter.granted:
+                    self._record(priority, time.monotonic() - started)
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._give_up(waiter)
+                    return False
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+            event.wait(max(delay, 0))
+
+    async def acquire_async(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """Async version of acquire; waits without blocking the event loop."""
+        if not self.enabled:
+            return True
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        granted = asyncio.Event()
+        with self._lock:
+            if self._try_immediate(priority):
+                return True
+            waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(granted.set))
+
+        try:
+            while True:
+                with self._lock:
+                    delay = self._dispatch()
+                    if waiter.granted:
+                        self._record(priority, time.monotonic() - started)
+                        return True
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._give_up(waiter)
+                        return False
+                if deadline is not None:
+                    delay = min(delay, deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(granted.wait(), max(delay, 0))
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # Hand the token back for the next waiter
+                    self._tokens += 1
+                else:
+                    waiter.cancelled = True
+            raise
+
+    def pause(self, seconds: float) -> None:
+        """Hold every waiter for seconds, e.g. after the provider answered 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> dict:
+        """
+        Return queue depth and wait times per priority.
+
+        Wait percentiles cover the last WAIT_SAMPLES grants of each priority.
+        """
+        with self._lock:
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for waiter in self._queue:
+                if not waiter.cancelled and not waiter.granted:
+                    depth[PRIORITY_NAMES[waiter.priority]] += 1
+            priorities = {}
+            for priority, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[priority])
+                priorities[name] = {
+                    "granted": self._granted[priority],
+                    "timeouts": self._timeouts[priority],
+                    "queue_depth": depth[name],
+                    "wait_p50_ms": round(_percentile(waits, 0.50) * 1000, 1),
+                    "wait_p99_ms": round(_percentile(waits, 0.99) * 1000, 1),
+                    "wait_max_ms": round((waits[-1] if waits else 0.0) * 1000, 1),
+                }
+            return {
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queue_depth": sum(depth.values()),
+                **priorities,
+            }
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
@@ -0,0 +1,154 @@
+"""
+Persistent TTL/LRU cache for OpenChargeMap query results.
+
+Entries are kept in a small in-memory LRU front and written through to a
+SQLite file, so repeated corridor queries survive process restarts.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """
+    Key/value cache with time-to-live expiry and a bounded number of entries.
+
+    Values must be JSON serializable. When ``path`` is empty the cache is
+    memory-only.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 6 * 3600, max_entries: int = 2000):
+        self.path = path or None
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Memory hits since the last write, flushed to disk so its LRU order stays in sync
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a stable string key from JSON-serializable parts."""
+        return json.dumps(parts, separators=(',', ':'))
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a cached value.
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    if self._conn is not None:
+                        self._touched[key] = now
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    created_at = row[1]
+                    if not self._expired(created_at, now):
+                        value = json.loads(row[0])
+                        self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, created_at, value)
+                        self.hits += 1
+                        return value
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+
+            if self._conn is not None:
+                if self._touched:
+                    self._conn.executemany(
+                        "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                        [(accessed_at, touched_key) for touched_key, accessed_at in self._touched.items()]
+                    )
+                    self._touched.clear()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now)
+                )
+                self._conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,))
+                cursor = self._conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+                self._conn.commit()
+
+    def _remember(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            if self._conn is None:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            size = len(self._memory)
+            if self._conn is not None:
+                size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "entries": size,
+            }
@@ -0,0 +1,285 @@
+"""
+Offline road routing over a compact highway graph.
+
+The graph (data/road_network.csv) links gazetteer towns along the western
+US interstates and main highways; each row is one road segment with its
+highway name and typical speed. Segment lengths are the great-circle
+distance times ROAD_CURVATURE. Shortest paths use A* with a great-circle
+lower bound; a query spanning the whole graph takes about a millisecond,
+so there is no need for contraction hierarchies.
+
+Routes start and end at arbitrary coordinates: each end is snapped to the
+nearest graph node (within SNAP_MAX_KM) and the access leg is added at
+ACCESS_SPEED_KMH.
+
+Usage:
+    python -m utils.routing "Los Angeles, CA" "San Francisco, CA"
+"""
+
+import csv
+import heapq
+import math
+import sys
+import threading
+from array import array
+from typing import NamedTuple, Optional
+
+from utils.config import ROAD_NETWORK_PATH
+from utils.gazetteer import get_gazetteer
+from utils.location_coords import EARTH_RADIUS_KM, get_coordinates, haversine_km_batch
+
+# Road length per km of great-circle distance between neighbouring nodes
+ROAD_CURVATURE = 1.08
+
+# Furthest an origin or destination may be from the graph
+SNAP_MAX_KM = 80
+
+# Speed assumed between a snapped point and its graph node
+ACCESS_SPEED_KMH = 60
+
+KM_PER_MILE = 1.609344
+
+DISTANCE = "distance"
+DURATION = "duration"
+
+
+class Route(NamedTuple):
+    distance_km: float
+    duration_min: float
+    # Polyline from origin to destination as (lat, lon) points
+    points: list[tuple[float, float]]
+    # Graph nodes passed through, as "City, ST" labels
+    places: list[str]
+    # Highways in driving order, consecutive repeats merged
+    highways: list[str]
+
+    @property
+    def distance_miles(self) -> float:
+        return self.distance_km / KM_PER_MILE
+
+    @property
+    def duration_hours(self) -> float:
+        return self.duration_min / 60
+
+
+def _great_circle_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance between points given in radians."""
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+class RoadNetwork:
+    """Road graph with A* shortest paths between nodes or arbitrary coordinates."""
+
+    def __init__(self, labels: list[str], coordinates: list[tuple[float, float]], segments: list[tuple[int, int, str, float]]):
+        """
+        Args:
+            labels: Node names ("City, ST")
+            coordinates: (lat, lon) of each node
+            segments: (node, node, highway, speed_kmh) for each two-way road segment
+        """
+        self.labels = labels
+        self.latitudes = array('d', (lat for lat, _ in coordinates))
+        self.longitudes = array('d', (lon for _, lon in coordinates))
+        self._lat_rad = [math.radians(lat) for lat in self.latitudes]
+        self._lon_rad = [math.radians(lon) for lon in self.longitudes]
+        self._nodes = {label: node for node, label in enumerate(labels)}
+        self._coordinates = {coords: node for node, coords in enumerate(coordinates)}
+        # node -> [(neighbour, km, minutes, highway)]
+        self._edges: list[list[tuple[int, float, float, str]]] = [[] for _ in labels]
+        self.max_speed_kmh = ACCESS_SPEED_KMH
+
+        for a, b, highway, speed_kmh in segments:
+            km = self._node_km(a, b) * ROAD_CURVATURE
+            minutes = km / speed_kmh * 60
+            highway = sys.intern(highway)
+            self._edges[a].append((b, km, minutes, highway))
+            self._edges[b].append((a, km, minutes, highway))
+            self.max_speed_kmh = max(self.max_speed_kmh, speed_kmh)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RoadNetwork':
+        """
+        Load the road graph CSV (columns from, to, highway, speed_kmh).
+
+        Node names are resolved to coordinates with the gazetteer.
+
+        Raises:
+            ValueError: If a node name is not in the gazetteer
+        """
+        gazetteer = get_gazetteer()
+        labels: list[str] = []
+        coordinates: list[tuple[float, float]] = []
+        nodes: dict[str, int] = {}
+        segments = []
+
+        def node_for(name: str) -> int:
+            node = nodes.get(name)
+            if node is None:
+                place = gazetteer.lookup(name, fuzzy=False)
+                if place is None:
+                    raise ValueError(f"Road network node not in gazetteer: {name}")
+                node = nodes[name] = len(labels)
+                labels.append(place.label)
+                coordinates.append(place.coordinates)
+            return node
+
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                segments.append((node_for(row["from"]), node_for(row["to"]), row["highway"], float(row["speed_kmh"])))
+        return cls(labels, coordinates, segments)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def segment_count(self) -> int:
+        return sum(len(edges) for edges in self._edges) // 2
+
+    def _node_km(self, a: int, b: int) -> float:
+        return _great_circle_km(self._lat_rad[a], self._lon_rad[a], self._lat_rad[b], self._lon_rad[b])
+
+    def node(self, label: str) -> Optional[int]:
+        """Node index for a "City, ST" label, if the town is on the graph."""
+        return self._nodes.get(label)
+
+    def nearest_node(self, coords: tuple[float, float]) -> tuple[int, float]:
+        """
+        Find the graph node closest to a coordinate.
+
+        Returns:
+            (node, distance_km)
+        """
+        node = self._coordinates.get(tuple(coords))
+        if node is not None:
+            return node, 0.0
+        distances = haversine_km_batch(coords, self.latitudes, self.longitudes)
+        node = min(range(len(self.labels)), key=distances.__getitem__)
+        return node, float(distances[node])
+
+    def shortest_path(self, source: int, target: int, weight: str = DURATION) -> Optional[list[int]]:
+        """
+        A* search between two nodes.
+
+        Args:
+            source: Start node
+            target: End node
+            weight: DURATION (fastest) or DISTANCE (shortest)
+
+        Returns:
+            Nodes from source to target, or None if they are not connected
+        """
+        by_duration = weight == DURATION
+        # Lower bound on the remaining cost: straight line at top speed
+        scale = 60 / self.max_speed_kmh if by_duration else 1.0
+        target_lat, target_lon = self._lat_rad[target], self._lon_rad[target]
+
+        def estimate(node: int) -> float:
+            return _great_circle_km(self._lat_rad[node], self._lon_rad[node], target_lat, target_lon) * scale
+
+        best = {source: 0.0}
+        previous: dict[int, int] = {}
+        queue = [(estimate(source), 0.0, source)]
+        while queue:
+            _, cost, node = heapq.heappop(queue)
+            if node == target:
+                path = [node]
+                while node != source:
+                    node = previous[node]
+                    path.append(node)
+                return path[::-1]
+            if cost > best[node]:
+                continue  # stale entry
+            for neighbour, km, minutes, _ in self._edges[node]:
+                new_cost = cost + (minutes if by_duration else km)
+                if new_cost < best.get(neighbour, math.inf):
+                    best[neighbour] = new_cost
+                    previous[neighbour] = node
+                    heapq.heappush(queue, (new_cost + estimate(neighbour), new_cost, neighbour))
+        return None
+
+    def _segment(self, a: int, b: int, by_duration: bool) -> tuple[float, float, str]:
+        """Cheapest direct segment between neighbouring nodes."""
+        return min(
+            ((km, minutes, highway) for neighbour, km, minutes, highway in self._edges[a] if neighbour == b),
+            key=lambda segment: segment[1] if by_duration else segment[0]
+        )
+
+    def route(self, origin: tuple[float, float], destination: tuple[float, float], weight: str = DURATION) -> Optional[Route]:
+        """
+        Plan a drive between two coordinates.
+
+        Args:
+            origin: (lat, lon) of the start
+            destination: (lat, lon) of the end
+            weight: DURATION (fastest) or DISTANCE (shortest)
+
+        Returns:
+            The Route, or None if either end is more than SNAP_MAX_KM from
+            the graph or no road connects them
+        """
+        source, source_km = self.nearest_node(origin)
+        target, target_km = self.nearest_node(destination)
+        if source_km > SNAP_MAX_KM or target_km > SNAP_MAX_KM:
+            return None
+        path = self.shortest_path(source, target, weight)
+        if path is None:
+            return None
+
+        access_km = (source_km + target_km) * ROAD_CURVATURE
+        distance_km = access_km
+        duration_min = access_km / ACCESS_SPEED_KMH * 60
+        highways: list[str] = []
+        for a, b in zip(path, path[1:]):
+            km, minutes, highway = self._segment(a, b, weight == DURATION)
+            distance_km += km
+            duration_min += minutes
+            if not highways or highways[-1] != highway:
+                highways.append(highway)
+
+        points = [(self.latitudes[node], self.longitudes[node]) for node in path]
+        if source_km > 0:
+            points.insert(0, tuple(origin))
+        if target_km > 0:
+            points.append(tuple(destination))
+        return Route(distance_km, duration_min, points, [self.labels[node] for node in path], highways)
+
+
+_network: Optional[RoadNetwork] = None
+_network_lock = threading.Lock()
+
+
+def get_road_network() -> RoadNetwork:
+    """Return the shared road graph, loading ROAD_NETWORK_PATH on first use."""
+    global _network
+    if _network is None:
+        with _network_lock:
+            if _network is None:
+                _network = RoadNetwork.from_file(ROAD_NETWORK_PATH)
+    return _network
+
+
+def plan_route(origin: str, destination: str, weight: str = DURATION) -> Optional[Route]:
+    """
+    Plan a drive between two place names (e.g. "Los Angeles, CA").
+
+    Returns:
+        The Route, or None if a name is unknown or no road connects them
+    """
+    origin_coords = get_coordinates(origin)
+    dest_coords = get_coordinates(destination)
+    if not origin_coords or not dest_coords:
+        return None
+    return get_road_network().route(origin_coords, dest_coords, weight)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    route = plan_route(sys.argv[1], sys.argv[2])
+    if route is None:
+        print("❌ No route found")
+        sys.exit(1)
+    print(f"🛣️  {route.distance_miles:.0f} miles, {route.duration_hours:.1f} hours via {' → '.join(route.highways)}")
+    print(f"   {' → '.join(route.places)}")
@@ -0,0 +1,106 @@
+"""
+Request coalescing ("single flight") for duplicate concurrent work.
+
+While a call for a key is running, further calls with the same key wait
+for it and receive its result (or exception) instead of starting their
+own. Nothing is cached: once the call finishes the next caller starts a
+fresh one.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls made from different threads."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for the in-flight call with the same key.
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """Return how many calls ran and how many joined one already running."""
+        with self._lock:
+            return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """Coalesce identical concurrent coroutine calls on one event loop."""
+
+    def __init__(self):
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await fn(*args, **kwargs), or join the in-flight call with the same key.
+
+        A caller that is cancelled stops waiting without cancelling the
+        shared call for everyone else.
+
+        Returns:
+            The result of the shared call
+        """
+        task_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Return how many calls ran and how many joined one already running."""
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
@@ -0,0 +1,319 @@
+"""
+Offline charging station store backed by SQLite with an in-memory grid index.
+
+Stations are imported from an OpenChargeMap POI dump (or incremental
+``modifiedsince`` responses) and answer radius, bounding-box and corridor
+queries without touching the network.
+
+Usage:
+    python -m utils.station_store import poi_dump.json
+    python -m utils.station_store stats
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional
+from utils.json_stream import iter_json_file
+from utils.location_coords import great_circle_geometry_batch, haversine_km
+
+KM_PER_DEGREE = 111
+
+# Stations written per transaction when importing a dump
+IMPORT_BATCH_SIZE = 5000
+
+
+class StationStore:
+    """
+    Station snapshot with a uniform lat/lon grid index.
+
+    Every station lives in exactly one grid cell of ``cell_deg`` degrees, so a
+    query only inspects the cells overlapping its bounding box.
+    """
+
+    def __init__(self, path: str, cell_deg: float = 0.5):
+        self.path = path
+        self.cell_deg = cell_deg
+        # station id -> (latitude, longitude, power_kw, station JSON)
+        self._stations: dict[str, tuple[float, float, int, str]] = {}
+        self._grid: dict[tuple[int, int], set[str]] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stations ("
+            "id TEXT PRIMARY KEY, latitude REAL NOT NULL, longitude REAL NOT NULL, "
+            "power_kw INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        for station_id, lat, lon, power_kw, data in self._conn.execute(
+            "SELECT id, latitude, longitude, power_kw, data FROM stations"
+        ):
+            self._index(station_id, lat, lon, power_kw, data)
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def _index(self, station_id: str, lat: float, lon: float, power_kw: int, data: str) -> None:
+        self._unindex(station_id)
+        self._stations[station_id] = (lat, lon, power_kw, data)
+        self._grid.setdefault(self._cell(lat, lon), set()).add(station_id)
+
+    def _unindex(self, station_id: str) -> None:
+        previous = self._stations.pop(station_id, None)
+        if previous is not None:
+            cell = self._cell(previous[0], previous[1])
+            members = self._grid.get(cell)
+            if members is not None:
+                members.discard(station_id)
+                if not members:
+                    del self._grid[cell]
+
+    def upsert_stations(self, stations: Iterable[dict]) -> int:
+        """
+        Insert or replace parsed stations (see parse_openchargemap_response).
+
+        Returns:
+            Number of stations written
+        """
+        rows = []
+        with self._lock:
+            for station in stations:
+                data = json.dumps(station, separators=(',', ':'))
+                row = (station['id'], station['latitude'], station['longitude'], station.get('power_kw', 0), data)
+                self._index(*row)
+                rows.append(row)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stations (id, latitude, longitude, power_kw, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def delete_stations(self, station_ids: Iterable[str]) -> int:
+        """
+        Remove stations by id (e.g. "OCM-12345").
+
+        Returns:
+            Number of stations that were present and removed
+        """
+        removed = 0
+        with self._lock:
+            ids = list(station_ids)
+            for station_id in ids:
+                if station_id in self._stations:
+                    self._unindex(station_id)
+                    removed += 1
+            self._conn.executemany("DELETE FROM stations WHERE id = ?", [(station_id,) for station_id in ids])
+            self._conn.commit()
+        return removed
+
+    def import_pois(self, pois: list) -> int:
+        """
+        Parse raw OpenChargeMap POIs and upsert them.
+
+        Returns:
+            Number of stations written
+        """
+        from utils.openchargemap_client import parse_openchargemap_response
+        return self.upsert_stations(parse_openchargemap_response(pois))
+
+    def import_dump(self, path: str) -> int:
+        """
+        Import an OpenChargeMap POI dump.
+
+        POIs are decoded and written in batches, so a full-country dump is
+        never held in memory at once.
+
+        Args:
+            path: A JSON file holding a list of POIs, or a directory of
+                per-POI JSON files (the layout of the OCM data export)
+
+        Returns:
+            Number of stations written
+        """
+        from utils.openchargemap_client import iter_stations
+
+        if os.path.isdir(path):
+            pois = _iter_poi_files(path)
+        else:
+            pois = iter_json_file(path)
+
+        count = 0
+        batch = []
+        for station in iter_stations(pois):
+            batch.append(station)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                count += self.upsert_stations(batch)
+                batch = []
+        if batch:
+            count += self.upsert_stations(batch)
+        return count
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the store's metadata table."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a value to the store's metadata table."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def _candidates(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, min_power_kw: int):
+        row_min, col_min = self._cell(min_lat, min_lon)
+        row_max, col_max = self._cell(max_lat, max_lon)
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                for station_id in self._grid.get((row, col), ()):
+                    lat, lon, power_kw, data = self._stations[station_id]
+                    if power_kw >= min_power_kw and min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                        yield lat, lon, data
+
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, min_power_kw: int = 0) -> list[dict]:
+        """
+        Find stations inside a bounding box.
+
+        Returns:
+            List of station dictionaries
+        """
+        with self._lock:
+            return [json.loads(data) for _, _, data in self._candidates(min_lat, min_lon, max_lat, max_lon, min_power_kw)]
+
+    def query_radius(self, center: tuple[float, float], radius_km: float, min_power_kw: int = 0) -> list[dict]:
+        """
+        Find stations within radius_km of a point.
+
+        Returns:
+            List of station dictionaries
+        """
+        lat_pad, lon_pad = _degree_padding(center[0], center[0], radius_km)
+        with self._lock:
+            return [
+                json.loads(data)
+                for lat, lon, data in self._candidates(
+                    center[0] - lat_pad, center[1] - lon_pad,
+                    center[0] + lat_pad, center[1] + lon_pad,
+                    min_power_kw
+                )
+                if haversine_km(center, (lat, lon)) <= radius_km
+            ]
+
+    def query_polyline(
+        self,
+        route_points: list[tuple[float, float]],
+        max_deviation_km: float,
+        min_power_kw: int = 0
+    ) -> list[dict]:
+        """
+        Find stations within max_deviation_km of a route polyline.
+
+        Each segment only scans the grid cells around its own bounding box,
+        so a long diagonal route does not pay for one huge rectangle.
+
+        Returns:
+            List of station dictionaries
+        """
+        candidates = {}
+        with self._lock:
+            for start, end in zip(route_points, route_points[1:] or route_points):
+                lat_pad, lon_pad = _degree_padding(start[0], end[0], max_deviation_km)
+                min_lat = min(start[0], end[0]) - lat_pad
+                max_lat = max(start[0], end[0]) + lat_pad
+                min_lon = min(start[1], end[1]) - lon_pad
+                max_lon = max(start[1], end[1]) + lon_pad
+                for lat, lon, data in self._candidates(min_lat, min_lon, max_lat, max_lon, min_power_kw):
+                    candidates[data] = (lat, lon)
+
+        if not candidates:
+            return []
+        deviations, _ = great_circle_geometry_batch(
+            [lat for lat, _ in candidates.values()],
+            [lon for _, lon in candidates.values()],
+            route_points
+        )
+        return [json.loads(data) for data, deviation in zip(candidates, deviations) if deviation <= max_deviation_km]
+
+    def query_corridor(
+        self,
+        origin_coords: tuple[float, float],
+        destination_coords: tuple[float, float],
+        max_deviation_km: float,
+        min_power_kw: int = 0
+    ) -> list[dict]:
+        """
+        Find stations within max_deviation_km of the straight route line.
+
+        Returns:
+            List of station dictionaries
+        """
+        return self.query_polyline([origin_coords, destination_coords], max_deviation_km, min_power_kw)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _iter_poi_files(directory: str):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.json'):
+                with open(os.path.join(root, name)) as f:
+                    yield json.load(f)
+
+
+def _degree_padding(lat1: float, lat2: float, distance_km: float) -> tuple[float, float]:
+    """Convert a distance to (latitude, longitude) degree padding, widening longitude toward the poles."""
+    max_abs_lat = min(max(abs(lat1), abs(lat2)) + distance_km / KM_PER_DEGREE, 89.0)
+    lat_pad = distance_km / KM_PER_DEGREE
+    lon_pad = distance_km / (KM_PER_DEGREE * math.cos(math.radians(max_abs_lat)))
+    return lat_pad, lon_pad
+
+
+_station_store: Optional[StationStore] = None
+
+def get_station_store() -> StationStore:
+    """
+    Return the shared station store at OCM_STATION_STORE_PATH, opening it on first use.
+    """
+    global _station_store
+    if _station_store is None:
+        from utils.config import OCM_STATION_STORE_PATH
+        _station_store = StationStore(OCM_STATION_STORE_PATH)
+    return _station_store
+
+
+def main(argv: Optional[list] = None) -> None:
+    from utils.config import OCM_STATION_STORE_PATH
+
+    parser = argparse.ArgumentParser(description="Manage the offline OpenChargeMap station store")
+    parser.add_argument('--store', default=OCM_STATION_STORE_PATH, help="Path to the station store")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="Bulk-import an OpenChargeMap POI dump")
+    import_parser.add_argument('dump', help="JSON list of POIs or a directory of POI JSON files")
+    commands.add_parser('stats', help="Show station count")
+    args = parser.parse_args(argv)
+
+    store = StationStore(args.store)
+    if args.command == 'import':
+        count = store.import_dump(args.dump)
+        print(f"✅ Imported {count} stations into {args.store}")
+    print(f"📦 Store: {args.store}")
+    print(f"   Stations: {len(store)}")
+    print(f"   Last sync: {store.get_meta('last_sync') or 'never'}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
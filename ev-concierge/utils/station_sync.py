@@ -0,0 +1,194 @@
+"""
+Incremental OpenChargeMap sync for the offline station store.
+
+Pulls only the POIs modified since the last recorded watermark, upserts or
+deletes them in the StationStore and advances the watermark.
+
+Usage:
+    python -m utils.station_sync                      # delta since last sync
+    python -m utils.station_sync --since 2024-01-01T00:00:00
+    python -m utils.station_sync --record recordings/ # save pages for replay
+    python -m utils.station_sync --replay recordings/ --store /tmp/bench.sqlite3
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Callable, Optional
+from utils.http_session import get_json
+from utils.openchargemap_client import OPENCHARGEMAP_POI_URL, get_rate_limiter
+from utils.rate_limiter import BACKGROUND
+from utils.station_store import StationStore
+
+WATERMARK_KEY = "last_sync"
+
+# StatusType IDs meaning the site no longer exists
+REMOVED_STATUS_TYPE_IDS = {200, 210}
+
+# SubmissionStatusType IDs at or above this value are delisted
+DELISTED_SUBMISSION_STATUS_ID = 1000
+
+PageFetcher = Callable[[dict], list]
+
+
+def poi_is_removed(poi: dict) -> bool:
+    """Return True if an OpenChargeMap POI has been decommissioned or delisted."""
+    status_id = poi.get('StatusTypeID') or (poi.get('StatusType') or {}).get('ID')
+    submission_id = poi.get('SubmissionStatusTypeID') or (poi.get('SubmissionStatus') or {}).get('ID')
+    return status_id in REMOVED_STATUS_TYPE_IDS or (submission_id or 0) >= DELISTED_SUBMISSION_STATUS_ID
+
+
+def poi_modified_at(poi: dict) -> str:
+    """Return the latest modification timestamp on a POI (ISO 8601, may be empty)."""
+    return max(
+        poi.get('DateLastStatusUpdate') or '',
+        poi.get('DateLastVerified') or '',
+        poi.get('DateCreated') or ''
+    )
+
+
+def live_fetcher(api_key: str) -> PageFetcher:
+    """Build a page fetcher that calls the OpenChargeMap API at background priority."""
+    def fetch(params: dict) -> list:
+        # Full pages are large, so allow far more time than interactive queries;
+        # live searches sharing the rate limiter go first
+        return get_json(
+            OPENCHARGEMAP_POI_URL,
+            params={**params, "key": api_key},
+            deadline_seconds=120,
+            rate_limiter=get_rate_limiter(),
+            priority=BACKGROUND
+        )
+    return fetch
+
+
+def recording_fetcher(fetch: PageFetcher, directory: str) -> PageFetcher:
+    """Wrap a fetcher so every page is also written to directory for later replay."""
+    os.makedirs(directory, exist_ok=True)
+    page_number = 0
+
+    def record(params: dict) -> list:
+        nonlocal page_number
+        page = fetch(params)
+        page_number += 1
+        with open(os.path.join(directory, f"page-{page_number:04d}.json"), 'w') as f:
+            json.dump(page, f)
+        return page
+    return record
+
+
+def replay_fetcher(directory: str) -> PageFetcher:
+    """Build a page fetcher that returns recorded pages in order, ignoring params."""
+    pages = sorted(name for name in os.listdir(directory) if name.startswith('page-') and name.endswith('.json'))
+    remaining = iter(pages)
+
+    def replay(params: dict) -> list:
+        name = next(remaining, None)
+        if name is None:
+            return []
+        with open(os.path.join(directory, name)) as f:
+            return json.load(f)
+    return replay
+
+
+def sync_station_store(
+    store: StationStore,
+    fetch_page: PageFetcher,
+    since: Optional[str] = None,
+    country_code: str = "US",
+    page_size: int = 5000
+) -> dict:
+    """
+    Apply all POI changes since the watermark to the store.
+
+    Args:
+        store: Station store to update
+        fetch_page: Callable taking API params and returning a list of POIs
+        since: ISO timestamp to sync from (defaults to the stored watermark;
+            None with no watermark performs a full download)
+        country_code: OpenChargeMap countrycode filter
+        page_size: maxresults per request
+
+    Returns:
+        Summary with counts of fetched, upserted and deleted stations, the
+        new watermark and elapsed seconds
+    """
+    started = time.perf_counter()
+    since = since or store.get_meta(WATERMARK_KEY)
+    summary = {"pages": 0, "fetched": 0, "upserted": 0, "deleted": 0, "since": since}
+    newest = since or ''
+    last_id = 0
+
+    # Page through the delta in ID order; the watermark only moves once every
+    # page has been applied, so an interrupted sync is simply repeated
+    while True:
+        params = {
+            "countrycode": country_code,
+            "maxresults": page_size,
+            "greaterthanid": last_id,
+            "compact": "false",
+            "verbose": "false"
+        }
+        if since:
+            params["modifiedsince"] = since
+
+        page = fetch_page(params)
+        summary["pages"] += 1
+        summary["fetched"] += len(page)
+
+        removed = [poi for poi in page if poi_is_removed(poi)]
+        active = [poi for poi in page if not poi_is_removed(poi)]
+        summary["upserted"] += store.import_pois(active)
+        summary["deleted"] += store.delete_stations(f"OCM-{poi.get('ID')}" for poi in removed)
+
+        newest = max([newest] + [poi_modified_at(poi) for poi in page])
+        page_last_id = max((poi.get('ID') or 0 for poi in page), default=0)
+
+        if len(page) < page_size or page_last_id <= last_id:
+            break
+        last_id = page_last_id
+
+    if newest:
+        store.set_meta(WATERMARK_KEY, newest)
+    summary["watermark"] = newest or None
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main(argv: Optional[list] = None) -> None:
+    from utils.config import OCM_STATION_STORE_PATH
+
+    parser = argparse.ArgumentParser(description="Sync the offline station store with OpenChargeMap")
+    parser.add_argument('--store', default=OCM_STATION_STORE_PATH, help="Path to the station store")
+    parser.add_argument('--since', help="ISO timestamp to sync from (overrides the stored watermark)")
+    parser.add_argument('--country', default="US", help="OpenChargeMap country code")
+    parser.add_argument('--page-size', type=int, default=5000, help="POIs per request")
+    parser.add_argument('--record', metavar='DIR', help="Save fetched pages to DIR")
+    parser.add_argument('--replay', metavar='DIR', help="Replay pages recorded in DIR instead of calling the API")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        fetch_page = replay_fetcher(args.replay)
+    else:
+        api_key = os.getenv('OPENCHARGEMAP_API_KEY', '')
+        if not api_key:
+            parser.error("OPENCHARGEMAP_API_KEY is not set (use --replay to sync from recordings)")
+        fetch_page = live_fetcher(api_key)
+    if args.record:
+        fetch_page = recording_fetcher(fetch_page, args.record)
+
+    store = StationStore(args.store)
+    summary = sync_station_store(store, fetch_page, since=args.since, country_code=args.country, page_size=args.page_size)
+    store.close()
+
+    print(f"🔄 Synced {args.store}")
+    print(f"   Since: {summary['since'] or 'beginning (full download)'}")
+    print(f"   Pages: {summary['pages']}, POIs fetched: {summary['fetched']}")
+    print(f"   Upserted: {summary['upserted']}, Deleted: {summary['deleted']}")
+    print(f"   Watermark: {summary['watermark']}")
+    print(f"   Time: {summary['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Compact in-memory representations of charging stations.
+
+Station is a fixed-layout record (``__slots__``) for handling one station;
+StationTable stores many stations column by column, with coordinates,
+power and price in typed arrays and repeated strings interned. Both
+convert to the dictionaries returned by tools only when a result leaves
+the client.
+"""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional, Union
+
+# Placeholder reservation slots every station advertises (mock data)
+MOCK_SLOTS = ("10:00", "10:30", "11:00", "11:30", "12:00")
+
+DEFAULT_POWER_KW = 50
+DEFAULT_PRICE_PER_KWH = 0.40
+
+
+class Station:
+    """One charging station with a fixed set of attributes."""
+
+    __slots__ = (
+        'id', 'network', 'location', 'address', 'latitude', 'longitude',
+        'power_kw', 'price_per_kwh', 'available'
+    )
+
+    def __init__(
+        self,
+        id: str,
+        network: str,
+        location: str,
+        address: str,
+        latitude: float,
+        longitude: float,
+        power_kw: int = DEFAULT_POWER_KW,
+        price_per_kwh: float = DEFAULT_PRICE_PER_KWH,
+        available: bool = True
+    ):
+        self.id = id
+        self.network = network
+        self.location = location
+        self.address = address
+        self.latitude = latitude
+        self.longitude = longitude
+        self.power_kw = power_kw
+        self.price_per_kwh = price_per_kwh
+        self.available = available
+
+    @classmethod
+    def from_dict(cls, station: dict) -> 'Station':
+        """Build a Station from a station dictionary (missing fields take defaults)."""
+        location = station.get('location', '')
+        return cls(
+            station['id'],
+            station.get('network', 'Unknown Network'),
+            location,
+            station.get('address', location),
+            station['latitude'],
+            station['longitude'],
+            station.get('power_kw', DEFAULT_POWER_KW),
+            station.get('price_per_kwh', DEFAULT_PRICE_PER_KWH),
+            station.get('available', True)
+        )
+
+    def to_dict(self) -> dict:
+        """Return the station in the dictionary format used by tool results."""
+        return {
+            "id": self.id,
+            "network": self.network,
+            "location": self.location,
+            "address": self.address,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "power_kw": self.power_kw,
+            "price_per_kwh": self.price_per_kwh,
+            "available": self.available,
+            "slots": list(MOCK_SLOTS),
+            "amenities": []
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Station):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Station({self.id!r}, {self.network!r}, {self.location!r}, {self.power_kw} kW)"
+
+
+class StationTable:
+    """
+    Column-oriented collection of stations, unique by id.
+
+    Row i of every column describes the same station. Appending a station
+    whose id is already present is a no-op, so merging search tiles needs
+    no separate dictionary.
+    """
+
+    __slots__ = (
+        'ids', 'networks', 'locations', 'addresses', 'latitudes', 'longitudes',
+        'power_kw', 'price_per_kwh', 'available', '_rows'
+    )
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.networks: list[str] = []
+        self.locations: list[str] = []
+        self.addresses: list[str] = []
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.power_kw = array('i')
+        self.price_per_kwh = array('d')
+        self.available = array('b')
+        # station id -> row
+        self._rows: dict[str, int] = {}
+
+    @classmethod
+    def from_dicts(cls, stations: Iterable[dict]) -> 'StationTable':
+        """Build a table from station dictionaries."""
+        table = cls()
+        table.extend(stations)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, station_id: str) -> bool:
+        return station_id in self._rows
+
+    def __getitem__(self, row: int) -> Station:
+        return Station(
+            self.ids[row],
+            self.networks[row],
+            self.locations[row],
+            self.addresses[row],
+            self.latitudes[row],
+            self.longitudes[row],
+            self.power_kw[row],
+            self.price_per_kwh[row],
+            bool(self.available[row])
+        )
+
+    def __iter__(self) -> Iterator[Station]:
+        for row in range(len(self.ids)):
+            yield self[row]
+
+    def append(self, station: Union[dict, Station]) -> bool:
+        """
+        Add a station unless its id is already present.
+
+        Returns:
+            True if the station was added
+        """
+        if isinstance(station, dict):
+            station = Station.from_dict(station)
+        if station.id in self._rows:
+            return False
+        self._rows[station.id] = len(self.ids)
+        self.ids.append(station.id)
+        self.networks.append(sys.intern(station.network))
+        self.locations.append(sys.intern(station.location))
+        self.addresses.append(station.address)
+        self.latitudes.append(station.latitude)
+        self.longitudes.append(station.longitude)
+        self.power_kw.append(int(station.power_kw))
+        self.price_per_kwh.append(station.price_per_kwh)
+        self.available.append(bool(station.available))
+        return True
+
+    def extend(self, stations: Iterable[Union[dict, Station]]) -> int:
+        """
+        Add several stations, skipping ids already present.
+
+        Returns:
+            Number of stations added
+        """
+        return sum(1 for station in stations if self.append(station))
+
+    def take(self, rows: Iterable[int]) -> 'StationTable':
+        """Return a new table holding the given rows, in the given order."""
+        table = StationTable()
+        for row in rows:
+            table.append(self[row])
+        return table
+
+    def to_dicts(self, rows: Optional[Iterable[int]] = None) -> list[dict]:
+        """Convert all rows (or the given rows) to station dictionaries."""
+        rows = range(len(self.ids)) if rows is None else rows
+        return [self[row].to_dict() for row in rows]
+
+    def to_columns(self) -> dict:
+        """Return the table as JSON-serializable columns (see from_columns)."""
+        return {
+            "id": list(self.ids),
+            "network": list(self.networks),
+            "location": list(self.locations),
+            "address": list(self.addresses),
+            "latitude": self.latitudes.tolist(),
+            "longitude": self.longitudes.tolist(),
+            "power_kw": self.power_kw.tolist(),
+            "price_per_kwh": self.price_per_kwh.tolist(),
+            "available": self.available.tolist()
+        }
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> 'StationTable':
+        """Rebuild a table from the output of to_columns."""
+        table = cls()
+        table.ids = list(columns["id"])
+        table.networks = [sys.intern(network) for network in columns["network"]]
+        table.locations = [sys.intern(location) for location in columns["location"]]
+        table.addresses = list(columns["address"])
+        table.latitudes = array('d', columns["latitude"])
+        table.longitudes = array('d', columns["longitude"])
+        table.power_kw = array('i', columns["power_kw"])
+        table.price_per_kwh = array('d', columns["price_per_kwh"])
+        table.available = array('b', columns["available"])
+        table._rows = {station_id: row for row, station_id in enumerate(table.ids)}
+        return table
@@ -0,0 +1,112 @@
+"""
+Run dependent async steps concurrently on one event loop.
+
+Steps are added with the names of the steps they need. Each starts as
+soon as those have finished, so independent steps overlap and a run takes
+as long as its slowest chain of dependencies rather than the sum of all
+steps. Every step's start and end are recorded in a timeline.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+StepFunction = Callable[[dict], Awaitable[Any]]
+
+
+class StepTiming(NamedTuple):
+    step: str
+    # Seconds since the run started
+    start_s: float
+    end_s: float
+    # "done", "skipped" or "failed"
+    status: str
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+class StepGraph:
+    """A DAG of async steps, each given the results of the steps before it."""
+
+    def __init__(self):
+        self._steps: dict[str, tuple[StepFunction, tuple[str, ...], Optional[Callable[[dict], bool]]]] = {}
+        self.results: dict[str, Any] = {}
+        self.timeline: list[StepTiming] = []
+
+    def add(self, name: str, run: StepFunction, after: tuple[str, ...] = (), when: Optional[Callable[[dict], bool]] = None) -> None:
+        """
+        Add a step.
+
+        Args:
+            name: Step name, also the key of its result in results
+            run: Coroutine function called with the results dict
+            after: Steps that must finish first (already added, so the
+                graph cannot have cycles)
+            when: Checked against the results once the steps in after have
+                finished; if it returns False the step is skipped and its
+                result is None
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate step: {name}")
+        unknown = [step for step in after if step not in self._steps]
+        if unknown:
+            raise ValueError(f"Step {name} depends on unknown steps: {', '.join(unknown)}")
+        self._steps[name] = (run, tuple(after), when)
+
+    async def run(self) -> dict:
+        """
+        Run every step, each as soon as its dependencies are done.
+
+        Returns:
+            The results dict (step name -> result)
+
+        Raises:
+            Whatever a step raised; the steps still running are cancelled
+        """
+        started = time.perf_counter()
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def execute(name: str, run: StepFunction, after: tuple[str, ...], when) -> None:
+            if after:
+                await asyncio.gather(*(tasks[step] for step in after))
+            begin = time.perf_counter() - started
+            if when is not None and not when(self.results):
+                self.results[name] = None
+                self.timeline.append(StepTiming(name, begin, begin, "skipped"))
+                return
+            try:
+                self.results[name] = await run(self.results)
+            except BaseException:
+                self.timeline.append(StepTiming(name, begin, time.perf_counter() - started, "failed"))
+                raise
+            self.timeline.append(StepTiming(name, begin, time.perf_counter() - started, "done"))
+
+        for name, (run, after, when) in self._steps.items():
+            tasks[name] = asyncio.create_task(execute(name, run, after, when), name=name)
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self.timeline.sort(key=lambda timing: timing.start_s)
+        return self.results
+
+
+def format_timeline(timeline: list[StepTiming], width: int = 40) -> str:
+    """Render a timeline as one bar per step, to scale."""
+    if not timeline:
+        return ""
+    total = max(timing.end_s for timing in timeline) or 1.0
+    label = max(len(timing.step) for timing in timeline)
+    lines = []
+    for timing in timeline:
+        begin = int(timing.start_s / total * width)
+        length = max(int(round(timing.duration_s / total * width)), 1)
+        bar = " " * begin + ("█" if timing.status == "done" else "·") * min(length, width - begin)
+        lines.append(f"   {timing.step:<{label}}  {bar:<{width}}  {timing.start_s:6.2f}s → {timing.end_s:6.2f}s  {timing.status}")
+    return "\n".join(lines)